@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any
+
+from loguru import logger
+
+
+def browser_cookies(browser: Any) -> list[Any]:
+    """Cookies read through the driver's own ``get_cookies`` (CDP first for SeleniumBase)."""
+    get_cookies = getattr(browser, 'get_cookies', None)
+    if not callable(get_cookies):
+        return []
+    try:
+        return list(get_cookies() or [])
+    except Exception as e:
+        logger.debug('读取浏览器 Cookie 失败: {error}', error=e)
+        return []
+
+
+def browser_user_agent(browser: Any) -> str | None:
+    get_user_agent = getattr(browser, 'get_user_agent', None)
+    if callable(get_user_agent):
+        try:
+            user_agent = get_user_agent()
+        except Exception as e:
+            logger.debug('读取浏览器 User-Agent 失败: {error}', error=e)
+        else:
+            if isinstance(user_agent, str) and user_agent:
+                return user_agent
+    evaluate = getattr(getattr(browser, 'cdp', None), 'evaluate', None)
+    if callable(evaluate):
+        try:
+            user_agent = evaluate('navigator.userAgent')
+        except Exception as e:
+            logger.debug('读取浏览器 User-Agent 失败: {error}', error=e)
+        else:
+            if isinstance(user_agent, str) and user_agent:
+                return user_agent
+    return None
+
+
+def cookie_value(cookie: Any, key: str, default: Any = None) -> Any:
+    if isinstance(cookie, dict):
+        return cookie.get(key, default)
+    return getattr(cookie, key, default)
+
+
+def copy_cookies(cookies: Iterable[Any], session: Any) -> int:
+    """Set browser cookies (dicts or CDP cookie objects) on a requests session."""
+    copied = 0
+    for cookie in cookies:
+        name = cookie_value(cookie, 'name')
+        value = cookie_value(cookie, 'value')
+        if not name or value is None:
+            continue
+        kwargs: dict[str, Any] = {'path': cookie_value(cookie, 'path') or '/'}
+        domain = cookie_value(cookie, 'domain')
+        if domain:
+            kwargs['domain'] = domain
+        expires = cookie_value(cookie, 'expires')
+        # 会话 Cookie 的 expires 为 -1 或缺省
+        if isinstance(expires, int | float) and expires > 0:
+            kwargs['expires'] = int(expires)
+        session.cookies.set(name, value, **kwargs)
+        copied += 1
+    return copied
+
+
+def bridge_browser_session(browser: Any, http: Any) -> bool:
+    """Copy the browser's cookies and User-Agent into ``http``; True when cookies were copied.
+
+    Clearance cookies such as Cloudflare's ``cf_clearance`` are bound to the
+    User-Agent that solved the challenge, so both travel together.
+    """
+    if getattr(http, 'cookies', None) is None:
+        return False
+    copied = copy_cookies(browser_cookies(browser), http)
+    if not copied:
+        return False
+    user_agent = browser_user_agent(browser)
+    headers = getattr(http, 'headers', None)
+    if user_agent and headers is not None:
+        headers['User-Agent'] = user_agent
+    logger.debug('已把浏览器的 {} 个 Cookie 同步到请求会话', copied)
+    return True
@@ -12,10 +12,17 @@ import requests
 from seleniumbase import SB
 from seleniumbase.core import browser_launcher as sb_browser_launcher
 
+from downloader.browser.cookie_bridge import copy_cookies
+from downloader.browser.readiness import settle_page
+
 try:
-    from cloakbrowser import launch as cloakbrowser_launch
+    from cloakbrowser import (
+        launch as cloakbrowser_launch,
+        launch_persistent_context as cloakbrowser_launch_persistent,
+    )
 except ImportError:  # pragma: no cover - depends on optional runtime install
     cloakbrowser_launch = None
+    cloakbrowser_launch_persistent = None
 
 
 def _user_cache_root() -> Path:
@@ -32,8 +39,13 @@ def _user_cache_root() -> Path:
     return Path.home() / '.cache'
 
 
+def app_cache_dir() -> Path:
+    """Per-user cache directory of the downloader (drivers, cookies, browser profiles)."""
+    return _user_cache_root() / 'comic_downloader'
+
+
 def _packaged_seleniumbase_driver_dir() -> Path:
-    return _user_cache_root() / 'comic_downloader' / 'seleniumbase' / 'drivers'
+    return app_cache_dir() / 'seleniumbase' / 'drivers'
 
 
 def configure_seleniumbase_driver_cache() -> None:
@@ -60,8 +72,9 @@ class CloakBrowserDriver:
         humanize: bool,
         timeout_seconds: float,
         launch_options: dict[str, Any] | None = None,
+        user_data_dir: str | None = None,
     ) -> None:
-        if cloakbrowser_launch is None:
+        if cloakbrowser_launch is None or cloakbrowser_launch_persistent is None:
             raise RuntimeError(
                 'CloakBrowser mode requires the "cloakbrowser" package to be installed.'
             )
@@ -71,8 +84,14 @@ class CloakBrowserDriver:
         options.setdefault('headless', False)
         options.setdefault('humanize', True)
 
-        self._browser = cloakbrowser_launch(**options)
-        self._page = self._browser.new_page()
+        if user_data_dir:
+            # 持久化配置返回的是 BrowserContext，自带一个空白页
+            self._browser = cloakbrowser_launch_persistent(user_data_dir, **options)
+            pages = list(getattr(self._browser, 'pages', None) or [])
+            self._page = pages[0] if pages else self._browser.new_page()
+        else:
+            self._browser = cloakbrowser_launch(**options)
+            self._page = self._browser.new_page()
         self._timeout_ms = self._to_timeout_ms(timeout_seconds)
 
     def get(self, url: str) -> None:
@@ -91,6 +110,16 @@ class CloakBrowserDriver:
     def implicitly_wait(self, seconds: float) -> None:
         self._timeout_ms = self._to_timeout_ms(seconds)
 
+    def get_cookies(self) -> list[dict[str, Any]]:
+        return list(self._page.context.cookies())
+
+    def get_user_agent(self) -> str:
+        return self._page.evaluate('() => navigator.userAgent')
+
+    def is_healthy(self) -> bool:
+        is_connected = getattr(self._browser, 'is_connected', None)
+        return bool(is_connected()) if callable(is_connected) else True
+
     def quit(self) -> None:
         self._browser.close()
 
@@ -106,7 +135,14 @@ class SeleniumBaseDriver:
 
     is_seleniumbase_driver = True
 
-    def __init__(self, *, headless: bool, timeout_seconds: float) -> None:
+    def __init__(
+        self,
+        *,
+        headless: bool,
+        timeout_seconds: float,
+        fixed_waits: bool = False,
+        user_data_dir: str | None = None,
+    ) -> None:
         configure_seleniumbase_driver_cache()
         kwargs: dict[str, Any] = {
             'uc': True,
@@ -116,10 +152,13 @@ class SeleniumBaseDriver:
             kwargs['headless'] = True
         else:
             kwargs['headed'] = True
+        if user_data_dir:
+            kwargs['user_data_dir'] = user_data_dir
 
         self._context = SB(**kwargs)
         self._sb = self._context.__enter__()
         self._timeout_seconds = timeout_seconds
+        self._fixed_waits = fixed_waits
         self._closed = False
 
     @property
@@ -144,9 +183,7 @@ class SeleniumBaseDriver:
 
     def get(self, url: str) -> None:
         self.activate_cdp_mode(url)
-        self.sleep(10)
-        self.solve_captcha()
-        self.sleep(5)
+        settle_page(self, fixed_waits=self._fixed_waits)
 
     def sleep(self, seconds: float) -> None:
         self._sb.sleep(seconds)
@@ -193,6 +230,14 @@ class SeleniumBaseDriver:
         except Exception:
             self._download_with_browser_session(url, file_path, referer=referer)
 
+    def is_healthy(self) -> bool:
+        if self._closed:
+            return False
+        cdp = self.cdp
+        if cdp is not None and hasattr(cdp, 'get_current_url'):
+            cdp.get_current_url()
+        return True
+
     def quit(self) -> None:
         if self._closed:
             return
@@ -291,18 +336,14 @@ class SeleniumBaseDriver:
                 return default_user_agent
         return default_user_agent
 
+    def get_cookies(self) -> list[Any]:
+        return self._browser_cookies()
+
+    def get_user_agent(self) -> str:
+        return self._user_agent()
+
     def _copy_browser_cookies_to(self, session: requests.Session) -> None:
-        for cookie in self._browser_cookies():
-            name = self._cookie_value(cookie, 'name')
-            value = self._cookie_value(cookie, 'value')
-            if not name or value is None:
-                continue
-            domain = self._cookie_value(cookie, 'domain')
-            path = self._cookie_value(cookie, 'path') or '/'
-            if domain:
-                session.cookies.set(name, value, domain=domain, path=path)
-            else:
-                session.cookies.set(name, value, path=path)
+        copy_cookies(self._browser_cookies(), session)
 
     def _browser_cookies(self) -> list[Any]:
         cdp = self.cdp
@@ -322,9 +363,3 @@ class SeleniumBaseDriver:
             except Exception:
                 return []
         return []
-
-    @staticmethod
-    def _cookie_value(cookie: Any, key: str, default: Any = None) -> Any:
-        if isinstance(cookie, dict):
-            return cookie.get(key, default)
-        return getattr(cookie, key, default)
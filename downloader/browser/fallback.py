@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from loguru import logger
+
+FALLBACK_BROWSER_IDLE_SECONDS = 300.0
+"""备用浏览器空闲多久后关闭，下次被拦截时再重新启动"""
+
+
+class FallbackBrowser:
+    """SeleniumBase context entered on first use and reused by later block fallbacks.
+
+    ``factory`` returns an unentered ``SB(...)`` context. Loads through the
+    browser are serialized; it is closed after ``idle_seconds`` without use,
+    when the caller ``discard()``s it after a failed load, and by ``close()``.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        *,
+        idle_seconds: float = FALLBACK_BROWSER_IDLE_SECONDS,
+    ) -> None:
+        self.idle_seconds = idle_seconds
+        self._factory = factory
+        self._lock = threading.RLock()
+        self._context: Any = None
+        self._browser: Any = None
+        self._timer: threading.Timer | None = None
+        self._generation = 0
+
+    @property
+    def is_open(self) -> bool:
+        return self._browser is not None
+
+    @contextmanager
+    def lease(self) -> Iterator[Any]:
+        """The shared browser, launching it first when it is not running."""
+        with self._lock:
+            self._cancel_idle_timer()
+            if self._browser is None:
+                self._open()
+            try:
+                yield self._browser
+            except BaseException:
+                self._close_locked()
+                raise
+            finally:
+                if self._browser is not None:
+                    self._schedule_idle_close()
+
+    def discard(self) -> None:
+        """Close the browser so the next lease starts a fresh one."""
+        with self._lock:
+            self._close_locked()
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_locked()
+
+    def _open(self) -> None:
+        context = self._factory()
+        browser = context.__enter__()
+        self._context = context
+        self._browser = browser
+        logger.debug('已启动备用 SeleniumBase 浏览器')
+
+    def _close_locked(self) -> None:
+        self._cancel_idle_timer()
+        context, self._context, self._browser = self._context, None, None
+        if context is None:
+            return
+        try:
+            context.__exit__(None, None, None)
+        except Exception as e:
+            logger.debug('关闭备用浏览器失败: {error}', error=e)
+
+    def _schedule_idle_close(self) -> None:
+        self._generation += 1
+        timer = threading.Timer(self.idle_seconds, self._close_if_idle, args=(self._generation,))
+        timer.daemon = True
+        self._timer = timer
+        timer.start()
+
+    def _cancel_idle_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _close_if_idle(self, generation: int) -> None:
+        # 正在使用时不等待，使用结束后会重新计时
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            if generation == self._generation and self._browser is not None:
+                logger.debug('备用浏览器空闲超过 {} 秒，已关闭', self.idle_seconds)
+                self._close_locked()
+        finally:
+            self._lock.release()
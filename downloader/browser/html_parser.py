@@ -20,6 +20,7 @@ from selenium.webdriver.support.ui import WebDriverWait
 from seleniumbase import SB
 
 from downloader.browser.drivers import configure_seleniumbase_driver_cache
+from downloader.browser.fallback import FallbackBrowser
 from downloader.browser.modes import (
     CLOAKBROWSER_MODE,
     REQUESTS_MODE,
@@ -28,11 +29,14 @@ from downloader.browser.modes import (
     normalize_browser_mode,
 )
 from downloader.browser.page_loading import (
+    BLOCK_FALLBACK_STATUS_CODES,
     PageLoadAdapters,
     PageLoader,
     PageLoadRequest,
     PageLoadResult,
 )
+from downloader.browser.readiness import settle_page
+from downloader.download.retry import RETRY_STATUS_CODES, RetryingHttp
 from downloader.models import HtmlParseOptions
 
 HTML_METHODS = {'GET', 'POST'}
@@ -161,6 +165,19 @@ class HtmlParsingMixin:
     def _source_base_url(self) -> str:
         return str(self._source_profile_value('base_url', ''))
 
+    def _retrying_http(self, retry_statuses: frozenset[int] = RETRY_STATUS_CODES) -> Any:
+        """``self.http`` with the source's retry policy applied to every request."""
+        policy = getattr(self, 'retry_policy', None)
+        if policy is None:
+            return self.http
+        return RetryingHttp(self.http, policy, retry_statuses)
+
+    def _page_http(self) -> Any:
+        # 页面被拦截时改用浏览器加载，不在原地重试同样会被拦截的请求
+        return self._retrying_http(
+            RETRY_STATUS_CODES - BLOCK_FALLBACK_STATUS_CODES - REQUESTS_TO_SELENIUMBASE_STATUS_CODES
+        )
+
     def _browser_wait_selector(self) -> str | None:
         return self._source_profile_value(
             'browser_wait_selector', None
@@ -172,6 +189,9 @@ class HtmlParsingMixin:
             wait_seconds = self._source_profile_value('seleniumbase_wait_seconds', 0)
         return float(wait_seconds or 0)
 
+    def _browser_fixed_waits(self) -> bool:
+        return bool(self._source_profile_value('browser_fixed_waits', False))
+
     def _browser_headless(self, default: bool = True) -> bool:
         browser_headless = self._source_profile_value('browser_headless', None)
         if browser_headless is not None:
@@ -195,6 +215,18 @@ class HtmlParsingMixin:
             kwargs['headed'] = True
         return SB(**kwargs)
 
+    def _seleniumbase_fallback(self) -> FallbackBrowser:
+        """Browser for pages that need SeleniumBase when the source has no driver.
+
+        The runtime attaches one shared per headless setting as ``fallback_browser``;
+        a source used on its own keeps its own.
+        """
+        fallback = getattr(self, 'fallback_browser', None)
+        if fallback is None:
+            fallback = FallbackBrowser(self._seleniumbase_context)
+            self.fallback_browser = fallback
+        return fallback
+
     def _wait_for_seleniumbase_html(self, sb):
         wait_selector = self._browser_wait_selector()
         wait_seconds = self._browser_wait_seconds()
@@ -287,11 +319,7 @@ class HtmlParsingMixin:
 
     def _load_seleniumbase_html(self, sb, url: str):
         sb.activate_cdp_mode(url)
-        sb.sleep(10)
-        solve_captcha = getattr(sb, 'solve_captcha', None)
-        if callable(solve_captcha):
-            solve_captcha()
-        sb.sleep(5)
+        settle_page(sb, self._browser_wait_selector(), fixed_waits=self._browser_fixed_waits())
         self._wait_for_seleniumbase_html(sb)
         html = self._get_seleniumbase_page_source(sb)
         return etree.parse(StringIO(html), self.parser)
@@ -525,17 +553,11 @@ class HtmlParsingMixin:
                 self._record_seleniumbase_failure_diagnostics(driver, url, attempt, e)
                 raise
 
-        try:
-            context = self._seleniumbase_context()
-        except Exception as e:
-            self._record_seleniumbase_failure_diagnostics(None, url, attempt, e)
-            raise
-
         with ExitStack() as stack:
             try:
-                sb = stack.enter_context(context)
+                sb = stack.enter_context(self._seleniumbase_fallback().lease())
             except Exception as e:
-                self._record_seleniumbase_failure_diagnostics(context, url, attempt, e)
+                self._record_seleniumbase_failure_diagnostics(None, url, attempt, e)
                 raise
 
             try:
@@ -600,11 +622,12 @@ class HtmlParsingMixin:
         if headers:
             request_headers.update(headers)
 
+        http = self._page_http()
         try:
             if method == 'GET':
-                r = self.http.get(url, timeout=30, headers=request_headers)
+                r = http.get(url, timeout=30, headers=request_headers)
             else:
-                r = self.http.post(url, data=data, timeout=30, headers=request_headers)
+                r = http.post(url, data=data, timeout=30, headers=request_headers)
             status_code = getattr(r, 'status_code', None)
             if (
                 isinstance(status_code, int)
@@ -687,6 +710,8 @@ class HtmlParsingMixin:
             headers=headers,
             wait_selector=self._browser_wait_selector(),
             wait_seconds=self._browser_wait_seconds(),
+            fixed_waits=self._browser_fixed_waits(),
+            bridge_cookies=bool(self._source_profile_value('browser_cookie_bridge', False)),
             diagnostics_dir=Path(self.output_dir or '.') / SELENIUMBASE_DIAGNOSTIC_DIR,
         )
         result = self._load_page_for_legacy_parse_html(request)
@@ -710,22 +735,23 @@ class HtmlParsingMixin:
     def _load_with_temporary_seleniumbase_context(
         self, request: PageLoadRequest, loader: PageLoader
     ) -> PageLoadResult:
-        retry_request = replace(request, browser_mode=SELENIUMBASE_MODE)
+        # 页面本来走 requests，浏览器通过验证后把 Cookie 同步回会话，下一页直接用 requests
+        retry_request = replace(request, browser_mode=SELENIUMBASE_MODE, bridge_cookies=True)
         last_result = PageLoadResult(
             failure_reason='browser_adapter_required',
             required_browser_mode=SELENIUMBASE_MODE,
             recoverable=True,
         )
 
+        fallback = self._seleniumbase_fallback()
         for attempt in range(1, SELENIUMBASE_HTML_MAX_ATTEMPTS + 1):
-            context = self._seleniumbase_context()
             with ExitStack() as stack:
                 try:
-                    seleniumbase_browser = stack.enter_context(context)
+                    seleniumbase_browser = stack.enter_context(fallback.lease())
                 except Exception as e:
                     last_result = loader.browser_failure_result(
                         retry_request,
-                        context,
+                        None,
                         e,
                         SELENIUMBASE_MODE,
                         attempt=attempt,
@@ -734,6 +760,9 @@ class HtmlParsingMixin:
                     retry_adapters = self._page_load_adapters()
                     retry_adapters.browsers[SELENIUMBASE_MODE] = seleniumbase_browser
                     last_result = loader.load(retry_request, retry_adapters)
+                    if not last_result.ok:
+                        # 出错的浏览器可能停在错误页或已被站点标记，重试时换一个新的
+                        fallback.discard()
 
             if last_result.ok:
                 return last_result
@@ -749,4 +778,4 @@ class HtmlParsingMixin:
                 browsers[SELENIUMBASE_MODE] = self.driver
             elif self._source_browser_mode() == CLOAKBROWSER_MODE:
                 browsers[CLOAKBROWSER_MODE] = self.driver
-        return PageLoadAdapters(http=self.http, browsers=browsers)
+        return PageLoadAdapters(http=self._page_http(), browsers=browsers)
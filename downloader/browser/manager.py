@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import threading
 from typing import Any, Protocol
 
 from loguru import logger
@@ -9,7 +10,10 @@ from selenium.webdriver.edge.options import Options as EdgeOptions
 from selenium.webdriver.firefox.options import Options as FirefoxOptions
 
 from downloader.browser.drivers import CloakBrowserDriver, SeleniumBaseDriver
+from downloader.browser.fallback import FallbackBrowser
 from downloader.browser.modes import CLOAKBROWSER_MODE, SELENIUMBASE_MODE, normalize_browser_mode
+from downloader.browser.persistence import BrowserProfile, acquire_browser_profile
+from downloader.browser.pool import DriverPool
 from downloader.comic import ComicSource
 from downloader.sources.profiles import SourceProfile
 from downloader.tui import ERROR, MUTED, SUCCESS
@@ -24,21 +28,86 @@ class DriverManager:
         self.presenter = presenter
         self.current_driver: Any | None = None
         self.drivers: dict[tuple[str, bool], Any] = {}
+        self.pools: dict[tuple[str, bool], DriverPool] = {}
+        self.fallback_browsers: dict[bool, FallbackBrowser] = {}
+        # 使用持久化用户数据目录的驱动，关闭时释放目录锁
+        self.browser_profiles: dict[int, BrowserProfile] = {}
+        # 池中的浏览器在工作线程里创建，与主线程的初始化串行，避免互相覆盖 current_driver
+        self._init_lock = threading.RLock()
 
     def ensure_driver(
         self, source_or_class: SourceProfile | ComicSource | type[ComicSource] | None = None
     ) -> bool:
         cache_key = self.driver_cache_key(source_or_class)
-        driver = self.drivers.get(cache_key)
-        if driver:
-            self.current_driver = driver
+        with self._init_lock:
+            driver = self.drivers.get(cache_key)
+            if driver:
+                self.current_driver = driver
+                return True
+
+            self.presenter.print('正在初始化浏览器驱动...', style=MUTED)
+            if not self.init_driver(source_or_class):
+                return False
+            self.drivers[cache_key] = self.current_driver
             return True
 
-        self.presenter.print('正在初始化浏览器驱动...', style=MUTED)
-        if not self.init_driver(source_or_class):
-            return False
-        self.drivers[cache_key] = self.current_driver
-        return True
+    def driver_pool(
+        self, source_or_class: SourceProfile | ComicSource | type[ComicSource] | None = None
+    ) -> DriverPool | None:
+        """Pool of up to ``driver_pool_size`` browsers for the source, None when it is 1.
+
+        Sources with the same browser mode and headless setting share one pool,
+        seeded with the cached driver from ``ensure_driver``.
+        """
+        size = self._source_driver_pool_size(source_or_class)
+        if size <= 1:
+            return None
+        cache_key = self.driver_cache_key(source_or_class)
+        with self._init_lock:
+            pool = self.pools.get(cache_key)
+            if pool is None:
+                pool = DriverPool(
+                    lambda: self._create_pooled_driver(source_or_class),
+                    size,
+                    seed=self.drivers.get(cache_key),
+                    retire=lambda driver: self._retire_driver(cache_key, driver),
+                )
+                self.pools[cache_key] = pool
+            return pool
+
+    def fallback_browser(self, source: ComicSource) -> FallbackBrowser:
+        """SeleniumBase browser kept for the session to load pages requests got blocked on.
+
+        Sources with the same headless setting share it; it is launched on the
+        first fallback and closed when idle.
+        """
+        headless = source._browser_headless(default=False)
+        with self._init_lock:
+            fallback = self.fallback_browsers.get(headless)
+            if fallback is None:
+                fallback = FallbackBrowser(source._seleniumbase_context)
+                self.fallback_browsers[headless] = fallback
+            return fallback
+
+    def _create_pooled_driver(
+        self, source_or_class: SourceProfile | ComicSource | type[ComicSource] | None
+    ) -> Any:
+        with self._init_lock:
+            previous = self.current_driver
+            try:
+                if not self.init_driver(source_or_class):
+                    raise RuntimeError('浏览器驱动初始化失败')
+                return self.current_driver
+            finally:
+                self.current_driver = previous
+
+    def _retire_driver(self, cache_key: tuple[str, bool], driver: Any) -> None:
+        with self._init_lock:
+            if self.drivers.get(cache_key) is driver:
+                del self.drivers[cache_key]
+            if self.current_driver is driver:
+                self.current_driver = None
+        self._quit_driver(driver)
 
     def get_driver(
         self, source_or_class: SourceProfile | ComicSource | type[ComicSource] | None = None
@@ -92,16 +161,21 @@ class DriverManager:
     def _try_init_cloakbrowser_driver(
         self, source_or_class: SourceProfile | ComicSource | type[ComicSource] | None
     ) -> bool:
+        profile = self._acquire_browser_profile(source_or_class)
         try:
             self.current_driver = CloakBrowserDriver(
                 headless=self._source_browser_headless(source_or_class),
                 humanize=self._source_cloakbrowser_humanize(source_or_class),
                 timeout_seconds=self._source_browser_wait_seconds(source_or_class),
                 launch_options=self._source_cloakbrowser_options(source_or_class),
+                user_data_dir=str(profile.path) if profile else None,
             )
+            self._track_browser_profile(self.current_driver, profile)
             self.presenter.print('已初始化 CloakBrowser 浏览器驱动', style=SUCCESS)
             return True
         except Exception as e:
+            if profile is not None:
+                profile.release()
             logger.debug('初始化 CloakBrowser 驱动失败: {error}', error=e, exc_info=True)
             self.presenter.print(f'CloakBrowser 浏览器驱动初始化失败: {e}', style=f'bold {ERROR}')
             return False
@@ -109,18 +183,44 @@ class DriverManager:
     def _try_init_seleniumbase_driver(
         self, source_or_class: SourceProfile | ComicSource | type[ComicSource] | None
     ) -> bool:
+        profile = self._acquire_browser_profile(source_or_class)
         try:
             self.current_driver = SeleniumBaseDriver(
                 headless=self._source_browser_headless(source_or_class),
                 timeout_seconds=self._source_browser_wait_seconds(source_or_class),
+                fixed_waits=self._source_browser_fixed_waits(source_or_class),
+                user_data_dir=str(profile.path) if profile else None,
             )
+            self._track_browser_profile(self.current_driver, profile)
             self.presenter.print('已初始化 SeleniumBase 浏览器会话', style=SUCCESS)
             return True
         except Exception as e:
+            if profile is not None:
+                profile.release()
             logger.debug('初始化 SeleniumBase 驱动失败: {error}', error=e, exc_info=True)
             self.presenter.print(f'SeleniumBase 浏览器会话初始化失败: {e}', style=f'bold {ERROR}')
             return False
 
+    def _acquire_browser_profile(
+        self, source_or_class: SourceProfile | ComicSource | type[ComicSource] | None
+    ) -> BrowserProfile | None:
+        if not self._source_persistent_browser_profile(source_or_class):
+            return None
+        driver_mode, headless = self.driver_cache_key(source_or_class)
+        name = f'{driver_mode}-{"headless" if headless else "headed"}'
+        try:
+            profile = acquire_browser_profile(name)
+        except OSError as e:
+            logger.warning('无法使用持久化的浏览器用户数据目录: {error}', error=e)
+            return None
+        if profile is None:
+            logger.warning('持久化的浏览器用户数据目录都在使用中，本次使用临时目录')
+        return profile
+
+    def _track_browser_profile(self, driver: Any, profile: BrowserProfile | None) -> None:
+        if profile is not None:
+            self.browser_profiles[id(driver)] = profile
+
     def driver_cache_key(
         self, source_or_class: SourceProfile | ComicSource | type[ComicSource] | None = None
     ) -> tuple[str, bool]:
@@ -185,6 +285,30 @@ class DriverManager:
             wait_seconds = getattr(source_or_class, 'seleniumbase_wait_seconds', 30.0)
         return float(30.0 if wait_seconds is None else wait_seconds)
 
+    def _source_browser_fixed_waits(
+        self, source_or_class: SourceProfile | ComicSource | type[ComicSource] | None = None
+    ) -> bool:
+        profile = self._profile_for_source(source_or_class)
+        if profile is not None:
+            return profile.browser_fixed_waits
+        return bool(getattr(source_or_class, 'browser_fixed_waits', False))
+
+    def _source_persistent_browser_profile(
+        self, source_or_class: SourceProfile | ComicSource | type[ComicSource] | None = None
+    ) -> bool:
+        profile = self._profile_for_source(source_or_class)
+        if profile is not None:
+            return profile.persistent_browser_profile
+        return bool(getattr(source_or_class, 'persistent_browser_profile', False))
+
+    def _source_driver_pool_size(
+        self, source_or_class: SourceProfile | ComicSource | type[ComicSource] | None = None
+    ) -> int:
+        profile = self._profile_for_source(source_or_class)
+        if profile is not None:
+            return int(profile.driver_pool_size)
+        return int(getattr(source_or_class, 'driver_pool_size', 1) or 1)
+
     def _source_cloakbrowser_humanize(
         self, source_or_class: SourceProfile | ComicSource | type[ComicSource] | None = None
     ) -> bool:
@@ -210,8 +334,18 @@ class DriverManager:
             logger.debug('关闭浏览器驱动被中断: {error}', error=e)
         except Exception as e:
             logger.debug('关闭浏览器驱动失败: {error}', error=e)
+        profile = self.browser_profiles.pop(id(driver), None)
+        if profile is not None:
+            profile.release()
 
     def destroy(self) -> None:
+        # 池会关闭自己的浏览器（包括作为种子的缓存驱动），并把它们从 drivers 中移除
+        for pool in self.pools.values():
+            pool.close()
+        self.pools.clear()
+        for fallback in self.fallback_browsers.values():
+            fallback.close()
+        self.fallback_browsers.clear()
         for driver in set(self.drivers.values()):
             self._quit_driver(driver)
         self.drivers.clear()
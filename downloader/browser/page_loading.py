@@ -11,9 +11,18 @@ from pathlib import Path
 from typing import Any
 from urllib.parse import urlsplit, urlunsplit
 
+import requests
 from lxml import etree  # pyright: ignore[reportAttributeAccessIssue]
 
-from downloader.browser.modes import CLOAKBROWSER_MODE, SELENIUMBASE_MODE, BrowserModeName
+from downloader.browser.cookie_bridge import bridge_browser_session
+from downloader.browser.modes import (
+    CLOAKBROWSER_MODE,
+    REQUESTS_MODE,
+    SELENIUMBASE_MODE,
+    BrowserModeName,
+)
+from downloader.browser.readiness import settle_page
+from downloader.download.host_selection import url_origin
 
 BLOCK_FALLBACK_STATUS_CODES = {403, 429}
 ERROR_CHAIN_LIMIT = 5
@@ -40,6 +49,8 @@ class PageLoadRequest:
     headers: dict[str, str] | None = None
     wait_selector: str | None = None
     wait_seconds: float = 0
+    fixed_waits: bool = False
+    bridge_cookies: bool = False
     diagnostics_dir: str | Path | None = None
 
 
@@ -68,8 +79,71 @@ class PageLoadResult:
 class PageLoader:
     def __init__(self) -> None:
         self.parser = etree.HTMLParser()
+        # 浏览器通过验证后 Cookie 已同步到请求会话的站点，之后的页面先用 requests 加载
+        self.bridged_origins: set[str] = set()
 
     def load(self, request: PageLoadRequest, adapters: PageLoadAdapters) -> PageLoadResult:
+        """Load a page, moving browser-mode pages to plain requests once a browser got through.
+
+        With ``request.bridge_cookies`` (and for every requests-mode page that fell
+        back to the browser) a successful browser load copies the browser's
+        cookies and User-Agent into ``adapters.http``. Later GETs to that origin
+        use requests until a block status or error sends them back to the browser.
+        """
+        origin = url_origin(request.url)
+        if origin in self.bridged_origins and self._bridge_applies(request):
+            result = self._load_bridged(request, adapters)
+            if result.ok:
+                return result
+            self.bridged_origins.discard(origin)
+
+        result = self._load(request, adapters)
+        if (
+            result.ok
+            and result.browser_mode in {SELENIUMBASE_MODE, CLOAKBROWSER_MODE}
+            and (request.bridge_cookies or request.browser_mode == REQUESTS_MODE)
+        ):
+            browser = adapters.browsers.get(result.browser_mode)
+            if browser is not None and bridge_browser_session(browser, adapters.http):
+                self.bridged_origins.add(origin)
+        return result
+
+    @staticmethod
+    def _bridge_applies(request: PageLoadRequest) -> bool:
+        return (
+            request.bridge_cookies
+            and request.browser_mode != REQUESTS_MODE
+            and request.method.upper() == 'GET'
+        )
+
+    def _load_bridged(self, request: PageLoadRequest, adapters: PageLoadAdapters) -> PageLoadResult:
+        """GET with the cookies copied from the browser; any block or error is a failure."""
+        try:
+            response = adapters.http.get(
+                request.url, timeout=30, headers=self._request_headers(request)
+            )
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            return PageLoadResult(
+                failure_reason='bridged_request_failed',
+                error_message=str(e),
+                status_code=getattr(getattr(e, 'response', None), 'status_code', None),
+                recoverable=True,
+            )
+        response.encoding = request.encoding
+        return PageLoadResult(
+            root=etree.parse(StringIO(response.text), self.parser),
+            browser_mode=REQUESTS_MODE,
+        )
+
+    @staticmethod
+    def _request_headers(request: PageLoadRequest) -> dict[str, str]:
+        request_headers = {'referer': request.base_url}
+        if request.headers:
+            request_headers.update(request.headers)
+        return request_headers
+
+    def _load(self, request: PageLoadRequest, adapters: PageLoadAdapters) -> PageLoadResult:
         if request.browser_mode == SELENIUMBASE_MODE:
             return self._load_with_seleniumbase(request, adapters.browsers.get(SELENIUMBASE_MODE))
         if request.browser_mode == CLOAKBROWSER_MODE:
@@ -80,9 +154,7 @@ class PageLoader:
             )
 
         method = request.method.upper()
-        request_headers = {'referer': request.base_url}
-        if request.headers:
-            request_headers.update(request.headers)
+        request_headers = self._request_headers(request)
 
         if method == 'POST':
             response = adapters.http.post(
@@ -138,11 +210,7 @@ class PageLoader:
             )
         try:
             browser.activate_cdp_mode(request.url)
-            browser.sleep(10)
-            solve_captcha = getattr(browser, 'solve_captcha', None)
-            if callable(solve_captcha):
-                solve_captcha()
-            browser.sleep(5)
+            settle_page(browser, request.wait_selector, fixed_waits=request.fixed_waits)
             self._wait_for_seleniumbase(request, browser)
             html = self._seleniumbase_page_source(browser)
             return PageLoadResult(
@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import os
+import shutil
+import sqlite3
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from http.cookiejar import Cookie, CookieJar
+from pathlib import Path
+from typing import IO, Any
+
+from loguru import logger
+from requests.cookies import create_cookie
+
+from downloader.browser.drivers import app_cache_dir
+
+if sys.platform == 'win32':
+    import msvcrt
+else:
+    import fcntl
+
+COOKIE_STORE_FILE_NAME = 'cookies.sqlite3'
+SESSION_COOKIE_MAX_AGE_SECONDS = 24 * 60 * 60
+"""没有过期时间的会话 Cookie 跨进程最多保留一天"""
+BROWSER_PROFILE_DIR_NAME = 'browser-profiles'
+BROWSER_PROFILE_SLOTS = 8
+"""同名用户数据目录的个数上限，池中的每个浏览器、每个进程各占一个"""
+BROWSER_PROFILE_MAX_AGE_SECONDS = 30 * 24 * 60 * 60
+"""超过这么久没有使用的浏览器用户数据目录会被删除"""
+
+_COOKIE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cookies (
+    source TEXT NOT NULL,
+    domain TEXT NOT NULL,
+    path TEXT NOT NULL,
+    name TEXT NOT NULL,
+    value TEXT NOT NULL,
+    secure INTEGER NOT NULL,
+    session INTEGER NOT NULL,
+    expires REAL NOT NULL,
+    PRIMARY KEY (source, domain, path, name)
+)
+"""
+
+
+def cookie_matches_hosts(domain: str, hosts: Iterable[str]) -> bool:
+    """Whether a cookie for ``domain`` is sent to, or set by, one of ``hosts``."""
+    domain = domain.lstrip('.').lower()
+    if not domain:
+        return False
+    for host in hosts:
+        name = host.lower()
+        if name == domain or name.endswith('.' + domain) or domain.endswith('.' + name):
+            return True
+    return False
+
+
+class CookieStore:
+    """Cookies of each source in one SQLite file shared by every downloader process.
+
+    SQLite's locking keeps concurrent processes from corrupting the file and a
+    save only upserts the cookies it was given, so two processes merge rather
+    than overwrite each other. Expired cookies are skipped on load and deleted
+    on save; session cookies are kept for ``SESSION_COOKIE_MAX_AGE_SECONDS`` and
+    come back as session cookies.
+    """
+
+    def __init__(
+        self, path: str | Path | None = None, *, clock: Callable[[], float] = time.time
+    ) -> None:
+        self.path = Path(path) if path is not None else app_cache_dir() / COOKIE_STORE_FILE_NAME
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(_COOKIE_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def load(self, source_name: str, jar: CookieJar) -> int:
+        """Add the source's unexpired cookies to ``jar``; return how many."""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT domain, path, name, value, secure, session, expires FROM cookies '
+                'WHERE source = ? AND expires > ?',
+                (source_name, self._clock()),
+            ).fetchall()
+        for domain, path, name, value, secure, session, expires in rows:
+            jar.set_cookie(
+                create_cookie(
+                    name,
+                    value,
+                    domain=domain,
+                    path=path,
+                    secure=bool(secure),
+                    expires=None if session else int(expires),
+                )
+            )
+        return len(rows)
+
+    def save(self, source_name: str, cookies: Iterable[Cookie], hosts: Iterable[str]) -> int:
+        """Store the cookies that belong to ``hosts``; return how many were written."""
+        now = self._clock()
+        hosts = [host for host in hosts if host]
+        rows = []
+        for cookie in cookies:
+            if cookie.value is None or not cookie_matches_hosts(cookie.domain, hosts):
+                continue
+            session = cookie.expires is None
+            expires = now + SESSION_COOKIE_MAX_AGE_SECONDS if session else float(cookie.expires)
+            if expires <= now:
+                continue
+            rows.append(
+                (
+                    source_name,
+                    cookie.domain,
+                    cookie.path,
+                    cookie.name,
+                    cookie.value,
+                    int(cookie.secure),
+                    int(session),
+                    expires,
+                )
+            )
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                self._conn.execute('DELETE FROM cookies WHERE expires <= ?', (now,))
+                self._conn.executemany(
+                    'INSERT OR REPLACE INTO cookies VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows
+                )
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+            self._conn.execute('COMMIT')
+        return len(rows)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class FileLock:
+    """Non-blocking exclusive lock on a file, dropped by ``release()`` or when the process exits."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._file: IO[Any] | None = None
+
+    def acquire(self) -> bool:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        handle = open(self.path, 'a+b')  # noqa: SIM115 - held open while locked
+        try:
+            _lock_file(handle)
+        except OSError:
+            handle.close()
+            return False
+        self._file = handle
+        # 锁文件的修改时间记录最后一次使用，用于清理长期不用的目录
+        os.utime(self.path)
+        return True
+
+    def release(self) -> None:
+        handle, self._file = self._file, None
+        if handle is None:
+            return
+        try:
+            _unlock_file(handle)
+        except OSError as e:
+            logger.debug('释放文件锁失败: {error}', error=e)
+        handle.close()
+
+
+@dataclass
+class BrowserProfile:
+    path: Path
+    lock: FileLock
+
+    def release(self) -> None:
+        self.lock.release()
+
+
+def acquire_browser_profile(name: str, root: Path | None = None) -> BrowserProfile | None:
+    """Lock the first free ``<name>-<n>`` user-data directory; None when every slot is busy.
+
+    Chrome cannot share a profile between running instances, so each pooled
+    browser and each process gets its own slot. Profiles unused for
+    ``BROWSER_PROFILE_MAX_AGE_SECONDS`` are removed first.
+    """
+    base = root or app_cache_dir() / BROWSER_PROFILE_DIR_NAME
+    prune_browser_profiles(base)
+    for slot in range(BROWSER_PROFILE_SLOTS):
+        path = base / f'{name}-{slot}'
+        lock = FileLock(base / f'{name}-{slot}.lock')
+        if lock.acquire():
+            path.mkdir(parents=True, exist_ok=True)
+            return BrowserProfile(path, lock)
+    return None
+
+
+def prune_browser_profiles(
+    root: Path,
+    *,
+    max_age_seconds: float = BROWSER_PROFILE_MAX_AGE_SECONDS,
+    clock: Callable[[], float] = time.time,
+) -> int:
+    """Delete profile directories whose lock is free and older than ``max_age_seconds``."""
+    if not root.is_dir():
+        return 0
+    removed = 0
+    for lock_path in root.glob('*.lock'):
+        try:
+            age = clock() - lock_path.stat().st_mtime
+        except OSError:
+            continue
+        if age < max_age_seconds:
+            continue
+        lock = FileLock(lock_path)
+        if not lock.acquire():
+            continue
+        try:
+            shutil.rmtree(lock_path.with_suffix(''), ignore_errors=True)
+            # Windows 上无法删除打开的文件，留下的锁文件不影响下次使用
+            lock_path.unlink(missing_ok=True)
+        except OSError:
+            pass
+        finally:
+            lock.release()
+        removed += 1
+        logger.debug('已删除长期未使用的浏览器用户数据目录: {}', lock_path.with_suffix(''))
+    return removed
+
+
+if sys.platform == 'win32':
+
+    def _lock_file(handle: IO[Any]) -> None:
+        handle.seek(0)
+        msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+
+    def _unlock_file(handle: IO[Any]) -> None:
+        handle.seek(0)
+        msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+else:
+
+    def _lock_file(handle: IO[Any]) -> None:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    def _unlock_file(handle: IO[Any]) -> None:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
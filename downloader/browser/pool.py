@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from loguru import logger
+
+DRIVER_POOL_MAX_USES = 50
+"""浏览器实例使用多少次后回收重建，避免长时间运行的浏览器占用内存越来越多"""
+
+
+def driver_is_healthy(driver: Any) -> bool:
+    """Cheap liveness probe: ``is_healthy()`` when the adapter has one, else ``current_url``."""
+    try:
+        check = getattr(driver, 'is_healthy', None)
+        if callable(check):
+            return bool(check())
+        _ = driver.current_url
+    except Exception:
+        return False
+    return True
+
+
+class DriverPool:
+    """Bounded set of browser instances handed out to one thread at a time.
+
+    Instances are created lazily up to ``size``. Every checkout runs a health
+    check first and replaces a dead browser; an instance is quit and recreated
+    after ``max_uses`` checkouts or when the caller reports it broken.
+    ``retire`` quits the instances the pool drops.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        size: int,
+        *,
+        seed: Any = None,
+        max_uses: int = DRIVER_POOL_MAX_USES,
+        retire: Callable[[Any], None] | None = None,
+    ) -> None:
+        self.size = max(1, int(size))
+        self.max_uses = max(1, int(max_uses))
+        self._factory = factory
+        self._quit_driver = retire or _quit
+        self._condition = threading.Condition()
+        self._idle: list[Any] = []
+        self._uses: dict[int, int] = {}
+        self._created = 0
+        self._closed = False
+        if seed is not None:
+            self._idle.append(seed)
+            self._uses[id(seed)] = 0
+            self._created = 1
+
+    @property
+    def in_use(self) -> int:
+        with self._condition:
+            return self._created - len(self._idle)
+
+    def checkout(self, timeout: float | None = None) -> Any:
+        """Borrow an instance, waiting up to ``timeout`` seconds when all are busy."""
+        while True:
+            driver = self._take(timeout)
+            if driver is None:
+                return self._create()
+            if driver_is_healthy(driver):
+                return driver
+            logger.warning('浏览器实例已失效，重新创建')
+            self._retire(driver)
+
+    def checkin(self, driver: Any, *, broken: bool = False) -> None:
+        with self._condition:
+            uses = self._uses.get(id(driver), 0) + 1
+            self._uses[id(driver)] = uses
+            recycle = broken or self._closed or uses >= self.max_uses
+            if not recycle:
+                self._idle.append(driver)
+                self._condition.notify()
+                return
+        if not broken and not self._closed:
+            logger.debug('浏览器实例已使用 {} 次，回收重建', uses)
+        self._retire(driver)
+
+    @contextmanager
+    def lease(self, timeout: float | None = None) -> Iterator[Any]:
+        driver = self.checkout(timeout)
+        broken = False
+        try:
+            yield driver
+        except Exception:
+            broken = not driver_is_healthy(driver)
+            raise
+        finally:
+            self.checkin(driver, broken=broken)
+
+    def close(self) -> None:
+        """Quit every idle instance; busy ones are quit when they are checked in."""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._condition.notify_all()
+        for driver in idle:
+            self._retire(driver)
+
+    def _take(self, timeout: float | None) -> Any:
+        """An idle instance, or None when the caller may create a new one."""
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise RuntimeError('浏览器实例池已关闭')
+                if self._idle:
+                    return self._idle.pop()
+                if self._created < self.size:
+                    # 先占住名额，创建浏览器很慢，不能在锁内进行
+                    self._created += 1
+                    return None
+                if not self._condition.wait(timeout):
+                    raise TimeoutError('等待空闲浏览器实例超时')
+
+    def _create(self) -> Any:
+        try:
+            driver = self._factory()
+        except BaseException:
+            with self._condition:
+                self._created -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._uses[id(driver)] = 0
+        return driver
+
+    def _retire(self, driver: Any) -> None:
+        with self._condition:
+            self._uses.pop(id(driver), None)
+            self._created -= 1
+            self._condition.notify()
+        self._quit_driver(driver)
+
+
+def _quit(driver: Any) -> None:
+    try:
+        driver.quit()
+    except Exception as e:
+        logger.debug('关闭浏览器驱动失败: {error}', error=e)
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from loguru import logger
+
+READINESS_TIMEOUT_SECONDS = 15.0
+"""与原先固定等待的 10 + 5 秒相同，超时后按原流程继续"""
+READINESS_POLL_SECONDS = 0.25
+READINESS_QUIET_SECONDS = 0.5
+"""DOM 连续这么久没有变化才视为渲染完成"""
+FIXED_WAIT_SECONDS = (10, 5)
+"""browser_fixed_waits 开启时使用的旧流程：等待、处理验证码、再等待"""
+
+# 页面内一次取回全部状态，每次轮询只有一次 CDP 往返。MutationObserver 记录最后一次
+# DOM 变化的时间，导航后页面重建时会重新安装。
+_PAGE_STATE_SCRIPT = """(() => {
+  if (!window.__readinessObserver) {
+    window.__readinessLastMutation = performance.now();
+    window.__readinessObserver = new MutationObserver(() => {
+      window.__readinessLastMutation = performance.now();
+    });
+    window.__readinessObserver.observe(document, {
+      childList: true, subtree: true, attributes: true, characterData: true
+    });
+  }
+  const selector = %s;
+  let matched = false;
+  try { matched = !!(selector && document.querySelector(selector)); } catch (e) {}
+  const title = document.title || '';
+  const challenge = /just a moment|请稍候|checking your browser|attention required/i.test(title)
+    || !!document.querySelector(
+      '#challenge-form, #challenge-stage, #cf-challenge-running, .cf-turnstile, '
+      + 'iframe[src*="challenges.cloudflare.com"]'
+    );
+  return JSON.stringify({
+    ready_state: document.readyState,
+    quiet_seconds: (performance.now() - window.__readinessLastMutation) / 1000,
+    matched: matched,
+    challenge: challenge
+  });
+})()"""
+
+_poll_event = threading.Event()
+
+
+@dataclass(frozen=True)
+class PageState:
+    ready_state: str = ''
+    quiet_seconds: float = 0.0
+    matched: bool = False
+    challenge: bool = False
+
+
+@dataclass(frozen=True)
+class ReadinessResult:
+    ready: bool
+    reason: str
+    elapsed: float = 0.0
+
+
+def settle_page(
+    browser: Any, selector: str | None = None, *, fixed_waits: bool = False
+) -> ReadinessResult:
+    """Wait until a freshly navigated SeleniumBase page is usable.
+
+    ``fixed_waits`` keeps the old sleep / solve_captcha / sleep sequence for
+    sources that need it; otherwise the page is polled through CDP.
+    """
+    if fixed_waits:
+        first, second = FIXED_WAIT_SECONDS
+        browser.sleep(first)
+        _solve_captcha(browser)
+        browser.sleep(second)
+        return ReadinessResult(True, 'fixed', float(first + second))
+    return wait_for_page_ready(browser, selector)
+
+
+def wait_for_page_ready(
+    browser: Any,
+    selector: str | None = None,
+    *,
+    timeout: float = READINESS_TIMEOUT_SECONDS,
+    clock: Callable[[], float] = time.monotonic,
+    pause: Callable[[float], Any] = _poll_event.wait,
+) -> ReadinessResult:
+    """Poll the page until ``selector`` matches or the loaded page stops changing.
+
+    A challenge page (Cloudflare and the like) is never ready; ``solve_captcha``
+    is tried once when it shows up and polling goes on until it is gone. Returns
+    a not-ready result on timeout or when the browser cannot evaluate scripts.
+    """
+    evaluate = _page_evaluator(browser)
+    if evaluate is None:
+        return ReadinessResult(False, 'unsupported')
+
+    started = clock()
+    script = _PAGE_STATE_SCRIPT % json.dumps(selector or '')
+    solved = False
+    while True:
+        state = _read_page_state(evaluate, script)
+        elapsed = clock() - started
+        if state is not None and state.challenge:
+            if not solved:
+                solved = True
+                logger.debug('页面处于验证页，尝试处理验证码')
+                _try_solve_captcha(browser)
+        elif state is not None and selector and state.matched:
+            return ReadinessResult(True, 'selector', elapsed)
+        elif (
+            state is not None
+            and state.ready_state == 'complete'
+            and state.quiet_seconds >= READINESS_QUIET_SECONDS
+        ):
+            return ReadinessResult(True, 'loaded', elapsed)
+        if elapsed >= timeout:
+            logger.debug('等待页面就绪超时: {:.1f} 秒', elapsed)
+            return ReadinessResult(False, 'timeout', elapsed)
+        pause(READINESS_POLL_SECONDS)
+
+
+def _page_evaluator(browser: Any) -> Callable[[str], Any] | None:
+    evaluate = getattr(getattr(browser, 'cdp', None), 'evaluate', None)
+    return evaluate if callable(evaluate) else None
+
+
+def _read_page_state(evaluate: Callable[[str], Any], script: str) -> PageState | None:
+    try:
+        raw = evaluate(script)
+        values = json.loads(raw) if isinstance(raw, str) else raw
+        if not isinstance(values, dict):
+            return None
+        return PageState(
+            ready_state=str(values.get('ready_state') or ''),
+            quiet_seconds=float(values.get('quiet_seconds') or 0),
+            matched=bool(values.get('matched')),
+            challenge=bool(values.get('challenge')),
+        )
+    except Exception as e:
+        # 导航进行中执行上下文会被销毁，下一轮再读
+        logger.debug('读取页面状态失败: {error}', error=e)
+        return None
+
+
+def _solve_captcha(browser: Any) -> None:
+    solve_captcha = getattr(browser, 'solve_captcha', None)
+    if callable(solve_captcha):
+        solve_captcha()
+
+
+def _try_solve_captcha(browser: Any) -> None:
+    try:
+        _solve_captcha(browser)
+    except Exception as e:
+        logger.debug('处理验证码失败: {error}', error=e)
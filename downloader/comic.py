@@ -2,7 +2,10 @@ import concurrent.futures  # re-exported for tests that monkeypatch downloader.c
 import json
 import os
 import sys
+import threading
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Any
 
@@ -10,6 +13,7 @@ import requests
 from loguru import logger
 from lxml import etree  # pyright: ignore[reportAttributeAccessIssue]
 
+from downloader.browser.fallback import FallbackBrowser
 from downloader.browser.html_parser import HtmlParsingMixin
 from downloader.browser.modes import (
     REQUESTS_MODE,
@@ -17,9 +21,14 @@ from downloader.browser.modes import (
     is_driver_backed_browser_mode,
     normalize_browser_mode,
 )
+from downloader.browser.pool import DriverPool
 from downloader.download.archive import ArchiveMixin
+from downloader.download.archive_formats import ZIP_FORMAT, ArchiveFormatName
+from downloader.download.async_images import THREAD_ENGINE, ImageDownloadEngineName
 from downloader.download.images import ImageDownloadMixin
+from downloader.download.prefetch import ImageListPrefetcher, VolumeJob
 from downloader.download.progress import DownloadProgress, RichDownloadProgress
+from downloader.download.retry import RetryPolicy
 from downloader.download.volume import download_volume
 from downloader.models import (
     Comic,
@@ -66,17 +75,42 @@ class ComicSource(ImageDownloadMixin, ArchiveMixin, HtmlParsingMixin, ABC):
     browser_wait_selector: str | None = None
     browser_wait_seconds: float | None = None
     browser_headless: bool | None = None
+    browser_fixed_waits: bool = False
+    browser_cookie_bridge: bool = False
+    persistent_cookies: bool = False
+    persistent_browser_profile: bool = False
     cloakbrowser_humanize: bool = True
     cloakbrowser_options: dict[str, Any] | None = None
     config_file: str | None = None
     download_interval: float = 0
     image_request_interval: float | None = None
+    image_requests_per_second: float | None = None
+    image_request_burst: int = 1
     page_load_wait_seconds: float | None = None
     scroll_wait_seconds: float | None = None
     max_scroll_attempts: int | None = None
     download_requires_driver: bool = False
     image_retry_count: int = 1
     max_download_workers: int = 5
+    adaptive_download_workers: bool = False
+    image_download_engine: ImageDownloadEngineName = THREAD_ENGINE
+    async_connections_per_host: int = 16
+    image_blob_store: bool = False
+    stream_to_archive: bool = False
+    keep_image_dir: bool = True
+    archive_format: ArchiveFormatName = ZIP_FORMAT
+    archive_workers: int = 0
+    repair_archives: bool = False
+    download_journal: bool = False
+    library_index: bool = False
+    volume_parse_lookahead: int = 0
+    concurrent_volumes: int = 1
+    prewarm_connections: bool = False
+    image_hedge_ratio: float = 0.0
+    retry_budget_ratio: float = 0.2
+    driver_pool_size: int = 1
+    driver_pool: DriverPool | None = None
+    fallback_browser: FallbackBrowser | None = None
     enable: bool = True
     seleniumbase_headless: bool | None = None
     seleniumbase_wait_selector: str | None = None
@@ -170,11 +204,14 @@ class ComicSource(ImageDownloadMixin, ArchiveMixin, HtmlParsingMixin, ABC):
         """下载根目录"""
         self.http: requests.Session = http
         """requests 会话对象"""
-        self.driver: Any = driver
-        """Selenium 网页驱动对象"""
+        self._driver_leases = threading.local()
+        self.driver = driver
         self.overwrite: bool = overwrite
         """是否覆盖已存在的文件"""
         self.profile: SourceProfile | None = profile
+        self.driver_lock = threading.RLock()
+        """串行化对单个浏览器驱动的访问"""
+        self.image_prefetcher: ImageListPrefetcher | None = None
 
         self.parser: etree.HTMLParser = etree.HTMLParser()
         self.logger = logger
@@ -191,6 +228,48 @@ class ComicSource(ImageDownloadMixin, ArchiveMixin, HtmlParsingMixin, ABC):
         else:
             self.config = {}
 
+        self.retry_policy = RetryPolicy(
+            budget_ratio=float(self._source_profile_value('retry_budget_ratio', 0.2) or 0)
+        )
+        """页面、API 和图片请求共用的重试策略与预算"""
+
+    @property
+    def driver(self) -> Any:
+        """Selenium 网页驱动对象，当前线程从浏览器池借用了实例时返回借用的实例"""
+        leased = getattr(getattr(self, '_driver_leases', None), 'driver', None)
+        return self._driver if leased is None else leased
+
+    @driver.setter
+    def driver(self, value: Any) -> None:
+        self._driver = value
+
+    @contextmanager
+    def leased_driver(self) -> Iterator[Any]:
+        """Give the current thread a browser of its own for the duration of the block.
+
+        With a ``driver_pool`` the browser is checked out of the pool, so several
+        threads can parse pages in parallel; otherwise the shared driver is
+        guarded by ``driver_lock``.
+        """
+        leased = getattr(self._driver_leases, 'driver', None)
+        if leased is not None:
+            yield leased
+            return
+        pool = self.driver_pool
+        if pool is None:
+            if self._driver is None:
+                yield None
+                return
+            with self.driver_lock:
+                yield self._driver
+            return
+        with pool.lease() as driver:
+            self._driver_leases.driver = driver
+            try:
+                yield driver
+            finally:
+                self._driver_leases.driver = None
+
     def _apply_source_profile(self, profile: SourceProfile) -> None:
         for key in PROFILE_MIRROR_ATTRIBUTE_KEYS:
             setattr(self, key, getattr(profile, key))
@@ -309,36 +388,125 @@ class ComicSource(ImageDownloadMixin, ArchiveMixin, HtmlParsingMixin, ABC):
         os.makedirs(path, exist_ok=True)
         summary = DownloadSummary()
 
-        total_vols = sum(len(book.vols) for book in comic.books)
-        with self.create_download_progress() as progress:
+        jobs: list[VolumeJob] = []
+        book_starts: dict[int, ComicBook] = {}
+        for book in comic.books:
+            book_path = os.path.join(path, filter_dir_name(book.name or '默认章节'))
+            if book.vols:
+                book_starts[len(jobs)] = book
+            jobs.extend(VolumeJob(book_path, vol.name, vol.url) for vol in book.vols)
+
+        def log_book_start(index: int) -> None:
+            book = book_starts.get(index)
+            if book is not None:
+                logger.info('处理章节: {} (共 {} 话)', book.name, len(book.vols))
+
+        with (
+            self.create_download_progress() as progress,
+            self.image_download_run(),
+            self.archive_finalization(),
+            self.image_list_prefetch() as prefetcher,
+        ):
             # 总体进度条：贯穿所有章节，让大下载一眼可见 X/N 的完成度，
             # 替代此前按 book 拆分的孤立 bar。
             overall_id = progress.add_task(
-                description=f'📦 {comic.name or "未知动漫"} · 共 {total_vols} 章',
-                total=total_vols,
+                description=f'📦 {comic.name or "未知动漫"} · 共 {len(jobs)} 章',
+                total=len(jobs),
             )
-
-            for book in comic.books:
-                book_path = os.path.join(path, filter_dir_name(book.name or '默认章节'))
-                logger.info('处理章节: {}', book.name)
-
-                for vol in book.vols:
-                    try:
-                        result = self.__download_vol__(book_path, vol.name, vol.url, progress)
-                    except Exception as e:
-                        logger.error(
-                            '下载卷/话失败: {} ({}), 错误: {}', vol.name, vol.url, e, exc_info=True
-                        )
-                        result = VolumeDownloadResult(
-                            name=vol.name,
-                            url=vol.url,
-                            status='failed',
-                            message=str(e),
-                        )
-                    summary.add(result)
-                    progress.advance(overall_id)
+            for result in self._download_vol_jobs(
+                jobs, progress, overall_id, prefetcher, log_book_start
+            ):
+                summary.add(result)
+        summary.collect_finalized()
         return summary
 
+    def _download_vol_jobs(
+        self,
+        jobs: list[VolumeJob],
+        progress: DownloadProgress,
+        task_id: Any,
+        prefetcher: ImageListPrefetcher,
+        on_job_start: Callable[[int], None] | None = None,
+    ) -> list[VolumeDownloadResult]:
+        """下载一组卷/话，结果按 ``jobs`` 的顺序返回
+
+        ``concurrent_volumes`` 大于 1 时同时下载多个卷/话；它们共用
+        ``image_download_run`` 的图片线程池和按主机的限速，所以总并发不变，
+        只是页数少的卷/话不会再让线程池空转。每个卷/话开始前以其序号调用
+        ``on_job_start``。
+        """
+        workers = min(self._concurrent_volume_limit(), len(jobs))
+        if workers <= 1:
+            results = []
+            for index, job in enumerate(jobs):
+                if on_job_start is not None:
+                    on_job_start(index)
+                prefetcher.schedule(jobs[index + 1 :])
+                results.append(self._download_vol_job(job, progress))
+                progress.advance(task_id)
+            return results
+
+        results_by_index: dict[int, VolumeDownloadResult] = {}
+        pending: dict[concurrent.futures.Future, int] = {}
+        next_index = 0
+        executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix='volume-download'
+        )
+        interrupted = True
+        try:
+            while next_index < len(jobs) or pending:
+                while next_index < len(jobs) and len(pending) < workers:
+                    if on_job_start is not None:
+                        on_job_start(next_index)
+                    future = executor.submit(self._download_vol_job, jobs[next_index], progress)
+                    pending[future] = next_index
+                    next_index += 1
+                    prefetcher.schedule(jobs[next_index:])
+                done, _ = concurrent.futures.wait(
+                    pending, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    results_by_index[pending.pop(future)] = future.result()
+                    progress.advance(task_id)
+            interrupted = False
+        finally:
+            # 中断时不等待正在下载的卷，外层 image_download_run 会取消它们的图片任务
+            executor.shutdown(wait=not interrupted, cancel_futures=True)
+        return [results_by_index[index] for index in range(len(jobs))]
+
+    def _concurrent_volume_limit(self) -> int:
+        configured = max(1, int(self._source_profile_value('concurrent_volumes', 1) or 1))
+        # 浏览器驱动不是线程安全的，依赖驱动的源同时下载的卷数不超过浏览器池的大小
+        if self.current_browser_mode_uses_driver():
+            pool = self.driver_pool
+            return 1 if pool is None else min(configured, pool.size)
+        return configured
+
+    def _download_vol_job(self, job: VolumeJob, progress: DownloadProgress) -> VolumeDownloadResult:
+        try:
+            return self.__download_vol__(job.path, job.vol_name, job.url, progress)
+        except Exception as e:
+            logger.error(
+                '下载卷/话失败: {} ({}), 错误: {}', job.vol_name, job.url, e, exc_info=True
+            )
+            return VolumeDownloadResult(
+                name=job.vol_name,
+                url=job.url,
+                status='failed',
+                message=str(e),
+            )
+
+    @contextmanager
+    def image_list_prefetch(self) -> Iterator[ImageListPrefetcher]:
+        """在当前卷下载期间，于后台预解析后续卷的图片列表"""
+        depth = int(self._source_profile_value('volume_parse_lookahead', 0) or 0)
+        with ImageListPrefetcher(self, depth) as prefetcher:
+            self.image_prefetcher = prefetcher
+            try:
+                yield prefetcher
+            finally:
+                self.image_prefetcher = None
+
     def create_download_progress(self) -> DownloadProgress:
         return RichDownloadProgress()
 
@@ -354,7 +522,16 @@ class ComicSource(ImageDownloadMixin, ArchiveMixin, HtmlParsingMixin, ABC):
         """
 
     def parse_images(self, url: str) -> list[str]:
-        return self.__parse_imgs__(url)
+        prefetcher = self.image_prefetcher
+        prefetched = prefetcher.take(url) if prefetcher is not None else None
+        if prefetched is not None and not prefetched.cancelled():
+            return prefetched.result()
+        return self._parse_images_now(url)
+
+    def _parse_images_now(self, url: str) -> list[str]:
+        # 浏览器驱动不是线程安全的，预解析与当前卷要么串行共用一个驱动，要么各自从池中借用
+        with self.leased_driver():
+            return self.__parse_imgs__(url)
 
     def download_vols(
         self, comic_name: str, book_name: str, vols: list[ComicVolume]
@@ -373,23 +550,17 @@ class ComicSource(ImageDownloadMixin, ArchiveMixin, HtmlParsingMixin, ABC):
         os.makedirs(path, exist_ok=True)
         summary = DownloadSummary()
 
-        with self.create_download_progress() as progress:
-            task_id = progress.add_task(description=f'下载 {book_name}', total=len(vols))
-            for vol in vols:
-                try:
-                    result = self.__download_vol__(path, vol.name, vol.url, progress)
-                except Exception as e:
-                    logger.error(
-                        '下载卷/话失败: {} ({}), 错误: {}', vol.name, vol.url, e, exc_info=True
-                    )
-                    result = VolumeDownloadResult(
-                        name=vol.name,
-                        url=vol.url,
-                        status='failed',
-                        message=str(e),
-                    )
+        jobs = [VolumeJob(path, vol.name, vol.url) for vol in vols]
+        with (
+            self.create_download_progress() as progress,
+            self.image_download_run(),
+            self.archive_finalization(),
+            self.image_list_prefetch() as prefetcher,
+        ):
+            task_id = progress.add_task(description=f'下载 {book_name}', total=len(jobs))
+            for result in self._download_vol_jobs(jobs, progress, task_id, prefetcher):
                 summary.add(result)
-                progress.advance(task_id)
+        summary.collect_finalized()
         return summary
 
     def __download_vol__(
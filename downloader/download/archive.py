@@ -3,9 +3,29 @@ from __future__ import annotations
 import os
 import re
 import shutil
+import sqlite3
+import tarfile
+import zipfile
+from collections.abc import Iterator
+from contextlib import contextmanager
 
 from loguru import logger
 
+from downloader.download.archive_formats import (
+    NO_ARCHIVE_FORMAT,
+    ZIP_COMPRESSION,
+    ZIP_FORMAT,
+    ArchiveFormatName,
+    archive_extensions_for_lookup,
+    archive_format_for_path,
+    normalize_archive_format,
+    volume_image_files,
+    write_volume_archive,
+)
+from downloader.download.archive_writer import VolumeArchiveWriter
+from downloader.download.finalizer import ArchiveFinalizer
+from downloader.download.journal import VolumeJournal
+from downloader.download.library import LibraryIndex
 from downloader.download.progress import DownloadProgress
 from downloader.models import (
     ImageDownloadFailure,
@@ -16,16 +36,40 @@ from downloader.models import (
 
 
 class ArchiveMixin:
+    archive_finalizer: ArchiveFinalizer | None = None
+    library: LibraryIndex | None = None
+
+    @contextmanager
+    def archive_finalization(self) -> Iterator[ArchiveFinalizer | None]:
+        """Archive finished volumes in the background while later volumes download."""
+        workers = int(self._source_profile_value('archive_workers', 0) or 0)
+        if workers <= 0 or self.archive_finalizer is not None:
+            yield self.archive_finalizer
+            return
+        with ArchiveFinalizer(workers) as finalizer:
+            self.archive_finalizer = finalizer
+            try:
+                yield finalizer
+            finally:
+                self.archive_finalizer = None
+
     def _find_existing_archive(self, path: str, vol_name: str) -> str | None:
         if self.overwrite:
             return None
+        library = self.library
+        if library is not None:
+            # 索引按目录修改时间核对过，命中与未命中都以索引为准
+            return library.find(path, filter_dir_name(vol_name))
+        return self._probe_existing_archive(path, vol_name)
 
-        target_zip_name = filter_dir_name(vol_name) + '.zip'
-        target_zip_path = os.path.join(path, target_zip_name)
-        if os.path.exists(target_zip_path):
-            return target_zip_path
-
+    def _probe_existing_archive(self, path: str, vol_name: str) -> str | None:
         base_name = filter_dir_name(vol_name)
+        extensions = archive_extensions_for_lookup(self._archive_format())
+        for extension in extensions:
+            target_archive_path = os.path.join(path, base_name + extension)
+            if os.path.exists(target_archive_path):
+                return target_archive_path
+
         match = re.match(r'^(\d+)(.*)$', base_name)
         if not match:
             return None
@@ -34,12 +78,65 @@ class ArchiveMixin:
         rest_part = match.group(2)
         for i in range(1, 3):
             padded_num = num_part.zfill(len(num_part) + i)
-            padded_path = os.path.join(path, padded_num + rest_part + '.zip')
-            if os.path.exists(padded_path):
-                logger.info('文件已存在(补零匹配)，跳过: {}', padded_path)
-                return padded_path
+            for extension in extensions:
+                padded_path = os.path.join(path, padded_num + rest_part + extension)
+                if os.path.exists(padded_path):
+                    logger.info('文件已存在(补零匹配)，跳过: {}', padded_path)
+                    return padded_path
         return None
 
+    def _open_library_index(self) -> LibraryIndex | None:
+        if not self._source_profile_value('library_index', False):
+            return None
+        try:
+            return LibraryIndex(self.output_dir)
+        except (sqlite3.Error, OSError):
+            logger.warning('打开下载库索引失败，改为逐个检查文件', exc_info=True)
+            return None
+
+    def _close_library_index(self) -> None:
+        library = self.library
+        self.library = None
+        if library is not None:
+            library.close()
+
+    def _record_library_archive(self, archive_path: str, image_count: int | None = None) -> None:
+        library = self.library
+        if library is None:
+            return
+        try:
+            library.record(archive_path, image_count)
+        except (sqlite3.Error, OSError, zipfile.BadZipFile, tarfile.TarError):
+            logger.warning('更新下载库索引失败: {}', archive_path, exc_info=True)
+
+    def _is_repairable_archive(self, archive_path: str) -> bool:
+        """Whether missing pages may be appended to ``archive_path`` instead of skipping it."""
+        if not self._source_profile_value('repair_archives', False):
+            return False
+        return archive_format_for_path(archive_path) in ZIP_COMPRESSION and zipfile.is_zipfile(
+            archive_path
+        )
+
+    def _archive_has_all_images(self, archive_path: str, expected_count: int) -> bool:
+        with zipfile.ZipFile(archive_path) as archive:
+            archived_files = archive.namelist()
+        missing_files = self._missing_image_files(expected_count, archived_files)
+        if missing_files:
+            logger.info('压缩包缺少 {} 张图片，开始补全: {}', len(missing_files), archive_path)
+        return not missing_files
+
+    def _open_archive_for_repair(self, path: str) -> VolumeArchiveWriter | None:
+        if not self._source_profile_value('repair_archives', False):
+            return None
+        archive_path = self._find_existing_archive(os.path.dirname(path), os.path.basename(path))
+        if archive_path is None or not self._is_repairable_archive(archive_path):
+            return None
+        archive_format = archive_format_for_path(archive_path)
+        return VolumeArchiveWriter.reopen(archive_path, path, ZIP_COMPRESSION[archive_format])
+
+    def _archive_format(self) -> ArchiveFormatName:
+        return normalize_archive_format(self._source_profile_value('archive_format', ZIP_FORMAT))
+
     def _remove_progress_task(self, progress: DownloadProgress | None, task_id) -> None:
         if progress is None or task_id is None:
             return
@@ -60,7 +157,7 @@ class ArchiveMixin:
             return self._failed_volume_result(
                 vol_name, source_url, expected_count, failed_images, '目录不存在'
             )
-        if not os.listdir(path):
+        if not self._journal_image_files(path) and not os.listdir(path):
             return self._failed_volume_result(
                 vol_name, source_url, expected_count, failed_images, '目录为空'
             )
@@ -76,11 +173,11 @@ class ArchiveMixin:
         expected_count: int,
         failed_images: list[ImageDownloadFailure],
     ) -> VolumeDownloadResult:
-        actual_files = sorted(os.listdir(path))
+        actual_files = self._volume_image_files(path)
         actual_count = len(actual_files)
         downloaded_count = expected_count - len(failed_images)
         if expected_count == actual_count and not failed_images:
-            return self._archive_volume(
+            return self._schedule_archive_volume(
                 path, vol_name, source_url, expected_count, downloaded_count
             )
         return self._partial_volume_result(
@@ -96,13 +193,102 @@ class ArchiveMixin:
             ),
         )
 
+    def _finalize_streamed_archive(
+        self,
+        archive_writer: VolumeArchiveWriter,
+        vol_name: str,
+        source_url: str,
+        expected_count: int,
+        failed_images: list[ImageDownloadFailure],
+    ) -> VolumeDownloadResult:
+        path = archive_writer.image_dir
+        archived_files = archive_writer.names
+        downloaded_count = expected_count - len(failed_images)
+        missing_files = self._missing_image_files(expected_count, archived_files)
+        if failed_images or missing_files or len(archived_files) != expected_count:
+            archive_writer.close()
+            return self._partial_volume_result(
+                path,
+                vol_name,
+                source_url,
+                expected_count,
+                VolumeFileState(
+                    downloaded_count=downloaded_count,
+                    failed_images=failed_images,
+                    actual_files=archived_files,
+                    actual_count=len(archived_files),
+                ),
+            )
+        archive_path = archive_writer.commit()
+        self._record_library_archive(archive_path, expected_count)
+        logger.info('压缩包写入完成: {}', archive_path)
+        if not self._source_profile_value('keep_image_dir', True):
+            self._remove_image_dir(path)
+        return VolumeDownloadResult(
+            name=vol_name,
+            url=source_url,
+            status='downloaded',
+            image_count=expected_count,
+            downloaded_count=downloaded_count,
+            archive_path=archive_path,
+        )
+
+    def _remove_image_dir(self, path: str) -> None:
+        try:
+            shutil.rmtree(path)
+        except OSError:
+            logger.warning('清理图片目录失败: {}', path, exc_info=True)
+
+    def _schedule_archive_volume(
+        self, path: str, vol_name: str, source_url: str, expected_count: int, downloaded_count: int
+    ) -> VolumeDownloadResult:
+        finalizer = self.archive_finalizer
+        if finalizer is None or self._archive_format() == NO_ARCHIVE_FORMAT:
+            return self._archive_volume(
+                path, vol_name, source_url, expected_count, downloaded_count
+            )
+        logger.info('目录 {} 已加入后台压缩队列', path)
+        future = finalizer.submit(
+            self._archive_volume, path, vol_name, source_url, expected_count, downloaded_count
+        )
+        return VolumeDownloadResult(
+            name=vol_name,
+            url=source_url,
+            status='downloaded',
+            image_count=expected_count,
+            downloaded_count=downloaded_count,
+            message='后台压缩中',
+            finalizing=future,
+        )
+
     def _archive_volume(
         self, path: str, vol_name: str, source_url: str, expected_count: int, downloaded_count: int
     ) -> VolumeDownloadResult:
-        logger.info('开始压缩目录: {}', path)
+        archive_format = self._archive_format()
+        if archive_format == NO_ARCHIVE_FORMAT:
+            logger.info('未启用压缩，保留图片目录: {}', path)
+            return VolumeDownloadResult(
+                name=vol_name,
+                url=source_url,
+                status='downloaded',
+                image_count=expected_count,
+                downloaded_count=downloaded_count,
+            )
+        logger.info('开始压缩目录: {} ({})', path, archive_format)
         try:
-            archive_path = shutil.make_archive(path, 'zip', path)
+            file_names = self._volume_image_files(path)
+            if len(file_names) != expected_count:
+                return self._unarchived_volume_result(path, vol_name, source_url, expected_count)
+            try:
+                archive_path = write_volume_archive(path, archive_format, file_names)
+            except FileNotFoundError:
+                # 下载日志中的图片已被手动删除：按目录重建日志，下次只补下缺失的图片
+                self._rebuild_volume_journal(path)
+                return self._unarchived_volume_result(path, vol_name, source_url, expected_count)
+            self._record_library_archive(archive_path, expected_count)
             logger.info('目录 {} 压缩完成.', path)
+            if not self._source_profile_value('keep_image_dir', True):
+                self._remove_image_dir(path)
             return VolumeDownloadResult(
                 name=vol_name,
                 url=source_url,
@@ -150,12 +336,46 @@ class ArchiveMixin:
         )
 
     def _missing_image_files(self, expected_count: int, actual_files: list[str]) -> list[str]:
+        actual_names = set(actual_files)
         return [
             f'{index:04d}.jpg'
             for index in range(1, expected_count + 1)
-            if f'{index:04d}.jpg' not in actual_files
+            if f'{index:04d}.jpg' not in actual_names
         ]
 
+    def _unarchived_volume_result(
+        self, path: str, vol_name: str, source_url: str, expected_count: int
+    ) -> VolumeDownloadResult:
+        file_names = self._volume_image_files(path)
+        return self._partial_volume_result(
+            path,
+            vol_name,
+            source_url,
+            expected_count,
+            VolumeFileState(
+                downloaded_count=len(file_names),
+                failed_images=[],
+                actual_files=file_names,
+                actual_count=len(file_names),
+            ),
+        )
+
+    def _volume_image_files(self, path: str) -> list[str]:
+        """Completed images of a volume, taken from its journal when there is one."""
+        return self._journal_image_files(path) or volume_image_files(path)
+
+    def _journal_image_files(self, path: str) -> list[str]:
+        if not self._source_profile_value('download_journal', False):
+            return []
+        return VolumeJournal(path).names
+
+    def _rebuild_volume_journal(self, path: str) -> None:
+        if not self._source_profile_value('download_journal', False):
+            return
+        journal = VolumeJournal(path)
+        if len(journal):
+            journal.retain(set(volume_image_files(path)))
+
     def _failed_volume_result(
         self,
         vol_name: str,
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import os
+import tarfile
+import zipfile
+from typing import Any, Literal, cast
+
+from downloader.download.journal import is_journal_file
+from downloader.download.resume import is_partial_download_file
+
+ZIP_FORMAT = 'zip'
+CBZ_FORMAT = 'cbz'
+TAR_FORMAT = 'tar'
+NO_ARCHIVE_FORMAT = 'none'
+
+ArchiveFormatName = Literal['zip', 'cbz', 'tar', 'none']
+
+SUPPORTED_ARCHIVE_FORMATS = frozenset({ZIP_FORMAT, CBZ_FORMAT, TAR_FORMAT, NO_ARCHIVE_FORMAT})
+
+ARCHIVE_EXTENSIONS: dict[str, str] = {
+    ZIP_FORMAT: '.zip',
+    CBZ_FORMAT: '.cbz',
+    TAR_FORMAT: '.tar',
+}
+
+ZIP_COMPRESSION: dict[str, int] = {
+    ZIP_FORMAT: zipfile.ZIP_DEFLATED,
+    # 图片本身已压缩，CBZ 只存储不压缩
+    CBZ_FORMAT: zipfile.ZIP_STORED,
+}
+
+
+def normalize_archive_format(value: Any) -> ArchiveFormatName:
+    archive_format = str(value or ZIP_FORMAT).strip().lower()
+    if archive_format not in SUPPORTED_ARCHIVE_FORMATS:
+        supported = ', '.join(sorted(SUPPORTED_ARCHIVE_FORMATS))
+        raise ValueError(
+            f'Unsupported archive format "{archive_format}". Supported formats: {supported}.'
+        )
+    return cast(ArchiveFormatName, archive_format)
+
+
+def archive_extension(archive_format: str) -> str | None:
+    return ARCHIVE_EXTENSIONS.get(archive_format)
+
+
+def archive_format_for_path(archive_path: str) -> str | None:
+    extension = os.path.splitext(archive_path)[1].lower()
+    return next(
+        (name for name, known in ARCHIVE_EXTENSIONS.items() if known == extension),
+        None,
+    )
+
+
+def archive_extensions_for_lookup(archive_format: str) -> list[str]:
+    """Extensions to probe for an existing archive: the configured one, then ``.zip``.
+
+    ``.zip`` was the only format before archive formats became configurable,
+    so libraries switched to another format still find their old archives.
+    """
+    preferred = archive_extension(archive_format)
+    legacy = ARCHIVE_EXTENSIONS[ZIP_FORMAT]
+    return [preferred, legacy] if preferred and preferred != legacy else [legacy]
+
+
+def volume_image_files(path: str) -> list[str]:
+    return sorted(
+        name
+        for name in os.listdir(path)
+        if not is_partial_download_file(name) and not is_journal_file(name)
+    )
+
+
+def write_volume_archive(
+    path: str, archive_format: str, file_names: list[str] | None = None
+) -> str:
+    """Write the images in ``path`` to ``<path><ext>`` one file at a time.
+
+    The archive is built as ``<archive>.part`` and renamed into place, so an
+    interrupted finalization never leaves a truncated archive behind.
+    """
+    extension = archive_extension(archive_format)
+    if extension is None:
+        raise ValueError(f'Archive format "{archive_format}" does not produce an archive.')
+    archive_path = path + extension
+    part_path = archive_path + '.part'
+    if file_names is None:
+        file_names = volume_image_files(path)
+    try:
+        if archive_format == TAR_FORMAT:
+            with tarfile.open(part_path, 'w') as archive:
+                for file_name in file_names:
+                    archive.add(os.path.join(path, file_name), arcname=file_name, recursive=False)
+        else:
+            with zipfile.ZipFile(
+                part_path, 'w', compression=ZIP_COMPRESSION[archive_format]
+            ) as archive:
+                for file_name in file_names:
+                    archive.write(os.path.join(path, file_name), file_name)
+    except BaseException:
+        try:
+            os.remove(part_path)
+        except OSError:
+            pass
+        raise
+    os.replace(part_path, archive_path)
+    return archive_path
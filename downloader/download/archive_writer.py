@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import os
+import shutil
+import threading
+import zipfile
+
+from loguru import logger
+
+ARCHIVE_PART_SUFFIX = '.part'
+
+
+class VolumeArchiveWriter:
+    """Append finished images to ``<volume>.zip.part`` while the volume downloads.
+
+    Entries land in completion order; the central directory is sorted by name
+    on close, so readers list pages in index order. ``commit`` renames the part
+    file to its final name (``.zip`` or ``.cbz``) atomically.
+    """
+
+    def __init__(
+        self,
+        image_dir: str,
+        *,
+        fresh: bool = False,
+        extension: str = '.zip',
+        compression: int = zipfile.ZIP_STORED,
+        archive_path: str | None = None,
+    ) -> None:
+        self.image_dir = image_dir
+        self.archive_path = archive_path or image_dir + extension
+        self.part_path = self.archive_path + ARCHIVE_PART_SUFFIX
+        self.compression = compression
+        self.in_place = False
+        self._lock = threading.Lock()
+        if fresh:
+            self._discard_part()
+        self._zip = self._open_part()
+        self._names = set(self._zip.namelist())
+        self._closed = False
+
+    @classmethod
+    def reopen(cls, archive_path: str, image_dir: str, compression: int) -> VolumeArchiveWriter:
+        """Append missing pages to a copy of a finished archive.
+
+        Entries are appended to ``<archive>.part`` copied from the archive and
+        the copy replaces the archive on close, complete or not. The original
+        stays untouched until then, so a crash mid-append only loses the copy.
+        """
+        part_path = archive_path + ARCHIVE_PART_SUFFIX
+        # 上次补全中断留下的副本不可信，重新从压缩包复制
+        shutil.copy2(archive_path, part_path)
+        writer = cls(image_dir, archive_path=archive_path, compression=compression)
+        writer.in_place = True
+        return writer
+
+    def __contains__(self, name: object) -> bool:
+        with self._lock:
+            return name in self._names
+
+    @property
+    def names(self) -> list[str]:
+        with self._lock:
+            return sorted(self._names)
+
+    def add_file(self, file_path: str, name: str) -> bool:
+        """Append ``file_path`` as ``name``; return False if it is already archived."""
+        with self._lock:
+            if name in self._names:
+                return False
+            self._zip.write(file_path, name)
+            self._names.add(name)
+            return True
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._zip.filelist.sort(key=lambda info: info.filename)
+            self._zip.close()
+            self._closed = True
+            if self.in_place:
+                os.replace(self.part_path, self.archive_path)
+
+    def commit(self) -> str:
+        self.close()
+        if not self.in_place:
+            os.replace(self.part_path, self.archive_path)
+        return self.archive_path
+
+    def _open_part(self) -> zipfile.ZipFile:
+        if os.path.exists(self.part_path):
+            try:
+                return zipfile.ZipFile(self.part_path, 'a', compression=self.compression)
+            except (zipfile.BadZipFile, OSError) as e:
+                # 上次运行异常退出时中央目录未写入，只能从头开始
+                logger.warning('未完成的压缩包无法续写，重新开始: {}, 错误: {}', self.part_path, e)
+                self._discard_part()
+        os.makedirs(os.path.dirname(self.part_path) or '.', exist_ok=True)
+        return zipfile.ZipFile(self.part_path, 'w', compression=self.compression)
+
+    def _discard_part(self) -> None:
+        if os.path.exists(self.part_path):
+            os.remove(self.part_path)
@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from typing import Any, Literal, cast
+from urllib.parse import urlsplit
+
+from loguru import logger
+
+from downloader.download.bandwidth import BANDWIDTH_GOVERNOR
+from downloader.download.rate_limit import IMAGE_HOST_RATE_LIMITER
+from downloader.download.resume import (
+    RANGE_NOT_SATISFIABLE,
+    PartialImage,
+    discard_partial_image,
+    load_partial_image,
+    remove_partial_meta,
+)
+from downloader.models import (
+    ImageDownloadCancelledError,
+    ImageDownloadContext,
+    ImageDownloadFailure,
+)
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - depends on optional runtime install
+    httpx = None
+
+THREAD_ENGINE = 'thread'
+ASYNC_ENGINE = 'async'
+
+ImageDownloadEngineName = Literal['thread', 'async']
+
+SUPPORTED_IMAGE_DOWNLOAD_ENGINES = frozenset({THREAD_ENGINE, ASYNC_ENGINE})
+
+
+def normalize_image_download_engine(value: Any) -> ImageDownloadEngineName:
+    engine = str(value or THREAD_ENGINE).strip().lower()
+    if engine not in SUPPORTED_IMAGE_DOWNLOAD_ENGINES:
+        supported = ', '.join(sorted(SUPPORTED_IMAGE_DOWNLOAD_ENGINES))
+        raise ValueError(
+            f'Unsupported image download engine "{engine}". Supported engines: {supported}.'
+        )
+    return cast(ImageDownloadEngineName, engine)
+
+
+def async_engine_available() -> bool:
+    return httpx is not None
+
+
+def create_async_image_client(
+    headers: Any = None, cookies: Any = None, connections_per_host: int = 16
+):
+    if httpx is None:
+        raise RuntimeError('httpx is required for the async image download engine')
+    limits = httpx.Limits(
+        max_connections=None,
+        max_keepalive_connections=max(1, int(connections_per_host)),
+    )
+    return httpx.AsyncClient(
+        headers=dict(headers or {}),
+        cookies=cookies or None,
+        timeout=30,
+        follow_redirects=True,
+        transport=httpx.AsyncHTTPTransport(limits=limits),
+    )
+
+
+def _complete_image(tmp_path: str, file_path: str) -> None:
+    os.replace(tmp_path, file_path)
+    remove_partial_meta(tmp_path)
+
+
+class AsyncImageDownloader:
+    """Download one volume's images from a single thread with asyncio.
+
+    Every image becomes a task on one event loop, so hundreds of requests can be
+    in flight without an OS thread each. Requests to the same host are bounded by
+    ``connections_per_host``; the shared per-host token buckets still apply.
+    Chunks are written to ``.tmp`` as they arrive and moved into place with
+    ``os.replace``, and setting ``context.cancel_event`` cancels every pending
+    task.
+    """
+
+    def __init__(self, source: Any, context: ImageDownloadContext, connections_per_host: int):
+        self.source = source
+        self.context = context
+        self.connections_per_host = max(1, int(connections_per_host))
+        self._host_slots: dict[str, asyncio.Semaphore] = {}
+
+    def run(
+        self, imgs: list[str], on_image_done: Callable[[], None] | None = None
+    ) -> list[ImageDownloadFailure]:
+        return asyncio.run(self._download_all(imgs, on_image_done))
+
+    async def _download_all(
+        self, imgs: list[str], on_image_done: Callable[[], None] | None
+    ) -> list[ImageDownloadFailure]:
+        failed_images: list[ImageDownloadFailure] = []
+        async with self.source._create_async_image_client() as client:
+            tasks = [
+                asyncio.create_task(self._download_image(client, index, img_url_part))
+                for index, img_url_part in enumerate(imgs)
+            ]
+            watcher = asyncio.create_task(self._cancel_on_event(tasks))
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    try:
+                        failure = await next_done
+                    except asyncio.CancelledError:
+                        self._raise_if_cancelled()
+                        raise
+                    if failure:
+                        failed_images.append(failure)
+                    if on_image_done is not None:
+                        on_image_done()
+            finally:
+                watcher.cancel()
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(watcher, *tasks, return_exceptions=True)
+        return failed_images
+
+    async def _cancel_on_event(self, tasks: list[asyncio.Task]) -> None:
+        # cancel_event 是线程引擎共用的 threading.Event，只能轮询
+        while not self.context.cancel_event.is_set():  # noqa: ASYNC110
+            await asyncio.sleep(0.1)
+        for task in tasks:
+            task.cancel()
+
+    async def _download_image(
+        self, client, index: int, img_url_part: str
+    ) -> ImageDownloadFailure | None:
+        source = self.source
+        file_path = os.path.join(self.context.path, f'{index + 1:04d}.jpg')
+        tmp_path = file_path + '.tmp'
+        full_img_url = source._build_image_url(img_url_part, self.context.use_base_img_url)
+        retry_count = int(source._source_profile_value('image_retry_count', 1) or 1)
+        last_error = ''
+
+        self._raise_if_cancelled()
+        # 复用已有图片时要计算摘要，放到线程里避免阻塞事件循环
+        if await asyncio.to_thread(
+            source._reuse_existing_image, self.context, index + 1, file_path, full_img_url
+        ):
+            return None
+
+        logger.debug('下载图片: {} 到 {}', full_img_url, file_path)
+        attempt = 0
+        while True:
+            attempt += 1
+            source.retry_policy.record_request()
+            error = await self._attempt_download(
+                client, index + 1, full_img_url, tmp_path, file_path
+            )
+            if error is None:
+                logger.debug('图片 {} 下载成功.', file_path)
+                return None
+            last_error = str(error)
+            delay = source.retry_policy.retry_delay(attempt, error, max_retries=retry_count)
+            source._handle_image_download_error(tmp_path, full_img_url, attempt, delay, error)
+            if delay is None:
+                return ImageDownloadFailure(index + 1, full_img_url, file_path, last_error)
+            await asyncio.sleep(delay)
+
+    async def _attempt_download(
+        self, client, index: int, full_img_url: str, tmp_path: str, file_path: str
+    ) -> Exception | None:
+        try:
+            await self._wait_for_download_slot(full_img_url)
+            async with self._host_slot(full_img_url):
+                await self._fetch_image(client, full_img_url, tmp_path, file_path)
+            await asyncio.to_thread(
+                self.source._finish_image, self.context, index, file_path, full_img_url
+            )
+        except (ImageDownloadCancelledError, asyncio.CancelledError):
+            self.source._release_tmp_file(tmp_path)
+            raise
+        except (httpx.HTTPError, OSError) as e:
+            return e
+        except RuntimeError as e:
+            # 续传范围不匹配等错误只影响这一张图片，丢弃未完成的部分后按普通失败重试
+            self.source._remove_tmp_file(tmp_path)
+            return e
+        return None
+
+    async def _wait_for_download_slot(self, full_img_url: str) -> None:
+        self._raise_if_cancelled()
+        rate_limit = self.source._image_rate_limit()
+        if rate_limit is None:
+            return
+        rate, burst = rate_limit
+        bucket = IMAGE_HOST_RATE_LIMITER.bucket(self._host(full_img_url), rate, burst)
+        delay = bucket.reserve()
+        if delay <= 0:
+            return
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            bucket.refund()
+            raise
+
+    async def _throttle_bandwidth(self, nbytes: int) -> None:
+        delay = BANDWIDTH_GOVERNOR.reserve(nbytes)
+        if delay <= 0:
+            return
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            BANDWIDTH_GOVERNOR.refund(nbytes)
+            raise
+
+    @asynccontextmanager
+    async def _host_slot(self, full_img_url: str) -> AsyncIterator[None]:
+        host = self._host(full_img_url)
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = asyncio.Semaphore(self.connections_per_host)
+            self._host_slots[host] = slot
+        async with slot:
+            yield
+
+    @asynccontextmanager
+    async def _image_stream(
+        self, client, full_img_url: str, partial: PartialImage | None
+    ) -> AsyncIterator[Any]:
+        headers = {'referer': self.source._source_base_url()}
+        if partial is not None:
+            headers.update(partial.range_headers())
+        async with client.stream('GET', full_img_url, headers=headers) as response:
+            if partial is None or response.status_code != RANGE_NOT_SATISFIABLE:
+                yield response
+                return
+        # 已下载部分与服务器文件对不上，丢弃后不带 Range 立即重新下载
+        logger.debug('续传范围无效，从头下载: {}', full_img_url)
+        discard_partial_image(partial.tmp_path)
+        async with self._image_stream(client, full_img_url, None) as response:
+            yield response
+
+    async def _fetch_image(self, client, full_img_url: str, tmp_path: str, file_path: str):
+        partial = load_partial_image(tmp_path)
+        async with self._image_stream(client, full_img_url, partial) as response:
+            response.raise_for_status()
+            mode = self.source._image_write_mode(response, tmp_path, partial)
+            # 每块数据到达后即在线程中写入 .tmp，避免阻塞事件循环；中断时已写入的字节留作续传
+            f = await asyncio.to_thread(open, tmp_path, mode)
+            try:
+                async for chunk in response.aiter_bytes(1024 * 64):
+                    self._raise_if_cancelled()
+                    await self._throttle_bandwidth(len(chunk))
+                    await asyncio.to_thread(f.write, chunk)
+            finally:
+                await asyncio.to_thread(f.close)
+        self._raise_if_cancelled()
+        await asyncio.to_thread(_complete_image, tmp_path, file_path)
+        if self.source.blob_store is not None:
+            await asyncio.to_thread(self.source._store_image_file_blob, self.context, file_path)
+
+    def _raise_if_cancelled(self) -> None:
+        if self.context.cancel_event.is_set():
+            raise ImageDownloadCancelledError('image download cancelled')
+
+    @staticmethod
+    def _host(full_img_url: str) -> str:
+        return urlsplit(full_img_url).netloc or full_img_url
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import datetime
+import re
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from downloader.download.rate_limit import TokenBucket
+
+BANDWIDTH_BURST_SECONDS = 0.5
+"""空闲后最多允许一次性突发多少秒的流量"""
+
+_RATE_PATTERN = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*([kmg]?)(?:i?b)?(?:/s)?\s*$', re.IGNORECASE)
+_RATE_UNITS = {'': 1, 'k': 1024, 'm': 1024**2, 'g': 1024**3}
+_WINDOW_PATTERN = re.compile(r'^\s*(\d{1,2}):(\d{2})\s*-\s*(\d{1,2}):(\d{2})\s*$')
+
+
+def parse_bandwidth_rate(value: Any) -> float | None:
+    """Parse a bytes/second cap: a number or text such as ``"512K"`` / ``"2MB/s"``.
+
+    ``None`` and zero mean unlimited.
+    """
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        raise ValueError(f'Invalid bandwidth limit: {value!r}.')
+    if isinstance(value, int | float):
+        rate = float(value)
+    else:
+        match = _RATE_PATTERN.match(str(value))
+        if match is None:
+            raise ValueError(f'Invalid bandwidth limit: {value!r}.')
+        rate = float(match.group(1)) * _RATE_UNITS[match.group(2).lower()]
+    if rate < 0:
+        raise ValueError(f'Invalid bandwidth limit: {value!r}.')
+    return rate or None
+
+
+def _parse_clock(hour: str, minute: str, text: str) -> datetime.time:
+    if (hour, minute) == ('24', '00'):
+        return datetime.time(0, 0)
+    try:
+        return datetime.time(int(hour), int(minute))
+    except ValueError as e:
+        raise ValueError(f'Invalid bandwidth schedule window: {text!r}.') from e
+
+
+@dataclass(frozen=True)
+class BandwidthSchedule:
+    """A daily time window with its own cap; windows may wrap past midnight."""
+
+    start: datetime.time
+    end: datetime.time
+    limit: float | None
+
+    @classmethod
+    def parse(cls, window: str, limit: Any) -> BandwidthSchedule:
+        match = _WINDOW_PATTERN.match(window)
+        if match is None:
+            raise ValueError(f'Invalid bandwidth schedule window: {window!r}.')
+        start = _parse_clock(match.group(1), match.group(2), window)
+        end = _parse_clock(match.group(3), match.group(4), window)
+        return cls(start=start, end=end, limit=parse_bandwidth_rate(limit))
+
+    def contains(self, moment: datetime.time) -> bool:
+        if self.start <= self.end:
+            return self.start <= moment < self.end
+        return moment >= self.start or moment < self.end
+
+
+class BandwidthGovernor:
+    """Process-wide bytes/second cap shared by every image download.
+
+    Workers report each chunk as they receive it; the governor keeps one byte
+    token bucket and tells each worker how long to sleep for its share, so the
+    total stays at the cap however many threads, volumes or engines are
+    downloading. The active cap is picked from ``schedules`` by local time of
+    day, falling back to ``limit``; ``None`` means unlimited.
+    """
+
+    def __init__(
+        self,
+        clock: Callable[[], float] = time.monotonic,
+        wall_clock: Callable[[], datetime.datetime] = datetime.datetime.now,
+    ) -> None:
+        self._clock = clock
+        self._wall_clock = wall_clock
+        self._lock = threading.Lock()
+        self.limit: float | None = None
+        self.schedules: tuple[BandwidthSchedule, ...] = ()
+        self._bucket: TokenBucket | None = None
+
+    def configure(
+        self, limit: float | None = None, schedules: tuple[BandwidthSchedule, ...] = ()
+    ) -> None:
+        with self._lock:
+            self.limit = limit
+            self.schedules = tuple(schedules)
+
+    def current_limit(self) -> float | None:
+        if not self.schedules:
+            return self.limit
+        moment = self._wall_clock().time()
+        for schedule in self.schedules:
+            if schedule.contains(moment):
+                return schedule.limit
+        return self.limit
+
+    def reserve(self, nbytes: int) -> float:
+        """Account for ``nbytes`` and return how many seconds the caller must wait."""
+        if nbytes <= 0:
+            return 0.0
+        bucket = self._active_bucket()
+        return bucket.reserve(nbytes) if bucket is not None else 0.0
+
+    def refund(self, nbytes: int) -> None:
+        bucket = self._bucket
+        if bucket is not None and nbytes > 0:
+            bucket.refund(nbytes)
+
+    def consume(self, nbytes: int, cancel_event: threading.Event | None = None) -> bool:
+        """Block for ``nbytes``' share of the cap; return False if cancelled while waiting."""
+        delay = self.reserve(nbytes)
+        if delay <= 0:
+            return True
+        if cancel_event is None:
+            time.sleep(delay)
+            return True
+        if cancel_event.wait(delay):
+            self.refund(nbytes)
+            return False
+        return True
+
+    def _active_bucket(self) -> TokenBucket | None:
+        if self.limit is None and not self.schedules:
+            return None
+        limit = self.current_limit()
+        with self._lock:
+            if limit is None:
+                self._bucket = None
+                return None
+            burst = max(1, int(limit * BANDWIDTH_BURST_SECONDS))
+            if self._bucket is None:
+                self._bucket = TokenBucket(limit, burst, clock=self._clock)
+            elif self._bucket.rate != limit:
+                self._bucket.configure(limit, burst)
+            return self._bucket
+
+
+BANDWIDTH_GOVERNOR = BandwidthGovernor()
+"""所有下载线程、所有卷共享的全局带宽限制"""
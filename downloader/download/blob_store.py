@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import errno
+import hashlib
+import os
+import threading
+
+from loguru import logger
+
+BLOB_STORE_DIR_NAME = '.blobs'
+
+_LINK_UNSUPPORTED_ERRNOS = frozenset(
+    {errno.EXDEV, errno.EPERM, errno.EACCES, errno.ENOTSUP, errno.EOPNOTSUPP}
+)
+
+
+def new_image_hasher():
+    return hashlib.blake2b(digest_size=20)
+
+
+def file_digest(file_path: str) -> str:
+    hasher = new_image_hasher()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+class ImageBlobStore:
+    """Content-addressed store that lets identical images share one inode.
+
+    Each distinct image is kept once under ``<output_dir>/.blobs`` keyed by its
+    BLAKE2b digest. Volume directories keep their usual ``0001.jpg`` names, but
+    duplicates become hardlinks to the stored blob. When the filesystem cannot
+    hardlink, the store disables itself and files are left as plain copies.
+    """
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+        self._lock = threading.Lock()
+        self._links_supported = True
+        self.bytes_saved = 0
+        self.deduplicated_images = 0
+
+    def blob_path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest)
+
+    def adopt(self, file_path: str, digest: str) -> int:
+        """Store ``file_path`` or replace it with a link to an identical blob.
+
+        Returns the number of bytes the file no longer occupies on disk.
+        """
+        if not self._links_supported:
+            return 0
+        blob_path = self.blob_path(digest)
+        try:
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            try:
+                os.link(file_path, blob_path)
+                return 0
+            except FileExistsError:
+                return self._link_to_existing_blob(file_path, blob_path)
+        except OSError as e:
+            if e.errno in _LINK_UNSUPPORTED_ERRNOS:
+                self._links_supported = False
+                logger.warning('文件系统不支持硬链接，停用图片去重存储: {}', e)
+            else:
+                logger.debug('图片去重失败: {}', file_path, exc_info=True)
+            return 0
+
+    def _link_to_existing_blob(self, file_path: str, blob_path: str) -> int:
+        if os.path.samefile(file_path, blob_path):
+            return 0
+        size = os.path.getsize(file_path)
+        if os.path.getsize(blob_path) != size:
+            # 摘要相同但大小不同，说明存储里的文件已损坏，用新文件替换它
+            self._replace_blob(file_path, blob_path)
+            return 0
+        link_path = file_path + '.link'
+        if os.path.lexists(link_path):
+            os.remove(link_path)
+        os.link(blob_path, link_path)
+        os.replace(link_path, file_path)
+        with self._lock:
+            self.bytes_saved += size
+            self.deduplicated_images += 1
+        return size
+
+    def _replace_blob(self, file_path: str, blob_path: str) -> None:
+        staged = blob_path + '.new'
+        if os.path.lexists(staged):
+            os.remove(staged)
+        os.link(file_path, staged)
+        os.replace(staged, blob_path)
+
+    def prune(self) -> int:
+        """Drop blobs no volume directory links to any more."""
+        removed = 0
+        if not os.path.isdir(self.root):
+            return removed
+        for dir_path, _, file_names in os.walk(self.root):
+            for file_name in file_names:
+                removed += self._remove_unreferenced_blob(os.path.join(dir_path, file_name))
+        return removed
+
+    def _remove_unreferenced_blob(self, blob_path: str) -> int:
+        try:
+            if os.stat(blob_path).st_nlink > 1:
+                return 0
+            os.remove(blob_path)
+        except OSError:
+            logger.debug('清理去重存储失败: {}', blob_path, exc_info=True)
+            return 0
+        return 1
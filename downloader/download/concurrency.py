@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+
+CONGESTION_STATUS_CODES = frozenset({429, 503})
+
+
+@dataclass(frozen=True)
+class ConcurrencyDecision:
+    previous: int
+    limit: int
+    reason: str
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD limit on in-flight image requests.
+
+    The limit grows by roughly one slot per window of successful responses while
+    latency stays near its moving baseline, and is cut multiplicatively on a
+    congestion status (429/503) or a latency spike. ``ceiling`` is the source's
+    ``max_download_workers``; the limit never exceeds it.
+    """
+
+    decrease_factor = 0.5
+    latency_spike_factor = 2.0
+    latency_smoothing = 0.2
+    min_latency_samples = 3
+
+    def __init__(
+        self,
+        ceiling: int,
+        initial: int | None = None,
+        *,
+        floor: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ceiling = max(1, int(ceiling))
+        self.floor = max(1, min(int(floor), self.ceiling))
+        if initial is None:
+            initial = (self.ceiling + 1) // 2
+        self._limit = float(max(self.floor, min(int(initial), self.ceiling)))
+        self._clock = clock
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._baseline_latency: float | None = None
+        self._latency_samples = 0
+        self._last_decrease_at: float | None = None
+        self.decisions: deque[ConcurrencyDecision] = deque(maxlen=100)
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def acquire(self, cancel_event: threading.Event | None = None) -> bool:
+        """Wait for a free slot; return False if cancelled while waiting."""
+        with self._condition:
+            while self._in_flight >= self.limit:
+                if cancel_event is not None and cancel_event.is_set():
+                    return False
+                self._condition.wait(0.1)
+            if cancel_event is not None and cancel_event.is_set():
+                return False
+            self._in_flight += 1
+            return True
+
+    def release(
+        self, latency: float | None = None, status_code: int | None = None
+    ) -> ConcurrencyDecision | None:
+        """Free a slot and feed the request outcome back into the limit."""
+        with self._condition:
+            self._in_flight = max(0, self._in_flight - 1)
+            decision = self._record_outcome(latency, status_code)
+            self._condition.notify_all()
+            return decision
+
+    def _record_outcome(
+        self, latency: float | None, status_code: int | None
+    ) -> ConcurrencyDecision | None:
+        if status_code in CONGESTION_STATUS_CODES:
+            return self._decrease(f'HTTP {status_code}')
+        if latency is None:
+            return None
+        if self._is_latency_spike(latency):
+            return self._decrease(f'延迟突增 {latency:.2f}s')
+        self._update_baseline(latency)
+        return self._increase()
+
+    def _is_latency_spike(self, latency: float) -> bool:
+        if self._baseline_latency is None or self._latency_samples < self.min_latency_samples:
+            return False
+        return latency > self._baseline_latency * self.latency_spike_factor
+
+    def _update_baseline(self, latency: float) -> None:
+        if self._baseline_latency is None:
+            self._baseline_latency = latency
+        else:
+            self._baseline_latency += self.latency_smoothing * (latency - self._baseline_latency)
+        self._latency_samples += 1
+
+    def _increase(self) -> ConcurrencyDecision | None:
+        previous = self.limit
+        self._limit = min(float(self.ceiling), self._limit + 1 / self._limit)
+        return self._decision(previous, '响应稳定')
+
+    def _decrease(self, reason: str) -> ConcurrencyDecision | None:
+        now = self._clock()
+        # 同一拥塞窗口内的多个失败只减一次，避免并发数瞬间塌缩到下限
+        cooldown = max(1.0, self._baseline_latency or 0)
+        if self._last_decrease_at is not None and now - self._last_decrease_at < cooldown:
+            return None
+        self._last_decrease_at = now
+        previous = self.limit
+        self._limit = max(float(self.floor), self._limit * self.decrease_factor)
+        return self._decision(previous, reason)
+
+    def _decision(self, previous: int, reason: str) -> ConcurrencyDecision | None:
+        if self.limit == previous:
+            return None
+        decision = ConcurrencyDecision(previous=previous, limit=self.limit, reason=reason)
+        self.decisions.append(decision)
+        return decision
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import socket
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Iterable
+from typing import Any, cast
+from urllib.parse import urlsplit
+
+import requests
+from loguru import logger
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ConnectTimeoutError
+from urllib3.poolmanager import pool_classes_by_scheme
+from urllib3.util.connection import allowed_gai_family
+
+PREWARM_CONNECT_TIMEOUT = 10.0
+DNS_CACHE_TTL_SECONDS = 60.0
+"""缓存的解析结果最多使用这么久，长时间下载时仍能跟上 DNS 变更"""
+
+
+class DnsCache:
+    """TTL cache in front of ``socket.getaddrinfo`` for one image adapter.
+
+    Each host is resolved at most once per ``ttl`` seconds; failed lookups are
+    not cached. Only connections opened by a ``DnsCachingHTTPAdapter`` use it,
+    so page loading and every other socket in the process resolve as usual.
+    """
+
+    def __init__(
+        self,
+        resolver: Callable[..., Any] | None = None,
+        *,
+        ttl: float = DNS_CACHE_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._resolver = resolver or socket.getaddrinfo
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: dict[tuple, tuple[float, list]] = {}
+
+    def resolve(self, host, port, *args, **kwargs):
+        """Same arguments and result as ``socket.getaddrinfo``."""
+        key = (host, port, args, tuple(sorted(kwargs.items())))
+        with self._lock:
+            cached = self._entries.get(key)
+        if cached is not None and cached[0] > self._clock():
+            return list(cached[1])
+        result = self._resolver(host, port, *args, **kwargs)
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl, list(result))
+        return list(result)
+
+    def addresses(self, host: str, port: int, family: int = 0) -> list[str]:
+        """Distinct IP addresses of ``host`` in resolver order."""
+        infos = self.resolve(host, port, family, socket.SOCK_STREAM)
+        return list(dict.fromkeys(info[4][0] for info in infos))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class _DnsCachingConnection:
+    """urllib3 connection mixin that connects to the cached addresses of its host."""
+
+    dns_cache: DnsCache
+
+    def _new_conn(self):
+        host = self._dns_host
+        try:
+            addresses = self.dns_cache.addresses(host, self.port, allowed_gai_family())
+        except OSError:
+            addresses = []
+        if not addresses:
+            # 解析失败时按 urllib3 原流程解析并报错
+            return super()._new_conn()
+        error: ConnectTimeoutError | None = None
+        for address in addresses:
+            # 只在建立 TCP 连接时替换为 IP，TLS 的 SNI 与证书校验仍使用主机名
+            self._dns_host = address
+            try:
+                return super()._new_conn()
+            except ConnectTimeoutError as e:
+                error = e
+            finally:
+                self._dns_host = host
+        raise cast(ConnectTimeoutError, error)
+
+
+def _dns_caching_pool_classes(dns_cache: DnsCache) -> dict[str, type]:
+    pool_classes: dict[str, type] = {}
+    for scheme, pool_cls in pool_classes_by_scheme.items():
+        connection_cls = type(
+            f'DnsCaching{pool_cls.ConnectionCls.__name__}',
+            (_DnsCachingConnection, pool_cls.ConnectionCls),
+            {'dns_cache': dns_cache},
+        )
+        pool_classes[scheme] = type(
+            f'DnsCaching{pool_cls.__name__}', (pool_cls,), {'ConnectionCls': connection_cls}
+        )
+    return pool_classes
+
+
+class DnsCachingHTTPAdapter(HTTPAdapter):
+    """``HTTPAdapter`` whose connection pools resolve hosts through ``dns_cache``."""
+
+    def __init__(self, dns_cache: DnsCache, **kwargs: Any) -> None:
+        self.dns_cache = dns_cache
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = _dns_caching_pool_classes(self.dns_cache)
+
+
+def image_origins(urls: Iterable[str]) -> Counter[str]:
+    """Count image URLs per ``scheme://host`` origin."""
+    origins: Counter[str] = Counter()
+    for url in urls:
+        parts = urlsplit(url)
+        if parts.scheme in {'http', 'https'} and parts.netloc:
+            origins[f'{parts.scheme}://{parts.netloc}/'] += 1
+    return origins
+
+
+class ConnectionPrewarmer:
+    """Open keep-alive connections to image hosts before the first image request.
+
+    Each origin is warmed once per download run: the host is resolved (filling
+    the DNS cache) and up to ``max_connections`` TCP/TLS connections are opened
+    on the worker threads and parked in the pooled adapter the image requests
+    will use, so the first pages of a volume skip the handshakes.
+    """
+
+    def __init__(self, submit: Callable[..., Any], session: Callable[[], Any]) -> None:
+        self._submit = submit
+        self._session = session
+        self._lock = threading.Lock()
+        self._warmed: set[str] = set()
+
+    def prewarm(self, urls: Iterable[str], max_connections: int) -> list[Any]:
+        futures = []
+        for origin, count in image_origins(urls).items():
+            with self._lock:
+                if origin in self._warmed:
+                    continue
+                self._warmed.add(origin)
+            logger.debug('预热图片主机连接: {}', origin)
+            connections = max(1, min(count, max_connections))
+            futures.extend(self._submit(self._open_connection, origin) for _ in range(connections))
+        return futures
+
+    def _open_connection(self, origin: str) -> bool:
+        session = self._session()
+        if not isinstance(session, requests.Session):
+            return False
+        try:
+            pool = _connection_pool(session, origin)
+            conn = pool._get_conn()
+        except Exception:
+            logger.debug('预热连接失败: {}', origin, exc_info=True)
+            return False
+        try:
+            if conn.sock is None:
+                conn.timeout = PREWARM_CONNECT_TIMEOUT
+                conn.connect()
+        except Exception:
+            logger.debug('预热连接失败: {}', origin, exc_info=True)
+            conn.close()
+            return False
+        finally:
+            pool._put_conn(conn)
+        return True
+
+
+def _connection_pool(session: requests.Session, url: str):
+    adapter = session.get_adapter(url)
+    request = requests.Request('GET', url).prepare()
+    settings = session.merge_environment_settings(url, {}, False, None, None)
+    # 与 HTTPAdapter.send 取连接池的方式一致，预热的连接才会被后续请求复用
+    return adapter.get_connection_with_tls_context(
+        request, settings['verify'], settings['proxies'], settings['cert']
+    )
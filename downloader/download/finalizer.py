@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import concurrent.futures
+import threading
+from collections.abc import Callable
+from typing import Any
+
+ARCHIVE_QUEUE_PER_WORKER = 2
+
+
+class ArchiveFinalizer:
+    """Background stage that archives finished volumes off the download loop.
+
+    At most ``workers`` archives are written at once and ``workers *
+    ARCHIVE_QUEUE_PER_WORKER`` more may wait; ``submit`` blocks beyond that so a
+    slow disk applies back-pressure instead of piling up whole volumes.
+    """
+
+    def __init__(self, workers: int) -> None:
+        self.workers = max(1, int(workers))
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.workers,
+            thread_name_prefix='archive-finalizer',
+        )
+        self._slots = threading.BoundedSemaphore(self.workers * (1 + ARCHIVE_QUEUE_PER_WORKER))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(cancel_pending=exc_type is not None and issubclass(exc_type, KeyboardInterrupt))
+        return False
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> concurrent.futures.Future:
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def close(self, cancel_pending: bool = False) -> None:
+        """Wait for queued archives; on interrupt only for the ones already running."""
+        self._executor.shutdown(wait=True, cancel_futures=cancel_pending)
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import concurrent.futures
+import math
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from loguru import logger
+
+from downloader.models import ImageDownloadCancelledError
+
+HEDGE_MIN_SAMPLES = 8
+"""本卷至少完成多少张图片后才开始估算 p95"""
+HEDGE_MIN_DELAY_SECONDS = 1.0
+HEDGE_PERCENTILE = 0.95
+HEDGE_POLL_SECONDS = 0.1
+
+HedgeAttempt = Callable[[threading.Event, int], Any]
+
+
+class LatencyTracker:
+    """Completed image download times of one volume, used to pick the hedge threshold."""
+
+    def __init__(self, min_samples: int = HEDGE_MIN_SAMPLES) -> None:
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+        self._samples: list[float] = []
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def threshold(self) -> float | None:
+        """The p95 of completed downloads, or None until there are enough samples."""
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            samples = sorted(self._samples)
+        index = min(len(samples) - 1, math.ceil(HEDGE_PERCENTILE * len(samples)) - 1)
+        return max(HEDGE_MIN_DELAY_SECONDS, samples[index])
+
+
+class HedgeBudget:
+    """Allow at most ``ratio`` extra requests per primary request (plus one)."""
+
+    def __init__(self, ratio: float) -> None:
+        self.ratio = max(0.0, float(ratio))
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.hedges = 0
+
+    def record_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self.hedges + 1 > 1 + self.ratio * self.requests:
+                return False
+            self.hedges += 1
+            return True
+
+
+class ImageHedger:
+    """Race a backup request against an image that is slower than this volume's p95.
+
+    Both attempts run on a dedicated pool while the image worker waits for the
+    first one to succeed; the loser's cancel event is set so it stops at its
+    next chunk. ``HedgeBudget`` bounds the extra traffic for the whole run.
+    """
+
+    def __init__(self, ratio: float, max_workers: int) -> None:
+        self.budget = HedgeBudget(ratio)
+        # 每张图片最多两个尝试，同时还可能有输掉的尝试在等超时
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(2, int(max_workers) * 3),
+            thread_name_prefix='image-hedge',
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def race(
+        self, attempt: HedgeAttempt, tracker: LatencyTracker, cancel_event: threading.Event
+    ) -> tuple[int, Any]:
+        """Run ``attempt(cancel, 0)``, hedge it with ``attempt(cancel, 1)`` if it is slow.
+
+        Returns the winning attempt number and its result; raises the last error
+        when every attempt failed.
+        """
+        started_at = time.monotonic()
+        threshold = tracker.threshold()
+        self.budget.record_request()
+        if threshold is None:
+            # 样本不足时判断不了慢请求，直接在当前线程下载
+            result = attempt(cancel_event, 0)
+            tracker.record(time.monotonic() - started_at)
+            return 0, result
+        attempts: dict[concurrent.futures.Future, int] = {}
+        cancels: list[threading.Event] = []
+
+        def start(attempt_number: int) -> None:
+            attempt_cancel = threading.Event()
+            cancels.append(attempt_cancel)
+            attempts[self._executor.submit(attempt, attempt_cancel, attempt_number)] = (
+                attempt_number
+            )
+
+        start(0)
+        hedged = False
+        try:
+            while True:
+                if cancel_event.is_set():
+                    raise ImageDownloadCancelledError('image download cancelled')
+                done, _ = concurrent.futures.wait(
+                    attempts,
+                    timeout=HEDGE_POLL_SECONDS,
+                    return_when=concurrent.futures.FIRST_COMPLETED,
+                )
+                for future in done:
+                    attempt_number = attempts.pop(future)
+                    error = future.exception()
+                    if error is None:
+                        tracker.record(time.monotonic() - started_at)
+                        return attempt_number, future.result()
+                    if not attempts:
+                        raise error
+                elapsed = time.monotonic() - started_at
+                if not hedged and elapsed >= threshold and self.budget.try_spend():
+                    hedged = True
+                    logger.debug('图片下载超过 {:.1f}s 未完成，发起对冲请求', threshold)
+                    start(1)
+        finally:
+            for attempt_cancel in cancels:
+                attempt_cancel.set()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
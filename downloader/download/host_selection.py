@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import concurrent.futures
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from urllib.parse import urlsplit, urlunsplit
+
+from loguru import logger
+
+HOST_SCORE_ALPHA = 0.3
+"""吞吐量滑动平均中新样本的权重"""
+HOST_FAILURE_THRESHOLD = 2
+HOST_COOLDOWN_SECONDS = 60.0
+HOST_PROBE_IMAGES = 1
+"""每条线路只用这么多张图片测速，避免解析章节时给图片服务器增加额外负担"""
+
+
+def url_origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f'{parts.scheme}://{parts.netloc}'
+
+
+def replace_origin(url: str, origin: str) -> str:
+    parts = urlsplit(url)
+    target = urlsplit(origin)
+    return urlunsplit((target.scheme, target.netloc, parts.path, parts.query, parts.fragment))
+
+
+@dataclass
+class HostScore:
+    throughput: float | None = None
+    """字节/秒的滑动平均，None 表示还没有样本"""
+    failures: int = 0
+    cooldown_until: float = 0.0
+
+
+class HostSelector:
+    """Pick the fastest of several mirror hosts serving the same image paths.
+
+    Keeps a moving throughput score per host for the whole session. Hosts that
+    fail ``HOST_FAILURE_THRESHOLD`` times in a row are skipped for
+    ``HOST_COOLDOWN_SECONDS``, so URLs fail over to the next best mirror.
+    """
+
+    def __init__(self, hosts: Iterable[str], clock: Callable[[], float] = time.monotonic) -> None:
+        self.hosts = tuple(dict.fromkeys(url_origin(host) for host in hosts))
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._scores = {host: HostScore() for host in self.hosts}
+        self.probed = False
+
+    def score(self, host: str) -> HostScore:
+        with self._lock:
+            score = self._scores[url_origin(host)]
+            return HostScore(score.throughput, score.failures, score.cooldown_until)
+
+    def record_success(self, url: str, seconds: float, nbytes: int) -> None:
+        host = url_origin(url)
+        throughput = max(1, nbytes) / max(seconds, 1e-3)
+        with self._lock:
+            score = self._scores.get(host)
+            if score is None:
+                return
+            score.failures = 0
+            score.cooldown_until = 0.0
+            if score.throughput is None:
+                score.throughput = throughput
+            else:
+                score.throughput += HOST_SCORE_ALPHA * (throughput - score.throughput)
+
+    def record_failure(self, url: str) -> None:
+        host = url_origin(url)
+        with self._lock:
+            score = self._scores.get(host)
+            if score is None:
+                return
+            score.failures += 1
+            if score.failures >= HOST_FAILURE_THRESHOLD:
+                score.cooldown_until = self._clock() + HOST_COOLDOWN_SECONDS
+                logger.warning('图片线路连续失败，暂停使用 {} 秒: {}', HOST_COOLDOWN_SECONDS, host)
+
+    def ranked(self, preferred: str | None = None) -> list[str]:
+        """Hosts from best to worst: healthy before cooling down, then by throughput.
+
+        Hosts without a score keep their configured order, after ``preferred``.
+        """
+        preferred = url_origin(preferred) if preferred else None
+        now = self._clock()
+        with self._lock:
+            scores = dict(self._scores)
+
+            def key(host: str):
+                score = scores[host]
+                cooling = score.cooldown_until > now
+                return (
+                    cooling,
+                    score.cooldown_until if cooling else 0.0,
+                    score.throughput is None,
+                    -(score.throughput or 0.0),
+                    host != preferred,
+                    self.hosts.index(host),
+                )
+
+            return sorted(self.hosts, key=key)
+
+    def rewrite(self, url: str) -> str:
+        """Move ``url`` to the best host if it is served by one of the mirrors."""
+        origin = url_origin(url)
+        if origin not in self._scores:
+            return url
+        best = self.ranked(origin)[0]
+        return url if best == origin else replace_origin(url, best)
+
+    def alternate(self, url: str) -> str:
+        """The best mirror for ``url`` other than the host it currently points at."""
+        origin = url_origin(url)
+        if origin not in self._scores:
+            return url
+        for host in self.ranked(origin):
+            if host != origin:
+                return replace_origin(url, host)
+        return url
+
+    def probe(self, urls: list[str], fetch: Callable[[str], int]) -> None:
+        """Time the first ``HOST_PROBE_IMAGES`` images on every host once per session.
+
+        ``fetch`` downloads a URL and returns the number of bytes received.
+        """
+        with self._lock:
+            if self.probed or len(self.hosts) <= 1:
+                return
+            self.probed = True
+        samples = [url for url in urls if url_origin(url) in self._scores][:HOST_PROBE_IMAGES]
+        if not samples:
+            return
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=len(self.hosts), thread_name_prefix='host-probe'
+        ) as executor:
+            for host in self.hosts:
+                executor.submit(self._probe_host, host, samples, fetch)
+        logger.info('图片线路测速结果: {}', self._describe())
+
+    def _probe_host(self, host: str, samples: list[str], fetch: Callable[[str], int]) -> None:
+        for sample in samples:
+            url = replace_origin(sample, host)
+            started_at = time.monotonic()
+            try:
+                nbytes = fetch(url)
+            except Exception as e:
+                logger.debug('图片线路测速失败: {} ({})', url, e)
+                self.record_failure(url)
+                continue
+            self.record_success(url, time.monotonic() - started_at, nbytes)
+
+    def _describe(self) -> str:
+        parts = []
+        for host in self.ranked():
+            score = self.score(host)
+            speed = '失败' if score.throughput is None else f'{score.throughput / 1024:.0f} KB/s'
+            parts.append(f'{host} {speed}')
+        return ', '.join(parts)
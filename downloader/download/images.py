@@ -1,18 +1,58 @@
 from __future__ import annotations
 
 import concurrent.futures
+import dataclasses
 import os
 import threading
 import time
-from urllib.parse import urljoin
+from collections.abc import Iterator
+from contextlib import contextmanager
+from urllib.parse import urljoin, urlsplit
 
 import requests
 from loguru import logger
 from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 
 from downloader.browser.modes import SELENIUMBASE_MODE
+from downloader.download.archive_formats import ARCHIVE_EXTENSIONS, ZIP_COMPRESSION
+from downloader.download.archive_writer import VolumeArchiveWriter
+from downloader.download.async_images import (
+    ASYNC_ENGINE,
+    THREAD_ENGINE,
+    AsyncImageDownloader,
+    async_engine_available,
+    create_async_image_client,
+    normalize_image_download_engine,
+)
+from downloader.download.bandwidth import BANDWIDTH_GOVERNOR
+from downloader.download.blob_store import (
+    BLOB_STORE_DIR_NAME,
+    ImageBlobStore,
+    file_digest,
+    new_image_hasher,
+)
+from downloader.download.concurrency import AdaptiveConcurrencyLimiter
+from downloader.download.connections import (
+    ConnectionPrewarmer,
+    DnsCache,
+    DnsCachingHTTPAdapter,
+)
+from downloader.download.hedging import ImageHedger, LatencyTracker
+from downloader.download.journal import JournalEntry, VolumeJournal
 from downloader.download.progress import DownloadProgress, ensure_download_progress
+from downloader.download.rate_limit import IMAGE_HOST_RATE_LIMITER
+from downloader.download.resume import (
+    PARTIAL_CONTENT,
+    RANGE_NOT_SATISFIABLE,
+    PartialImage,
+    discard_partial_image,
+    has_resumable_partial,
+    load_partial_image,
+    remove_partial_meta,
+    save_partial_image_validators,
+)
+from downloader.download.retry import RetryPolicy
+from downloader.download.scheduler import ImageDownloadScheduler
 from downloader.models import (
     ImageDownloadCancelledError,
     ImageDownloadContext,
@@ -20,10 +60,108 @@ from downloader.models import (
     VolumeDownloadResult,
 )
 
-IMAGE_RETRY_STATUS_CODES = [400, 429, 500, 502, 503, 504]
+HEDGE_TMP_SUFFIX = '.hedge.tmp'
+HEDGE_FILE_SUFFIX = '.hedged.tmp'
+
+
+@dataclasses.dataclass
+class ImageTransfer:
+    """One image response: the partial file it resumes, its bytes and its time.
+
+    ``seconds`` leaves out the waits for the bandwidth governor, so it measures
+    the host rather than local throttling.
+    """
+
+    partial: PartialImage | None = None
+    started_at: float = dataclasses.field(default_factory=time.monotonic)
+    nbytes: int = 0
+    waited: float = 0.0
+
+    @property
+    def seconds(self) -> float:
+        return max(0.0, time.monotonic() - self.started_at - self.waited)
 
 
 class ImageDownloadMixin:
+    image_scheduler: ImageDownloadScheduler | None = None
+    blob_store: ImageBlobStore | None = None
+    image_http_adapter: HTTPAdapter | None = None
+    connection_prewarmer: ConnectionPrewarmer | None = None
+    image_hedger: ImageHedger | None = None
+    retry_policy: RetryPolicy
+
+    @contextmanager
+    def image_download_run(self) -> Iterator[ImageDownloadScheduler]:
+        """Share one image scheduler across every volume downloaded inside the block."""
+        if self.image_scheduler is not None:
+            yield self.image_scheduler
+            return
+        scheduler = self._create_image_scheduler(self._source_max_download_workers())
+        self.image_scheduler = scheduler
+        # 所有工作线程的会话共用一个连接池，预热过的连接对每个线程都可用
+        self.image_http_adapter = self._create_image_http_adapter()
+        if self._source_profile_value('prewarm_connections', False):
+            self.connection_prewarmer = ConnectionPrewarmer(scheduler.submit, scheduler.session)
+        self.image_hedger = self._create_image_hedger(scheduler.max_workers)
+        self.blob_store = self._create_image_blob_store()
+        self.library = self._open_library_index()
+        try:
+            with scheduler:
+                yield scheduler
+        finally:
+            self.image_scheduler = None
+            self.image_http_adapter = None
+            self.connection_prewarmer = None
+            if self.image_hedger is not None:
+                self.image_hedger.close()
+                self.image_hedger = None
+            self._close_image_blob_store()
+            self._close_library_index()
+
+    @contextmanager
+    def _volume_image_scheduler(self, image_count: int) -> Iterator[ImageDownloadScheduler]:
+        if self.image_scheduler is not None and not self.image_scheduler.closed:
+            yield self.image_scheduler
+            return
+        max_workers = max(1, min(self._source_max_download_workers(), image_count))
+        with self._create_image_scheduler(max_workers) as scheduler:
+            yield scheduler
+
+    def _create_image_scheduler(self, max_workers: int) -> ImageDownloadScheduler:
+        concurrency = None
+        if self._adaptive_download_workers_enabled():
+            concurrency = AdaptiveConcurrencyLimiter(max_workers)
+        return ImageDownloadScheduler(
+            max_workers, self._create_image_http_session, concurrency=concurrency
+        )
+
+    def _create_image_hedger(self, max_workers: int) -> ImageHedger | None:
+        ratio = float(self._source_profile_value('image_hedge_ratio', 0) or 0)
+        if ratio <= 0:
+            return None
+        return ImageHedger(ratio, max_workers)
+
+    def _create_image_blob_store(self) -> ImageBlobStore | None:
+        if not self._source_profile_value('image_blob_store', False):
+            return None
+        return ImageBlobStore(os.path.join(self.output_dir, BLOB_STORE_DIR_NAME))
+
+    def _close_image_blob_store(self) -> None:
+        blob_store = self.blob_store
+        self.blob_store = None
+        if blob_store is None:
+            return
+        if blob_store.bytes_saved:
+            logger.info(
+                '图片去重: {} 张重复图片，节省 {} 字节',
+                blob_store.deduplicated_images,
+                blob_store.bytes_saved,
+            )
+        blob_store.prune()
+
+    def _adaptive_download_workers_enabled(self) -> bool:
+        return bool(self._source_profile_value('adaptive_download_workers', False))
+
     def __download_vol_images__(
         self,
         path: str,
@@ -35,13 +173,73 @@ class ImageDownloadMixin:
         """下载图片"""
         logger.info('开始下载图片到目录: {} (共 {} 张)', path, len(imgs))
         os.makedirs(path, exist_ok=True)
-        context = ImageDownloadContext(
-            path=path,
-            use_base_img_url=bool(self._source_base_img_url()),
-            session_factory=self._create_image_http_session,
+        archive_writer = self._create_volume_archive_writer(path)
+        journal = self._open_volume_journal(path)
+        try:
+            if self._use_async_image_engine():
+                context = ImageDownloadContext(
+                    path=path,
+                    use_base_img_url=bool(self._source_base_img_url()),
+                    archive_writer=archive_writer,
+                    journal=journal,
+                )
+                failed_images = self._run_async_image_downloads(context, imgs, progress, vol_name)
+            else:
+                with self._volume_image_scheduler(len(imgs)) as scheduler:
+                    context = scheduler.create_context(
+                        path, use_base_img_url=bool(self._source_base_img_url())
+                    )
+                    context.archive_writer = archive_writer
+                    context.journal = journal
+                    if self.image_hedger is not None:
+                        context.hedge_tracker = LatencyTracker()
+                    self._prewarm_image_connections(imgs, context.use_base_img_url)
+                    try:
+                        failed_images = self._run_image_downloads(context, imgs, progress, vol_name)
+                    finally:
+                        scheduler.release_context(context)
+            if journal is not None:
+                journal.close()
+            if archive_writer is not None:
+                result = self._finalize_streamed_archive(
+                    archive_writer, vol_name, source_url, len(imgs), failed_images
+                )
+            else:
+                result = self._finalize_volume_download(
+                    path, vol_name, source_url, len(imgs), failed_images
+                )
+        finally:
+            if journal is not None:
+                journal.close()
+            if archive_writer is not None:
+                archive_writer.close()
+        result.deduplicated_bytes = context.deduplicated_bytes
+        return result
+
+    def _create_volume_archive_writer(self, path: str) -> VolumeArchiveWriter | None:
+        repair_writer = self._open_archive_for_repair(path)
+        if repair_writer is not None:
+            return repair_writer
+        if not self._source_profile_value('stream_to_archive', False):
+            return None
+        archive_format = self._archive_format()
+        if archive_format not in ZIP_COMPRESSION:
+            # tar 与不压缩模式在卷下载完成后统一处理
+            return None
+        return VolumeArchiveWriter(
+            path,
+            fresh=self.overwrite,
+            extension=ARCHIVE_EXTENSIONS[archive_format],
+            compression=ZIP_COMPRESSION[archive_format],
         )
-        failed_images = self._run_image_downloads(context, imgs, progress, vol_name)
-        return self._finalize_volume_download(path, vol_name, source_url, len(imgs), failed_images)
+
+    def _open_volume_journal(self, path: str) -> VolumeJournal | None:
+        if not self._download_journal_enabled():
+            return None
+        return VolumeJournal(path, fresh=self.overwrite)
+
+    def _download_journal_enabled(self) -> bool:
+        return bool(self._source_profile_value('download_journal', False))
 
     def _run_image_downloads(
         self,
@@ -52,13 +250,12 @@ class ImageDownloadMixin:
     ) -> list[ImageDownloadFailure]:
         progress = ensure_download_progress(progress)
         failed_images: list[ImageDownloadFailure] = []
-        max_workers = max(1, min(self._source_max_download_workers(), len(imgs)))
         task_id = progress.add_task(description=f'[cyan]🖼  {vol_name}', total=len(imgs))
-        executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+        shown_limit: int | None = None
         futures: list[concurrent.futures.Future] = []
         try:
             futures = [
-                executor.submit(self._download_image, context, index, img_url_part)
+                self._submit_image_download(context, index, img_url_part)
                 for index, img_url_part in enumerate(imgs)
             ]
             for future in concurrent.futures.as_completed(futures):
@@ -66,36 +263,108 @@ class ImageDownloadMixin:
                 if failure:
                     failed_images.append(failure)
                 progress.advance(task_id)
-            executor.shutdown(wait=True)
+                shown_limit = self._show_concurrency_limit(
+                    context, progress, task_id, vol_name, shown_limit
+                )
         except (KeyboardInterrupt, SystemExit):
-            context.cancel_event.set()
-            for future in futures:
-                future.cancel()
-            executor.shutdown(wait=False, cancel_futures=True)
-            self._close_active_image_downloads(context)
+            self._cancel_image_downloads(context, futures)
             concurrent.futures.wait(futures, timeout=1)
             raise
         except ImageDownloadCancelledError as exc:
-            context.cancel_event.set()
-            for future in futures:
-                future.cancel()
-            executor.shutdown(wait=False, cancel_futures=True)
-            self._close_active_image_downloads(context)
+            self._cancel_image_downloads(context, futures)
             raise KeyboardInterrupt from exc
         except Exception:
             context.cancel_event.set()
-            executor.shutdown(wait=True)
+            for future in futures:
+                future.cancel()
+            concurrent.futures.wait(futures)
             raise
         finally:
             self._remove_progress_task(progress, task_id)
             self._close_image_http_sessions(context)
         return failed_images
 
+    def _use_async_image_engine(self) -> bool:
+        engine = self._source_profile_value('image_download_engine', THREAD_ENGINE)
+        if normalize_image_download_engine(engine) != ASYNC_ENGINE:
+            return False
+        if not async_engine_available():
+            logger.warning('未安装 httpx，图片改用线程下载引擎')
+            return False
+        # 浏览器下载需要串行驱动同一个浏览器，异步引擎没有收益
+        return self._source_browser_mode() != SELENIUMBASE_MODE or not callable(
+            getattr(self.driver, 'download_to_file', None)
+        )
+
+    def _run_async_image_downloads(
+        self,
+        context: ImageDownloadContext,
+        imgs: list[str],
+        progress: DownloadProgress | None,
+        vol_name: str,
+    ) -> list[ImageDownloadFailure]:
+        progress = ensure_download_progress(progress)
+        task_id = progress.add_task(description=f'[cyan]🖼  {vol_name}', total=len(imgs))
+        connections = int(self._source_profile_value('async_connections_per_host', 16) or 16)
+        # 同时下载多个卷/话时按卷平分连接数，保持每个主机的总连接数不变
+        connections = max(1, connections // self._concurrent_volume_limit())
+        downloader = AsyncImageDownloader(self, context, connections)
+        try:
+            return downloader.run(imgs, lambda: progress.advance(task_id))
+        except (KeyboardInterrupt, SystemExit):
+            context.cancel_event.set()
+            raise
+        except ImageDownloadCancelledError as exc:
+            raise KeyboardInterrupt from exc
+        finally:
+            self._remove_progress_task(progress, task_id)
+
+    def _create_async_image_client(self):
+        return create_async_image_client(
+            getattr(self.http, 'headers', None),
+            getattr(self.http, 'cookies', None),
+            int(self._source_profile_value('async_connections_per_host', 16) or 16),
+        )
+
+    def _show_concurrency_limit(
+        self,
+        context: ImageDownloadContext,
+        progress: DownloadProgress,
+        task_id,
+        vol_name: str,
+        shown_limit: int | None,
+    ) -> int | None:
+        concurrency = getattr(context.scheduler, 'concurrency', None)
+        if concurrency is None or concurrency.limit == shown_limit:
+            return shown_limit
+        progress.update(
+            task_id,
+            description=f'[cyan]🖼  {vol_name} · 并发 {concurrency.limit}/{concurrency.ceiling}',
+        )
+        return concurrency.limit
+
+    def _submit_image_download(
+        self, context: ImageDownloadContext, index: int, img_url_part: str
+    ) -> concurrent.futures.Future:
+        return context.scheduler.submit(self._download_image, context, index, img_url_part)
+
+    def _cancel_image_downloads(
+        self, context: ImageDownloadContext, futures: list[concurrent.futures.Future]
+    ) -> None:
+        context.cancel_event.set()
+        for future in futures:
+            future.cancel()
+        if context.scheduler is not None:
+            context.scheduler.cancel()
+        self._close_active_image_downloads(context)
+
     def _raise_if_image_download_cancelled(self, context: ImageDownloadContext) -> None:
         if context.cancel_event.is_set():
             raise ImageDownloadCancelledError('image download cancelled')
 
-    def _acquire_download_lock(self, lock: threading.Lock, context: ImageDownloadContext) -> None:
+    def _acquire_download_lock(
+        self, lock: threading.Lock | threading.RLock, context: ImageDownloadContext
+    ) -> None:
         while not context.cancel_event.is_set():
             if lock.acquire(timeout=0.1):
                 return
@@ -114,18 +383,16 @@ class ImageDownloadMixin:
                     exc_info=True,
                 )
 
+    def _prewarm_image_connections(self, imgs: list[str], use_base_img_url: bool) -> None:
+        prewarmer = self.connection_prewarmer
+        if prewarmer is None:
+            return
+        urls = [self._build_image_url(img, use_base_img_url) for img in imgs]
+        if self._source_base_img_url():
+            urls.append(self._source_base_img_url())
+        prewarmer.prewarm(urls, self._source_max_download_workers())
+
     def _create_image_http_session(self):
-        retry_strategy = Retry(
-            total=3,
-            status_forcelist=IMAGE_RETRY_STATUS_CODES,
-            allowed_methods=['GET'],
-            raise_on_status=False,
-        )
-        adapter = HTTPAdapter(
-            max_retries=retry_strategy,
-            pool_connections=self._source_max_download_workers(),
-            pool_maxsize=self._source_max_download_workers(),
-        )
         session = requests.Session()
         source_headers = getattr(self.http, 'headers', None)
         if source_headers:
@@ -133,11 +400,24 @@ class ImageDownloadMixin:
         source_cookies = getattr(self.http, 'cookies', None)
         if source_cookies:
             session.cookies.update(source_cookies)
+        adapter = self.image_http_adapter or self._create_image_http_adapter()
         session.mount('https://', adapter)
         session.mount('http://', adapter)
         return session
 
+    def _create_image_http_adapter(self) -> HTTPAdapter:
+        # 不在 urllib3 内部重试，失败统一交给源的 RetryPolicy（退避、预算、Retry-After）
+        pool_size = self._source_max_download_workers()
+        if self._source_profile_value('prewarm_connections', False):
+            # DNS 缓存只作用于这个适配器的图片连接池，随下载任务结束一起释放
+            return DnsCachingHTTPAdapter(
+                DnsCache(), pool_connections=pool_size, pool_maxsize=pool_size
+            )
+        return HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+
     def _image_http_session(self, context: ImageDownloadContext):
+        if context.scheduler is not None:
+            return context.scheduler.session()
         session = getattr(context.thread_local, 'session', None)
         if session is not None:
             return session
@@ -171,37 +451,88 @@ class ImageDownloadMixin:
 
         self._raise_if_image_download_cancelled(context)
 
-        if self._can_reuse_image(file_path):
-            logger.debug('图片已存在，跳过: {file_path}', file_path=file_path)
+        if self._reuse_existing_image(context, index + 1, file_path, full_img_url):
             return None
 
         logger.debug('下载图片: {} 到 {}', full_img_url, file_path)
-        for attempt in range(1, retry_count + 2):
-            response = None
+        attempt = 0
+        while True:
+            attempt += 1
+            self.retry_policy.record_request()
             try:
                 self._raise_if_image_download_cancelled(context)
-                self._wait_for_download_slot(context)
+                self._wait_for_download_slot(context, full_img_url)
+                digest = None
                 if not self._download_image_with_browser(
                     full_img_url, context, tmp_path, file_path
                 ):
-                    response = self._request_image(full_img_url, context)
-                    self._write_image_response(response, context, tmp_path, file_path)
+                    digest = self._fetch_image_hedged(full_img_url, context, tmp_path, file_path)
+                self._finish_image(context, index + 1, file_path, full_img_url, digest)
                 logger.debug('图片 {} 下载成功.', file_path)
                 return None
             except ImageDownloadCancelledError:
-                self._remove_tmp_file(tmp_path)
+                self._release_tmp_file(tmp_path)
                 raise
             except (requests.exceptions.RequestException, OSError, RuntimeError) as e:
                 last_error = str(e)
-                self._handle_image_download_error(tmp_path, full_img_url, attempt, retry_count, e)
-            finally:
-                if response is not None and hasattr(response, 'close'):
-                    response.close()
+                delay = self.retry_policy.retry_delay(attempt, e, max_retries=retry_count)
+                self._handle_image_download_error(tmp_path, full_img_url, attempt, delay, e)
+                if delay is None:
+                    break
+                if not self.retry_policy.wait(delay, context.cancel_event):
+                    raise ImageDownloadCancelledError('image download cancelled') from e
         return ImageDownloadFailure(index + 1, full_img_url, file_path, last_error)
 
     def _can_reuse_image(self, file_path: str) -> bool:
         return not self.overwrite and os.path.exists(file_path) and os.path.getsize(file_path) > 0
 
+    def _reuse_existing_image(
+        self, context: ImageDownloadContext, index: int, file_path: str, full_img_url: str
+    ) -> bool:
+        file_name = os.path.basename(file_path)
+        archive_writer = context.archive_writer
+        if archive_writer is not None and file_name in archive_writer:
+            logger.debug('图片已在压缩包中，跳过: {file_path}', file_path=file_path)
+            return True
+        # 边下边压时图片可能已从目录删除，只能以压缩包为准
+        if archive_writer is None and context.journal is not None and file_name in context.journal:
+            logger.debug('图片已记录在下载日志中，跳过: {file_path}', file_path=file_path)
+            return True
+        if not self._can_reuse_image(file_path):
+            return False
+        logger.debug('图片已存在，跳过: {file_path}', file_path=file_path)
+        self._finish_image(context, index, file_path, full_img_url)
+        return True
+
+    def _finish_image(
+        self,
+        context: ImageDownloadContext,
+        index: int,
+        file_path: str,
+        full_img_url: str,
+        digest: str | None = None,
+    ) -> None:
+        """Record a completed image in the volume journal and the streamed archive."""
+        journal = context.journal
+        if journal is not None:
+            journal.record(
+                JournalEntry(
+                    index=index,
+                    size=os.path.getsize(file_path),
+                    digest=digest or file_digest(file_path),
+                    url=full_img_url,
+                )
+            )
+        self._archive_image(context, file_path)
+
+    def _archive_image(self, context: ImageDownloadContext, file_path: str) -> None:
+        archive_writer = context.archive_writer
+        if archive_writer is None:
+            return
+        archive_writer.add_file(file_path, os.path.basename(file_path))
+        if not self._source_profile_value('keep_image_dir', True):
+            os.remove(file_path)
+
     def _build_image_url(self, img_url_part: str, use_base_img_url: bool) -> str:
         if use_base_img_url and not img_url_part.startswith('http'):
             return urljoin(self._source_base_img_url().rstrip('/') + '/', img_url_part)
@@ -222,32 +553,167 @@ class ImageDownloadMixin:
     def _source_max_download_workers(self) -> int:
         return max(1, int(self._source_profile_value('max_download_workers', 5) or 5))
 
-    def _wait_for_download_slot(self, context: ImageDownloadContext) -> None:
+    def _wait_for_download_slot(self, context: ImageDownloadContext, full_img_url: str) -> None:
         self._raise_if_image_download_cancelled(context)
-        interval = self._image_request_interval_seconds()
-        if interval <= 0:
+        rate_limit = self._image_rate_limit()
+        if rate_limit is None:
             return
-        self._acquire_download_lock(context.rate_lock, context)
+        rate, burst = rate_limit
+        host = urlsplit(full_img_url).netloc or full_img_url
+        bucket = IMAGE_HOST_RATE_LIMITER.bucket(host, rate, burst)
+        if not bucket.acquire(context.cancel_event):
+            raise ImageDownloadCancelledError('image download cancelled')
+
+    def _throttle_bandwidth(self, context: ImageDownloadContext, nbytes: int) -> None:
+        if not BANDWIDTH_GOVERNOR.consume(nbytes, context.cancel_event):
+            raise ImageDownloadCancelledError('image download cancelled')
+
+    def _throttle_transfer(
+        self, context: ImageDownloadContext, nbytes: int, transfer: ImageTransfer
+    ) -> None:
+        started_at = time.monotonic()
+        self._throttle_bandwidth(context, nbytes)
+        transfer.waited += time.monotonic() - started_at
+        transfer.nbytes += nbytes
+
+    def _record_image_transfer(self, full_img_url: str, transfer: ImageTransfer) -> None:
+        """Hook for sources that score hosts by the network time of finished images."""
+
+    def _image_rate_limit(self) -> tuple[float, int] | None:
+        rate = self._source_profile_value('image_requests_per_second', None)
+        if rate is None:
+            interval = self._image_request_interval_seconds()
+            if interval <= 0:
+                return None
+            rate = 1 / interval
+        rate = float(rate)
+        if rate <= 0:
+            return None
+        burst = int(self._source_profile_value('image_request_burst', 1) or 1)
+        return rate, max(1, burst)
+
+    def _fetch_image_hedged(
+        self, full_img_url: str, context: ImageDownloadContext, tmp_path: str, file_path: str
+    ) -> str | None:
+        """``_fetch_image``, with a backup request when the image is slower than usual."""
+        hedger = self.image_hedger
+        tracker = context.hedge_tracker
+        if hedger is None or tracker is None:
+            return self._fetch_image(full_img_url, context, tmp_path, file_path)
+        hedge_tmp_path = file_path + HEDGE_TMP_SUFFIX
+        hedge_file_path = file_path + HEDGE_FILE_SUFFIX
+
+        def attempt(cancel_event: threading.Event, attempt_number: int):
+            # 每个尝试有自己的取消事件，输掉的一方在下一个数据块处停止
+            attempt_context = dataclasses.replace(
+                context, cancel_event=cancel_event, deduplicated_bytes=0
+            )
+            if attempt_number == 0:
+                url, attempt_tmp, attempt_file = full_img_url, tmp_path, file_path
+            else:
+                url = self._hedge_image_url(full_img_url)
+                attempt_tmp, attempt_file = hedge_tmp_path, hedge_file_path
+            try:
+                if attempt_number:
+                    # 对冲请求与普通请求一样计入重试预算并遵守按主机限速
+                    self.retry_policy.record_request()
+                    self._wait_for_download_slot(attempt_context, url)
+                digest = self._fetch_image(url, attempt_context, attempt_tmp, attempt_file)
+            except BaseException:
+                if cancel_event.is_set() and not context.cancel_event.is_set():
+                    self._remove_tmp_file(attempt_tmp)
+                raise
+            if attempt_number and cancel_event.is_set():
+                self._remove_tmp_file(hedge_file_path)
+            return digest, attempt_context
+
+        winner, (digest, attempt_context) = hedger.race(attempt, tracker, context.cancel_event)
+        if winner:
+            logger.debug('对冲请求先完成: {}', file_path)
+            os.replace(hedge_file_path, file_path)
+        else:
+            self._remove_tmp_file(hedge_file_path)
+        with context.stats_lock:
+            context.deduplicated_bytes += attempt_context.deduplicated_bytes
+        return digest
+
+    def _hedge_image_url(self, full_img_url: str) -> str:
+        """URL for the backup request of a slow image; sources with mirror hosts override this."""
+        return full_img_url
+
+    def _fetch_image(
+        self, full_img_url: str, context: ImageDownloadContext, tmp_path: str, file_path: str
+    ) -> str | None:
+        """Download one image to ``file_path`` and return its digest when one was computed."""
+        partial = load_partial_image(tmp_path)
+        concurrency = getattr(context.scheduler, 'concurrency', None)
+        if concurrency is None:
+            transfer = ImageTransfer(partial)
+            response = self._request_image(full_img_url, context, partial)
+            try:
+                digest = self._write_image_response(
+                    response, context, tmp_path, file_path, transfer
+                )
+            finally:
+                _close_response(response)
+            self._record_image_transfer(full_img_url, transfer)
+            return digest
+        if not concurrency.acquire(context.cancel_event):
+            raise ImageDownloadCancelledError('image download cancelled')
+        started_at = time.monotonic()
+        latency = None
+        status_code = None
         try:
-            now = time.monotonic()
-            elapsed = now - context.last_request_at[0]
-            if (
-                context.last_request_at[0] > 0
-                and elapsed < interval
-                and context.cancel_event.wait(interval - elapsed)
-            ):
-                raise ImageDownloadCancelledError('image download cancelled')
-            context.last_request_at[0] = time.monotonic()
+            transfer = ImageTransfer(partial)
+            response = self._request_image(full_img_url, context, partial)
+            # 只统计到响应头的耗时，图片大小不同不应被当作延迟突增
+            latency = time.monotonic() - started_at
+            try:
+                digest = self._write_image_response(
+                    response, context, tmp_path, file_path, transfer
+                )
+            finally:
+                _close_response(response)
+            self._record_image_transfer(full_img_url, transfer)
+            return digest
+        except requests.exceptions.HTTPError as e:
+            status_code = getattr(e.response, 'status_code', None)
+            raise
         finally:
-            context.rate_lock.release()
+            decision = concurrency.release(latency, status_code)
+            if decision is not None:
+                logger.info(
+                    '图片下载并发调整: {} -> {} (上限 {}), 原因: {}',
+                    decision.previous,
+                    decision.limit,
+                    concurrency.ceiling,
+                    decision.reason,
+                )
 
-    def _request_image(self, full_img_url: str, context: ImageDownloadContext):
+    def _request_image(
+        self,
+        full_img_url: str,
+        context: ImageDownloadContext,
+        partial: PartialImage | None = None,
+    ):
         headers = {'referer': self._source_base_url()}
+        if partial is not None:
+            headers.update(partial.range_headers())
         self._raise_if_image_download_cancelled(context)
         session = self._image_http_session(context)
         self._raise_if_image_download_cancelled(context)
         response = session.get(full_img_url, timeout=30, headers=headers, stream=True)
-        response.raise_for_status()
+        if partial is not None and response.status_code == RANGE_NOT_SATISFIABLE:
+            # 已下载部分与服务器文件对不上，丢弃后不带 Range 立即重新下载
+            logger.debug('续传范围无效，从头下载: {}', full_img_url)
+            _close_response(response)
+            discard_partial_image(partial.tmp_path)
+            return self._request_image(full_img_url, context)
+        try:
+            response.raise_for_status()
+        except BaseException:
+            _close_response(response)
+            raise
         return response
 
     def _download_image_with_browser(
@@ -255,63 +721,131 @@ class ImageDownloadMixin:
     ) -> bool:
         if self._source_browser_mode() != SELENIUMBASE_MODE:
             return False
-        download_to_file = getattr(self.driver, 'download_to_file', None)
-        if not callable(download_to_file):
+        if not callable(getattr(self.driver, 'download_to_file', None)):
             return False
 
         self._raise_if_image_download_cancelled(context)
-        self._acquire_download_lock(context.http_lock, context)
+        lock = self._browser_download_lock(context)
+        self._acquire_download_lock(lock, context)
         try:
             self._raise_if_image_download_cancelled(context)
-            download_to_file(full_img_url, tmp_path, referer=self._source_base_url())
+            with self.leased_driver() as driver:
+                driver.download_to_file(full_img_url, tmp_path, referer=self._source_base_url())
         finally:
-            context.http_lock.release()
+            lock.release()
+        # 浏览器一次下载整张图，只能事后计入带宽，在释放驱动锁之后再等待
+        self._throttle_bandwidth(context, os.path.getsize(tmp_path))
         self._raise_if_image_download_cancelled(context)
         os.replace(tmp_path, file_path)
+        self._store_image_file_blob(context, file_path)
         return True
 
+    def _browser_download_lock(self, context: ImageDownloadContext):
+        # 与章节解析共享驱动锁，避免预解析线程与图片下载同时驱动同一个浏览器
+        return getattr(self, 'driver_lock', None) or context.http_lock
+
     def _write_image_response(
-        self, response, context: ImageDownloadContext, tmp_path: str, file_path: str
-    ) -> None:
+        self,
+        response,
+        context: ImageDownloadContext,
+        tmp_path: str,
+        file_path: str,
+        transfer: ImageTransfer,
+    ) -> str | None:
         self._raise_if_image_download_cancelled(context)
-        with open(tmp_path, 'wb') as f:
+        mode = self._image_write_mode(response, tmp_path, transfer.partial)
+        hasher = self._image_hasher(context, tmp_path, mode)
+        with open(tmp_path, mode) as f:
             for chunk in response.iter_content(chunk_size=1024 * 64):
                 self._raise_if_image_download_cancelled(context)
                 if chunk:
+                    self._throttle_transfer(context, len(chunk), transfer)
                     f.write(chunk)
+                    if hasher is not None:
+                        hasher.update(chunk)
         self._raise_if_image_download_cancelled(context)
         os.replace(tmp_path, file_path)
+        remove_partial_meta(tmp_path)
+        if hasher is None:
+            return None
+        digest = hasher.hexdigest()
+        self._store_image_blob(context, file_path, digest)
+        return digest
+
+    def _image_hasher(self, context: ImageDownloadContext, tmp_path: str, mode: str):
+        if self.blob_store is None and context.journal is None:
+            return None
+        hasher = new_image_hasher()
+        if mode == 'ab':
+            # 续传时先把已下载的部分计入摘要
+            with open(tmp_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    hasher.update(chunk)
+        return hasher
+
+    def _store_image_file_blob(self, context: ImageDownloadContext, file_path: str) -> None:
+        if self.blob_store is not None:
+            self._store_image_blob(context, file_path, file_digest(file_path))
+
+    def _store_image_blob(self, context: ImageDownloadContext, file_path: str, digest: str) -> None:
+        blob_store = self.blob_store
+        if blob_store is None:
+            return
+        saved = blob_store.adopt(file_path, digest)
+        if saved:
+            with context.stats_lock:
+                context.deduplicated_bytes += saved
+
+    def _image_write_mode(self, response, tmp_path: str, partial: PartialImage | None) -> str:
+        if partial is None or response.status_code != PARTIAL_CONTENT:
+            # 服务器不支持 Range 或文件已变化 (If-Range 不匹配)，整张重新下载
+            save_partial_image_validators(tmp_path, response.headers)
+            return 'wb'
+        content_range = response.headers.get('Content-Range')
+        if not partial.matches_content_range(content_range):
+            discard_partial_image(tmp_path)
+            raise RuntimeError(f'续传范围不匹配: {content_range}')
+        logger.debug('续传图片: {}, 已下载 {} 字节', tmp_path, partial.offset)
+        return 'ab'
 
     def _handle_image_download_error(
         self,
         tmp_path: str,
         full_img_url: str,
         attempt: int,
-        retry_count: int,
+        retry_delay: float | None,
         error: Exception,
     ) -> None:
-        self._remove_tmp_file(tmp_path)
-        if attempt <= retry_count:
+        self._release_tmp_file(tmp_path)
+        if retry_delay is not None:
             logger.warning(
-                '下载图片失败，将重试: {}, 第 {}/{} 次, 错误: {}',
+                '下载图片失败，{:.1f} 秒后重试: {}, 第 {} 次, 错误: {}',
+                retry_delay,
                 full_img_url,
                 attempt,
-                retry_count + 1,
                 error,
             )
         else:
             logger.error('下载图片失败: {}, 错误: {}', full_img_url, error)
 
-    def _remove_tmp_file(self, tmp_path: str) -> None:
-        if not os.path.exists(tmp_path):
+    def _release_tmp_file(self, tmp_path: str) -> None:
+        """Keep a partial image that can be resumed with Range, remove anything else."""
+        if has_resumable_partial(tmp_path):
+            logger.debug('保留未完成的图片以便续传: {}', tmp_path)
             return
-        try:
-            os.remove(tmp_path)
-        except OSError:
-            logger.warning('清理临时文件失败: {}', tmp_path, exc_info=True)
+        self._remove_tmp_file(tmp_path)
+
+    def _remove_tmp_file(self, tmp_path: str) -> None:
+        discard_partial_image(tmp_path)
 
     def _image_request_interval_seconds(self) -> float:
         configured = self._source_profile_value('image_request_interval', None)
         if configured is None:
             configured = self._source_profile_value('download_interval', 0)
         return float(configured or 0)
+
+
+def _close_response(response) -> None:
+    # 流式响应不读完也要关闭，否则连接不会归还连接池
+    if hasattr(response, 'close'):
+        response.close()
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from dataclasses import asdict, dataclass
+
+from loguru import logger
+
+JOURNAL_FILE_NAME = '.journal'
+JOURNAL_SYNC_INTERVAL = 32
+
+
+@dataclass(frozen=True)
+class JournalEntry:
+    index: int
+    size: int
+    digest: str | None
+    url: str
+
+    @property
+    def name(self) -> str:
+        return f'{self.index:04d}.jpg'
+
+
+def journal_path(image_dir: str) -> str:
+    return os.path.join(image_dir, JOURNAL_FILE_NAME)
+
+
+def is_journal_file(file_name: str) -> bool:
+    return file_name == JOURNAL_FILE_NAME
+
+
+def remove_journal(image_dir: str) -> None:
+    path = journal_path(image_dir)
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        return
+    except OSError:
+        logger.warning('清理下载日志失败: {}', path, exc_info=True)
+
+
+class VolumeJournal:
+    """Append-only record of the images a volume has finished downloading.
+
+    One JSON line per image (index, size, digest, source URL) lets resume and
+    completeness checks look pages up in memory instead of stat'ing every file.
+    Lines are flushed as they are written and fsynced every
+    ``JOURNAL_SYNC_INTERVAL`` records; a torn last line after a crash is
+    ignored on load.
+    """
+
+    def __init__(self, image_dir: str, *, fresh: bool = False) -> None:
+        self.path = journal_path(image_dir)
+        self._lock = threading.Lock()
+        self._entries: dict[str, JournalEntry] = {}
+        self._file = None
+        self._unsynced = 0
+        self._needs_newline = False
+        if fresh:
+            self.remove()
+        else:
+            self._load()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def __contains__(self, name: object) -> bool:
+        with self._lock:
+            return name in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    @property
+    def names(self) -> list[str]:
+        with self._lock:
+            return sorted(self._entries)
+
+    def record(self, entry: JournalEntry) -> None:
+        line = json.dumps(asdict(entry), ensure_ascii=False) + '\n'
+        with self._lock:
+            if self._file is None:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                self._file = open(self.path, 'a', encoding='utf-8')  # noqa: SIM115
+            if self._needs_newline:
+                self._file.write('\n')
+                self._needs_newline = False
+            self._file.write(line)
+            self._file.flush()
+            self._entries[entry.name] = entry
+            self._unsynced += 1
+            if self._unsynced >= JOURNAL_SYNC_INTERVAL:
+                self._sync()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is None:
+                return
+            self._sync()
+            self._file.close()
+            self._file = None
+
+    def remove(self) -> None:
+        self.close()
+        with self._lock:
+            self._entries.clear()
+        remove_journal(os.path.dirname(self.path))
+
+    def retain(self, names: set[str]) -> None:
+        """Rewrite the journal keeping only the entries whose image is in ``names``."""
+        self.close()
+        with self._lock:
+            self._entries = {name: e for name, e in self._entries.items() if name in names}
+            lines = ''.join(
+                json.dumps(asdict(entry), ensure_ascii=False) + '\n'
+                for entry in self._entries.values()
+            )
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(lines)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            self._needs_newline = False
+
+    def _sync(self) -> None:
+        if self._file is None or not self._unsynced:
+            return
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                content = f.read()
+        except FileNotFoundError:
+            return
+        except OSError:
+            logger.warning('读取下载日志失败，忽略: {}', self.path, exc_info=True)
+            return
+        self._needs_newline = bool(content) and not content.endswith('\n')
+        for line in content.splitlines():
+            try:
+                entry = JournalEntry(**json.loads(line))
+            except (TypeError, ValueError):
+                # 进程中断时最后一行可能只写了一半
+                continue
+            self._entries[entry.name] = entry
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import concurrent.futures
+import os
+import re
+import sqlite3
+import tarfile
+import threading
+import time
+import zipfile
+from dataclasses import dataclass
+
+from loguru import logger
+
+from downloader.download.archive_formats import (
+    ARCHIVE_EXTENSIONS,
+    TAR_FORMAT,
+    archive_format_for_path,
+)
+
+LIBRARY_INDEX_FILE_NAME = '.library.sqlite3'
+LIBRARY_SCAN_WORKERS = 8
+
+_MISSING_DIR_MTIME = -1
+_LEADING_ZEROS_PATTERN = re.compile(r'^0+(?=\d)')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS volumes (
+    book_dir TEXT NOT NULL,
+    volume TEXT NOT NULL,
+    comic TEXT NOT NULL,
+    book TEXT NOT NULL,
+    archive_path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    image_count INTEGER NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (book_dir, volume)
+);
+CREATE TABLE IF NOT EXISTS books (
+    book_dir TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL
+);
+"""
+
+
+def volume_key(name: str) -> str:
+    """Key shared by a volume name and its zero-padded archive name ("1 话" / "001 话")."""
+    return _LEADING_ZEROS_PATTERN.sub('', name)
+
+
+def count_archive_images(archive_path: str) -> int:
+    if archive_format_for_path(archive_path) == TAR_FORMAT:
+        with tarfile.open(archive_path) as archive:
+            return sum(1 for member in archive.getmembers() if member.isfile())
+    with zipfile.ZipFile(archive_path) as archive:
+        return sum(1 for info in archive.infolist() if not info.is_dir())
+
+
+@dataclass(frozen=True)
+class LibraryEntry:
+    book_dir: str
+    volume: str
+    comic: str
+    book: str
+    archive_path: str
+    size: int
+    image_count: int
+
+
+class LibraryIndex:
+    """SQLite index of the finished volume archives under one output directory.
+
+    Rows are keyed by the book directory and the volume name without zero
+    padding, so "already downloaded" is a single primary-key lookup instead of
+    several ``os.path.exists`` calls. Paths are stored relative to ``root`` so a
+    library can be moved. Each book directory also stores the mtime it had when
+    the index last listed it: while that is unchanged the rows are
+    authoritative, hits and misses alike. A book directory whose mtime moved
+    (an archive was added or deleted by hand) is listed once per run and its
+    rows are replaced; ``rebuild`` re-reads the whole library.
+    """
+
+    def __init__(self, root: str) -> None:
+        self.root = os.path.abspath(root)
+        self.path = os.path.join(self.root, LIBRARY_INDEX_FILE_NAME)
+        os.makedirs(self.root, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(_SCHEMA)
+        self._synced_books: set[str] = set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def find(self, book_dir: str, vol_name: str) -> str | None:
+        """Indexed archive of the volume; ``None`` means it is not downloaded."""
+        relative_book_dir = self._relative(book_dir)
+        with self._lock:
+            if relative_book_dir not in self._synced_books:
+                self._sync_book(book_dir, relative_book_dir)
+            row = self._conn.execute(
+                'SELECT archive_path FROM volumes WHERE book_dir = ? AND volume = ?',
+                (relative_book_dir, volume_key(vol_name)),
+            ).fetchone()
+        return None if row is None else os.path.join(self.root, row[0])
+
+    def record(self, archive_path: str, image_count: int | None = None) -> None:
+        entry = self._entry(archive_path, image_count)
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO volumes VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (*_entry_values(entry), time.time()),
+            )
+            if entry.book_dir in self._synced_books:
+                # 本次运行已核对过该目录，写入的新压缩包不应触发下次重新列目录
+                self._store_book_mtime(entry.book_dir, _dir_mtime_ns(os.path.dirname(archive_path)))
+
+    def rebuild(self, workers: int = LIBRARY_SCAN_WORKERS) -> int:
+        """Replace the index with the archives currently on disk; return how many."""
+        comic_dirs = [
+            entry.path
+            for entry in os.scandir(self.root)
+            if entry.is_dir() and not entry.name.startswith('.')
+        ]
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(1, workers), thread_name_prefix='library-scan'
+        ) as executor:
+            scanned = list(executor.map(self._scan_comic_dir, comic_dirs))
+        entries = [entry for comic_entries, _ in scanned for entry in comic_entries]
+        books = [book for _, comic_books in scanned for book in comic_books]
+        now = time.time()
+        with self._lock:
+            self._conn.execute('BEGIN')
+            try:
+                self._conn.execute('DELETE FROM volumes')
+                self._conn.execute('DELETE FROM books')
+                self._conn.executemany(
+                    'INSERT OR REPLACE INTO volumes VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                    [(*_entry_values(entry), now) for entry in entries],
+                )
+                self._conn.executemany('INSERT OR REPLACE INTO books VALUES (?, ?)', books)
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+            self._conn.execute('COMMIT')
+            self._synced_books = {book_dir for book_dir, _ in books}
+        return len(entries)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _scan_comic_dir(self, comic_dir: str) -> tuple[list[LibraryEntry], list[tuple[str, int]]]:
+        entries: list[LibraryEntry] = []
+        books: list[tuple[str, int]] = []
+        for dir_path, _, file_names in os.walk(comic_dir):
+            books.append((self._relative(dir_path), _dir_mtime_ns(dir_path)))
+            entries.extend(self._read_archives(dir_path, file_names))
+        return entries, books
+
+    def _read_archives(self, dir_path: str, file_names: list[str]) -> list[LibraryEntry]:
+        archive_extensions = tuple(ARCHIVE_EXTENSIONS.values())
+        entries: list[LibraryEntry] = []
+        for file_name in file_names:
+            if not file_name.endswith(archive_extensions):
+                continue
+            archive_path = os.path.join(dir_path, file_name)
+            try:
+                entries.append(self._entry(archive_path))
+            except (OSError, zipfile.BadZipFile, tarfile.TarError):
+                logger.warning('无法读取压缩包，跳过索引: {}', archive_path)
+        return entries
+
+    def _sync_book(self, book_dir: str, relative_book_dir: str) -> None:
+        """List ``book_dir`` again if it changed since the index last saw it."""
+        self._synced_books.add(relative_book_dir)
+        mtime_ns = _dir_mtime_ns(book_dir)
+        row = self._conn.execute(
+            'SELECT mtime_ns FROM books WHERE book_dir = ?', (relative_book_dir,)
+        ).fetchone()
+        if row is not None and row[0] == mtime_ns:
+            return
+        indexed = dict(
+            self._conn.execute(
+                'SELECT archive_path, volume FROM volumes WHERE book_dir = ?', (relative_book_dir,)
+            ).fetchall()
+        )
+        file_names = [] if mtime_ns == _MISSING_DIR_MTIME else os.listdir(book_dir)
+        present = {os.path.join(relative_book_dir, name) for name in file_names}
+        for archive_path, volume in indexed.items():
+            if archive_path not in present:
+                logger.info(
+                    '压缩包已不存在，移除索引记录: {}', os.path.join(self.root, archive_path)
+                )
+                self._conn.execute(
+                    'DELETE FROM volumes WHERE book_dir = ? AND volume = ?',
+                    (relative_book_dir, volume),
+                )
+        entries = self._read_archives(
+            book_dir,
+            [name for name in file_names if os.path.join(relative_book_dir, name) not in indexed],
+        )
+        now = time.time()
+        self._conn.executemany(
+            'INSERT OR REPLACE INTO volumes VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            [(*_entry_values(entry), now) for entry in entries],
+        )
+        self._store_book_mtime(relative_book_dir, mtime_ns)
+
+    def _store_book_mtime(self, relative_book_dir: str, mtime_ns: int) -> None:
+        self._conn.execute(
+            'INSERT OR REPLACE INTO books VALUES (?, ?)', (relative_book_dir, mtime_ns)
+        )
+
+    def _entry(self, archive_path: str, image_count: int | None = None) -> LibraryEntry:
+        book_dir = self._relative(os.path.dirname(archive_path))
+        parts = book_dir.split(os.sep)
+        return LibraryEntry(
+            book_dir=book_dir,
+            volume=volume_key(os.path.splitext(os.path.basename(archive_path))[0]),
+            comic=parts[0],
+            book=os.sep.join(parts[1:]),
+            archive_path=self._relative(archive_path),
+            size=os.path.getsize(archive_path),
+            image_count=count_archive_images(archive_path) if image_count is None else image_count,
+        )
+
+    def _relative(self, path: str) -> str:
+        return os.path.relpath(os.path.abspath(path), self.root)
+
+
+def _dir_mtime_ns(path: str) -> int:
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return _MISSING_DIR_MTIME
+
+
+def _entry_values(entry: LibraryEntry) -> tuple:
+    return (
+        entry.book_dir,
+        entry.volume,
+        entry.comic,
+        entry.book,
+        entry.archive_path,
+        entry.size,
+        entry.image_count,
+    )
+
+
+def rebuild_library_index(root: str, workers: int = LIBRARY_SCAN_WORKERS) -> int:
+    with LibraryIndex(root) as library:
+        return library.rebuild(workers)
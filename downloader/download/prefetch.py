@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import concurrent.futures
+import threading
+from dataclasses import dataclass
+from typing import Any
+
+from loguru import logger
+
+
+@dataclass(frozen=True)
+class VolumeJob:
+    path: str
+    vol_name: str
+    url: str
+
+
+class ImageListPrefetcher:
+    """Bounded look-ahead stage that parses upcoming volumes' image lists.
+
+    A single background worker parses at most ``depth`` volumes ahead of the one
+    currently downloading. Volumes that already have an archive are never parsed.
+    Driver-backed sources stay serialized because ``parse`` is expected to take
+    the source's driver lock.
+    """
+
+    def __init__(self, source: Any, depth: int) -> None:
+        self.source = source
+        self.depth = max(0, int(depth))
+        self._executor: concurrent.futures.ThreadPoolExecutor | None = None
+        if self.depth:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=1,
+                thread_name_prefix='image-list-prefetch',
+            )
+        self._futures: dict[str, concurrent.futures.Future] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(wait=exc_type is None or not issubclass(exc_type, KeyboardInterrupt))
+        return False
+
+    def schedule(self, upcoming: list[VolumeJob]) -> None:
+        if self._executor is None:
+            return
+        for job in upcoming[: self.depth]:
+            with self._lock:
+                if job.url in self._futures:
+                    continue
+            if self.source._find_existing_archive(job.path, job.vol_name):
+                continue
+            logger.debug('预解析章节图片: {} ({})', job.vol_name, job.url)
+            future = self._executor.submit(self.source._parse_images_now, job.url)
+            with self._lock:
+                self._futures[job.url] = future
+
+    def take(self, url: str) -> concurrent.futures.Future | None:
+        with self._lock:
+            return self._futures.pop(url, None)
+
+    def close(self, wait: bool = True) -> None:
+        with self._lock:
+            futures = list(self._futures.values())
+            self._futures.clear()
+        for future in futures:
+            future.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+
+
+class TokenBucket:
+    """Token bucket with burst capacity.
+
+    Callers reserve a token up front and are told how long to wait for it, so no
+    lock is held while sleeping and concurrent workers are spaced out instead of
+    sleeping one after another.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.rate = 0.0
+        self.burst = 1
+        self.configure(rate, burst)
+        self._tokens = float(self.burst)
+        self._updated_at = clock()
+
+    def configure(self, rate: float, burst: int = 1) -> None:
+        if rate <= 0:
+            raise ValueError('token bucket rate must be positive')
+        with self._lock:
+            self.rate = float(rate)
+            self.burst = max(1, int(burst))
+
+    def reserve(self, amount: float = 1) -> float:
+        """Take ``amount`` tokens and return how many seconds the caller must wait for them."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                float(self.burst), self._tokens + (now - self._updated_at) * self.rate
+            )
+            self._updated_at = now
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def refund(self, amount: float = 1) -> None:
+        """Give back reserved tokens the caller never used (e.g. cancelled wait)."""
+        with self._lock:
+            self._tokens = min(float(self.burst), self._tokens + amount)
+
+    def acquire(self, cancel_event: threading.Event | None = None, amount: float = 1) -> bool:
+        """Block until the tokens are available; return False if cancelled while waiting."""
+        delay = self.reserve(amount)
+        if delay <= 0:
+            return True
+        if cancel_event is None:
+            time.sleep(delay)
+            return True
+        if cancel_event.wait(delay):
+            self.refund(amount)
+            return False
+        return True
+
+
+class HostRateLimiter:
+    """Process-wide registry of token buckets keyed by host."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._buckets: dict[str, TokenBucket] = {}
+
+    def bucket(self, host: str, rate: float, burst: int = 1) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(rate, burst)
+                self._buckets[host] = bucket
+                return bucket
+        if bucket.rate != rate or bucket.burst != max(1, int(burst)):
+            bucket.configure(rate, burst)
+        return bucket
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+IMAGE_HOST_RATE_LIMITER = HostRateLimiter()
+"""所有卷、所有漫画共享的图片主机限流器"""
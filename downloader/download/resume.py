@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+from collections.abc import Mapping
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from loguru import logger
+
+PARTIAL_META_SUFFIX = '.meta'
+PARTIAL_CONTENT = 206
+RANGE_NOT_SATISFIABLE = 416
+
+_CONTENT_RANGE_PATTERN = re.compile(r'^bytes\s+(\d+)-(\d+)/(\d+|\*)$')
+
+
+@dataclass(frozen=True)
+class ImageValidators:
+    """Response validators saved next to a partial ``.tmp`` image."""
+
+    etag: str | None = None
+    last_modified: str | None = None
+    content_length: int | None = None
+
+    @classmethod
+    def from_headers(cls, headers: Mapping[str, Any]) -> ImageValidators:
+        content_length = headers.get('Content-Length')
+        return cls(
+            etag=headers.get('ETag'),
+            last_modified=headers.get('Last-Modified'),
+            content_length=int(content_length) if str(content_length or '').isdigit() else None,
+        )
+
+    def if_range(self) -> str | None:
+        # If-Range 只接受强 ETag 或 Last-Modified
+        if self.etag and not self.etag.startswith('W/'):
+            return self.etag
+        return self.last_modified
+
+
+@dataclass(frozen=True)
+class PartialImage:
+    tmp_path: str
+    offset: int
+    validators: ImageValidators
+
+    def range_headers(self) -> dict[str, str]:
+        headers = {'Range': f'bytes={self.offset}-'}
+        if_range = self.validators.if_range()
+        if if_range:
+            headers['If-Range'] = if_range
+        return headers
+
+    def matches_content_range(self, content_range: str | None) -> bool:
+        """Whether a 206 response continues exactly where the partial file stops."""
+        match = _CONTENT_RANGE_PATTERN.match((content_range or '').strip())
+        if match is None or int(match.group(1)) != self.offset:
+            return False
+        total = match.group(3)
+        expected = self.validators.content_length
+        return expected is None or total == '*' or int(total) == expected
+
+
+def partial_meta_path(tmp_path: str) -> str:
+    return tmp_path + PARTIAL_META_SUFFIX
+
+
+def is_partial_download_file(file_name: str) -> bool:
+    return file_name.endswith(('.tmp', '.tmp' + PARTIAL_META_SUFFIX))
+
+
+def load_partial_image(tmp_path: str) -> PartialImage | None:
+    """Return the resumable state of ``tmp_path``, or None when it must start over."""
+    meta_path = partial_meta_path(tmp_path)
+    try:
+        offset = os.path.getsize(tmp_path)
+        with open(meta_path, encoding='utf-8') as f:
+            validators = ImageValidators(**json.load(f))
+    except FileNotFoundError:
+        return None
+    except (OSError, TypeError, ValueError):
+        logger.debug('续传元数据无效，重新下载: {}', meta_path, exc_info=True)
+        discard_partial_image(tmp_path)
+        return None
+    if offset <= 0 or not (validators.if_range() or validators.content_length):
+        return None
+    if validators.content_length is not None and offset >= validators.content_length:
+        discard_partial_image(tmp_path)
+        return None
+    return PartialImage(tmp_path, offset, validators)
+
+
+def save_partial_image_validators(tmp_path: str, headers: Mapping[str, Any]) -> None:
+    validators = ImageValidators.from_headers(headers)
+    meta_path = partial_meta_path(tmp_path)
+    # 压缩传输时 Range 作用于编码后的字节，无法与解码后的 .tmp 对齐
+    encoded = headers.get('Content-Encoding') not in (None, '', 'identity')
+    if encoded or not (validators.if_range() or validators.content_length):
+        remove_partial_meta(tmp_path)
+        return
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        json.dump(asdict(validators), f)
+
+
+def has_resumable_partial(tmp_path: str) -> bool:
+    return (
+        os.path.exists(partial_meta_path(tmp_path))
+        and os.path.exists(tmp_path)
+        and os.path.getsize(tmp_path) > 0
+    )
+
+
+def remove_partial_meta(tmp_path: str) -> None:
+    meta_path = partial_meta_path(tmp_path)
+    if not os.path.exists(meta_path):
+        return
+    try:
+        os.remove(meta_path)
+    except OSError:
+        logger.warning('清理续传元数据失败: {}', meta_path, exc_info=True)
+
+
+def discard_partial_image(tmp_path: str) -> None:
+    remove_partial_meta(tmp_path)
+    if not os.path.exists(tmp_path):
+        return
+    try:
+        os.remove(tmp_path)
+    except OSError:
+        logger.warning('清理临时文件失败: {}', tmp_path, exc_info=True)
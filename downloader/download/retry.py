@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import email.utils
+import random
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+import requests
+from loguru import logger
+
+RETRY_STATUS_CODES = frozenset({408, 425, 429, 500, 502, 503, 504})
+RETRY_MAX_RETRIES = 3
+"""页面和 API 请求的默认重试次数，图片使用 image_retry_count"""
+RETRY_BASE_DELAY_SECONDS = 0.5
+RETRY_MAX_DELAY_SECONDS = 30.0
+RETRY_AFTER_MAX_SECONDS = 120.0
+"""服务器要求等待更久时不再重试，直接报告失败"""
+RETRY_BUDGET_CAPACITY = 10.0
+RETRY_BUDGET_RATIO = 0.2
+
+TRANSIENT_REQUEST_ERRORS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+
+def retry_after_seconds(response: Any, now: Callable[[], float] = time.time) -> float | None:
+    """Seconds requested by a ``Retry-After`` header (delta-seconds or HTTP date)."""
+    headers = getattr(response, 'headers', None) or {}
+    value = headers.get('Retry-After') or headers.get('retry-after')
+    if not value:
+        return None
+    value = str(value).strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None:
+        return None
+    return max(0.0, retry_at.timestamp() - now())
+
+
+class RetryBudget:
+    """Token bucket shared by every request of a source.
+
+    Each request deposits ``ratio`` tokens (up to ``capacity``) and each retry
+    spends one, so a failing host gets at most ``ratio`` retries per request
+    once the initial reserve is used up.
+    """
+
+    def __init__(self, ratio: float, capacity: float = RETRY_BUDGET_CAPACITY) -> None:
+        self.ratio = max(0.0, float(ratio))
+        self.capacity = max(1.0, float(capacity))
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+
+    def record_request(self) -> None:
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    @property
+    def tokens(self) -> float:
+        with self._lock:
+            return self._tokens
+
+
+class RetryPolicy:
+    """Retry decisions for a source: one budget, exponential backoff with full jitter.
+
+    A ``Retry-After`` header on the failed response replaces the backoff delay.
+    Page loads, API calls and image downloads of the same source share it.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = RETRY_MAX_RETRIES,
+        budget_ratio: float = RETRY_BUDGET_RATIO,
+        *,
+        sleep: Callable[[float], Any] = time.sleep,
+        rand: Callable[[], float] = random.random,
+    ) -> None:
+        self.max_retries = max(0, int(max_retries))
+        self.budget = RetryBudget(budget_ratio)
+        self._sleep = sleep
+        self._rand = rand
+
+    def record_request(self) -> None:
+        self.budget.record_request()
+
+    def backoff(self, retry_number: int) -> float:
+        ceiling = RETRY_BASE_DELAY_SECONDS * (2 ** max(0, retry_number - 1))
+        return self._rand() * min(RETRY_MAX_DELAY_SECONDS, ceiling)
+
+    def retry_delay(
+        self,
+        attempt: int,
+        error: BaseException | None = None,
+        response: Any = None,
+        max_retries: int | None = None,
+    ) -> float | None:
+        """Seconds to wait before retrying failed ``attempt`` (1-based), None to give up."""
+        limit = self.max_retries if max_retries is None else max(0, int(max_retries))
+        if attempt > limit:
+            return None
+        if response is None:
+            response = getattr(error, 'response', None)
+        if not self.is_retryable(error, response):
+            return None
+        retry_after = retry_after_seconds(response) if response is not None else None
+        if retry_after is not None and retry_after > RETRY_AFTER_MAX_SECONDS:
+            logger.warning('服务器要求 {:.0f} 秒后重试，超过上限，不再重试', retry_after)
+            return None
+        if not self.budget.try_spend():
+            logger.warning('重试预算已用完，不再重试')
+            return None
+        if retry_after is not None:
+            return retry_after
+        return self.backoff(attempt)
+
+    def is_retryable(self, error: BaseException | None, response: Any = None) -> bool:
+        status_code = getattr(response, 'status_code', None)
+        if isinstance(status_code, int):
+            return status_code in RETRY_STATUS_CODES
+        if isinstance(error, requests.exceptions.RequestException):
+            return isinstance(error, TRANSIENT_REQUEST_ERRORS)
+        return error is not None
+
+    def wait(self, delay: float, cancel_event: threading.Event | None = None) -> bool:
+        """Sleep before a retry; returns False when ``cancel_event`` was set meanwhile."""
+        if cancel_event is not None:
+            return not cancel_event.wait(delay)
+        self._sleep(delay)
+        return True
+
+    def send(
+        self,
+        send: Callable[[], Any],
+        *,
+        idempotent: bool = True,
+        retry_statuses: frozenset[int] = RETRY_STATUS_CODES,
+    ) -> Any:
+        """Call ``send()`` until it returns a non-retryable response or raises for good.
+
+        Like urllib3's ``raise_on_status=False``, the last retryable response is
+        returned rather than raised. Non-idempotent requests are only retried
+        when the connection failed before anything was sent.
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            self.record_request()
+            try:
+                response = send()
+            except requests.exceptions.RequestException as e:
+                if not idempotent and not isinstance(e, requests.exceptions.ConnectTimeout):
+                    raise
+                delay = self.retry_delay(attempt, e)
+                if delay is None:
+                    raise
+                logger.debug('请求失败，{:.1f} 秒后重试: {}', delay, e)
+            else:
+                if not idempotent or getattr(response, 'status_code', None) not in retry_statuses:
+                    return response
+                delay = self.retry_delay(attempt, response=response)
+                if delay is None:
+                    return response
+                logger.debug(
+                    'HTTP {}，{:.1f} 秒后重试: {}',
+                    response.status_code,
+                    delay,
+                    getattr(response, 'url', ''),
+                )
+                close = getattr(response, 'close', None)
+                if callable(close):
+                    close()
+            self.wait(delay)
+
+
+class RetryingHttp:
+    """``requests.Session`` look-alike whose ``get``/``post`` go through a ``RetryPolicy``."""
+
+    def __init__(
+        self, http: Any, policy: RetryPolicy, retry_statuses: frozenset[int] = RETRY_STATUS_CODES
+    ) -> None:
+        self.http = http
+        self.policy = policy
+        self.retry_statuses = retry_statuses
+
+    def get(self, url, **kwargs):
+        return self.policy.send(
+            lambda: self.http.get(url, **kwargs), retry_statuses=self.retry_statuses
+        )
+
+    def post(self, url, **kwargs):
+        return self.policy.send(lambda: self.http.post(url, **kwargs), idempotent=False)
+
+    def __getattr__(self, name: str):
+        return getattr(self.http, name)
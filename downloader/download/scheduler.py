@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import concurrent.futures
+import threading
+from collections.abc import Callable
+from typing import Any
+
+from loguru import logger
+
+from downloader.download.concurrency import AdaptiveConcurrencyLimiter
+from downloader.models import ImageDownloadContext
+
+
+class ImageDownloadScheduler:
+    """Long-lived image worker pool shared by every volume of one download run.
+
+    Worker threads and their pooled HTTP sessions outlive a single volume, so the
+    pool never drains to zero at a chapter boundary and connections are reused
+    across chapters. Volumes submit their image jobs through a per-volume
+    ``ImageDownloadContext`` created by ``create_context``.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        session_factory: Callable[[], Any],
+        concurrency: AdaptiveConcurrencyLimiter | None = None,
+    ) -> None:
+        self.max_workers = max(1, int(max_workers))
+        self.session_factory = session_factory
+        self.concurrency = concurrency
+        """可选的自适应并发控制器；线程数只是它的上限"""
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix='image-download',
+        )
+        self._thread_local = threading.local()
+        self._lock = threading.Lock()
+        self._sessions: list[Any] = []
+        self._contexts: list[ImageDownloadContext] = []
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None and issubclass(exc_type, KeyboardInterrupt | SystemExit):
+            self.cancel()
+        else:
+            self.close()
+        return False
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def create_context(self, path: str, use_base_img_url: bool) -> ImageDownloadContext:
+        context = ImageDownloadContext(
+            path=path,
+            use_base_img_url=use_base_img_url,
+            session_factory=self.session_factory,
+            scheduler=self,
+        )
+        with self._lock:
+            self._contexts.append(context)
+        return context
+
+    def release_context(self, context: ImageDownloadContext) -> None:
+        with self._lock:
+            if context in self._contexts:
+                self._contexts.remove(context)
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> concurrent.futures.Future:
+        if self._closed:
+            raise RuntimeError('image download scheduler is closed')
+        return self._executor.submit(fn, *args)
+
+    def session(self) -> Any:
+        session = getattr(self._thread_local, 'session', None)
+        if session is not None:
+            return session
+        session = self.session_factory()
+        self._thread_local.session = session
+        with self._lock:
+            self._sessions.append(session)
+        return session
+
+    def cancel(self) -> None:
+        """Stop the whole run: wake every volume, drop queued jobs, close connections."""
+        with self._lock:
+            contexts = list(self._contexts)
+        for context in contexts:
+            context.cancel_event.set()
+        self._closed = True
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._close_sessions()
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._executor.shutdown(wait=True)
+        self._close_sessions()
+
+    def _close_sessions(self) -> None:
+        with self._lock:
+            sessions = list(self._sessions)
+            self._sessions.clear()
+        for session in sessions:
+            close = getattr(session, 'close', None)
+            if callable(close):
+                try:
+                    close()
+                except Exception:
+                    logger.debug('Failed to close image HTTP session.', exc_info=True)
@@ -19,15 +19,8 @@ def download_volume(
     logger.info('开始下载卷/话: {} 从 {}', vol_name, url)
 
     existing_archive_path = source._find_existing_archive(path, vol_name)
-    if existing_archive_path:
-        logger.info('文件已存在，跳过: {}', existing_archive_path)
-        return VolumeDownloadResult(
-            name=vol_name,
-            url=url,
-            status='skipped',
-            archive_path=existing_archive_path,
-            message='文件已存在',
-        )
+    if existing_archive_path and not source._is_repairable_archive(existing_archive_path):
+        return _skipped_volume_result(vol_name, url, existing_archive_path)
 
     progress = ensure_download_progress(parent_progress)
     parse_task_id = None
@@ -49,6 +42,10 @@ def download_volume(
                 status='failed',
                 message='未解析到任何图片',
             )
+        if existing_archive_path and source._archive_has_all_images(
+            existing_archive_path, len(imgs)
+        ):
+            return _skipped_volume_result(vol_name, url, existing_archive_path)
 
         target_path = os.path.join(path, filter_dir_name(vol_name))
         result = source.__download_vol_images__(
@@ -73,3 +70,14 @@ def download_volume(
         source._remove_progress_task(progress, parse_task_id)
         logger.error('处理卷/话失败: {} ({}), 错误: {}', vol_name, url, e, exc_info=True)
         return VolumeDownloadResult(name=vol_name, url=url, status='failed', message=str(e))
+
+
+def _skipped_volume_result(vol_name: str, url: str, archive_path: str) -> VolumeDownloadResult:
+    logger.info('文件已存在，跳过: {}', archive_path)
+    return VolumeDownloadResult(
+        name=vol_name,
+        url=url,
+        status='skipped',
+        archive_path=archive_path,
+        message='文件已存在',
+    )
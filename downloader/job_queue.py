@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import os
+import socket
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Literal
+
+JOB_QUEUE_FILE_NAME = '.jobs.sqlite3'
+JOB_HEARTBEAT_SECONDS = 30.0
+JOB_LEASE_SECONDS = 120.0
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+JobStatus = Literal['queued', 'running', 'done', 'failed']
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL,
+    vols TEXT NOT NULL DEFAULT '',
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    message TEXT,
+    created_at REAL NOT NULL,
+    heartbeat_at REAL
+)
+"""
+_SELECT_JOBS = 'SELECT id, url, vols, status, attempts, worker, message FROM jobs'
+
+
+@dataclass(frozen=True)
+class DownloadJob:
+    """A queued comic download; ``vols`` holds the ``v`` command range, empty for all."""
+
+    id: int
+    url: str
+    vols: str
+    status: JobStatus
+    attempts: int = 0
+    worker: str | None = None
+    message: str | None = None
+
+
+def default_worker_name() -> str:
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+class JobQueue:
+    """Durable download queue stored next to the downloads.
+
+    Workers claim jobs atomically, so several ``queue run`` processes can share
+    one queue. A running job refreshes its heartbeat while it downloads; jobs
+    whose heartbeat stopped for ``JOB_LEASE_SECONDS`` belonged to a crashed
+    worker and are put back in the queue. Rerunning a job resumes it through
+    the usual skip logic (library index, download journal, partial files).
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(_SCHEMA)
+
+    @classmethod
+    def for_output_dir(cls, output_dir: str) -> JobQueue:
+        return cls(os.path.join(output_dir, JOB_QUEUE_FILE_NAME))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def add(self, url: str, vols: str = '') -> DownloadJob:
+        with self._lock:
+            cursor = self._conn.execute(
+                'INSERT INTO jobs (url, vols, status, created_at) VALUES (?, ?, ?, ?)',
+                (url, vols, QUEUED, time.time()),
+            )
+        return DownloadJob(id=int(cursor.lastrowid or 0), url=url, vols=vols, status=QUEUED)
+
+    def jobs(self) -> list[DownloadJob]:
+        with self._lock:
+            rows = self._conn.execute(_SELECT_JOBS + ' ORDER BY id').fetchall()
+        return [DownloadJob(*row) for row in rows]
+
+    def claim(self, worker: str | None = None) -> DownloadJob | None:
+        """Mark the oldest queued job as running for ``worker`` and return it."""
+        worker = worker or default_worker_name()
+        with self._lock, self._transaction():
+            row = self._conn.execute(
+                'SELECT id FROM jobs WHERE status = ? ORDER BY id LIMIT 1', (QUEUED,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                'UPDATE jobs SET status = ?, worker = ?, attempts = attempts + 1, '
+                'message = NULL, heartbeat_at = ? WHERE id = ?',
+                (RUNNING, worker, time.time(), row[0]),
+            )
+            claimed = self._conn.execute(_SELECT_JOBS + ' WHERE id = ?', (row[0],)).fetchone()
+        return DownloadJob(*claimed)
+
+    def heartbeat(self, job_id: int) -> None:
+        self._execute(
+            'UPDATE jobs SET heartbeat_at = ? WHERE id = ? AND status = ?',
+            (time.time(), job_id, RUNNING),
+        )
+
+    @contextmanager
+    def lease(self, job_id: int) -> Iterator[None]:
+        """Keep ``job_id``'s heartbeat fresh while the block runs."""
+        stopped = threading.Event()
+
+        def beat() -> None:
+            while not stopped.wait(JOB_HEARTBEAT_SECONDS):
+                self.heartbeat(job_id)
+
+        thread = threading.Thread(target=beat, name=f'job-heartbeat-{job_id}', daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stopped.set()
+            thread.join()
+
+    def finish(self, job_id: int, status: JobStatus, message: str | None = None) -> None:
+        self._execute(
+            'UPDATE jobs SET status = ?, message = ?, heartbeat_at = NULL WHERE id = ?',
+            (status, message, job_id),
+        )
+
+    def release(self, job_id: int) -> None:
+        """Put an interrupted job back in the queue."""
+        self.finish(job_id, QUEUED, '已中断，等待继续')
+
+    def requeue_stale(self, lease_seconds: float = JOB_LEASE_SECONDS) -> int:
+        return self._execute(
+            'UPDATE jobs SET status = ?, message = ? WHERE status = ? AND heartbeat_at < ?',
+            (QUEUED, '执行进程已退出，重新排队', RUNNING, time.time() - lease_seconds),
+        )
+
+    def retry_failed(self) -> int:
+        return self._execute(
+            'UPDATE jobs SET status = ?, message = NULL WHERE status = ?', (QUEUED, FAILED)
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _execute(self, sql: str, params: tuple) -> int:
+        with self._lock:
+            return self._conn.execute(sql, params).rowcount
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        # IMMEDIATE 先拿写锁，多个进程同时领取任务时不会领到同一个
+        self._conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield
+        except BaseException:
+            self._conn.execute('ROLLBACK')
+            raise
+        self._conn.execute('COMMIT')
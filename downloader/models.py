@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+import concurrent.futures
 import re
 import threading
 from collections.abc import Callable
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from typing import Any
 
 from downloader.browser.modes import BrowserModeName
@@ -49,13 +50,17 @@ class ImageDownloadContext:
     path: str
     use_base_img_url: bool
     session_factory: Callable[[], Any] | None = None
-    rate_lock: threading.Lock = field(default_factory=threading.Lock)
     http_lock: threading.Lock = field(default_factory=threading.Lock)
     session_lock: threading.Lock = field(default_factory=threading.Lock)
     cancel_event: threading.Event = field(default_factory=threading.Event)
-    last_request_at: list[float] = field(default_factory=lambda: [0.0])
     thread_local: threading.local = field(default_factory=threading.local)
     sessions: list[Any] = field(default_factory=list)
+    scheduler: Any = None
+    stats_lock: threading.Lock = field(default_factory=threading.Lock)
+    deduplicated_bytes: int = 0
+    archive_writer: Any = None
+    journal: Any = None
+    hedge_tracker: Any = None
 
 
 @dataclass(frozen=True)
@@ -83,11 +88,27 @@ class VolumeDownloadResult:
     failed_images: list[ImageDownloadFailure] = field(default_factory=list)
     archive_path: str | None = None
     message: str | None = None
+    deduplicated_bytes: int = 0
+    finalizing: concurrent.futures.Future | None = field(default=None, compare=False, repr=False)
 
     @property
     def ok(self) -> bool:
         return self.status in {'downloaded', 'skipped'}
 
+    def finalized(self) -> VolumeDownloadResult:
+        """Return the result of the background archive step, if one was scheduled."""
+        if self.finalizing is None:
+            return self
+        try:
+            result = self.finalizing.result()
+        except concurrent.futures.CancelledError:
+            result = replace(self, status='failed', message='压缩已取消')
+        except Exception as e:
+            result = replace(self, status='failed', message=f'压缩目录失败: {e}')
+        result.deduplicated_bytes = self.deduplicated_bytes
+        result.finalizing = None
+        return result
+
 
 @dataclass
 class DownloadSummary:
@@ -96,6 +117,10 @@ class DownloadSummary:
     def add(self, result: VolumeDownloadResult) -> None:
         self.volume_results.append(result)
 
+    def collect_finalized(self) -> None:
+        """Swap in the results of archives that were finished in the background."""
+        self.volume_results = [result.finalized() for result in self.volume_results]
+
     @property
     def total_volumes(self) -> int:
         return len(self.volume_results)
@@ -116,6 +141,10 @@ class DownloadSummary:
     def partial(self) -> int:
         return sum(1 for result in self.volume_results if result.status == 'partial')
 
+    @property
+    def deduplicated_bytes(self) -> int:
+        return sum(result.deduplicated_bytes for result in self.volume_results)
+
     @property
     def ok(self) -> bool:
         return self.total_volumes > 0 and self.failed == 0 and self.partial == 0
@@ -6,18 +6,27 @@ from pathlib import Path
 from typing import Any
 
 from downloader.browser.modes import BrowserModeName, normalize_browser_mode
+from downloader.download.archive_formats import ArchiveFormatName, normalize_archive_format
+from downloader.download.bandwidth import (
+    BANDWIDTH_GOVERNOR,
+    BandwidthSchedule,
+    parse_bandwidth_rate,
+)
 
 
 @dataclass(frozen=True)
 class SourceRuntimeConfig:
     enabled: bool | None = None
     browser_mode: BrowserModeName | None = None
+    archive_format: ArchiveFormatName | None = None
 
 
 @dataclass(frozen=True)
 class RuntimeConfig:
     sources: dict[str, SourceRuntimeConfig] = field(default_factory=dict)
     path: Path | None = None
+    bandwidth_limit: float | None = None
+    bandwidth_schedules: tuple[BandwidthSchedule, ...] = ()
 
     @classmethod
     def load(cls, path: str | Path) -> RuntimeConfig:
@@ -41,7 +50,13 @@ class RuntimeConfig:
             str(source_name): _parse_source_config(str(source_name), source_config)
             for source_name, source_config in raw_sources.items()
         }
-        return cls(sources=sources, path=path)
+        bandwidth_limit, bandwidth_schedules = _parse_bandwidth_config(raw_config.get('bandwidth'))
+        return cls(
+            sources=sources,
+            path=path,
+            bandwidth_limit=bandwidth_limit,
+            bandwidth_schedules=bandwidth_schedules,
+        )
 
     def source_config(self, source_name: str) -> SourceRuntimeConfig | None:
         return self.sources.get(source_name)
@@ -54,6 +69,38 @@ class RuntimeConfig:
         source_config = self.source_config(source_name)
         return source_config.browser_mode if source_config else None
 
+    def apply_bandwidth(self) -> None:
+        """Install the configured bandwidth cap on the process-wide governor."""
+        BANDWIDTH_GOVERNOR.configure(self.bandwidth_limit, self.bandwidth_schedules)
+
+
+def _parse_bandwidth_config(
+    raw_config: Any,
+) -> tuple[float | None, tuple[BandwidthSchedule, ...]]:
+    if raw_config is None or isinstance(raw_config, int | float | str):
+        return parse_bandwidth_rate(raw_config), ()
+    if not isinstance(raw_config, dict):
+        raise ValueError('Runtime config field "bandwidth" must be an object or a rate.')
+
+    unknown_keys = set(raw_config) - {'limit', 'schedules'}
+    if unknown_keys:
+        unknown = ', '.join(sorted(unknown_keys))
+        raise ValueError(f'Unknown runtime config key(s) for "bandwidth": {unknown}.')
+
+    raw_schedules = raw_config.get('schedules') or []
+    if not isinstance(raw_schedules, list):
+        raise ValueError('Runtime config field "bandwidth.schedules" must be a list.')
+    schedules = []
+    for raw_schedule in raw_schedules:
+        if not isinstance(raw_schedule, dict) or 'time' not in raw_schedule:
+            raise ValueError(
+                'Each "bandwidth.schedules" entry must be an object with "time" and "limit".'
+            )
+        schedules.append(
+            BandwidthSchedule.parse(str(raw_schedule['time']), raw_schedule.get('limit'))
+        )
+    return parse_bandwidth_rate(raw_config.get('limit')), tuple(schedules)
+
 
 def _parse_source_config(source_name: str, raw_config: Any) -> SourceRuntimeConfig:
     if isinstance(raw_config, bool):
@@ -61,7 +108,7 @@ def _parse_source_config(source_name: str, raw_config: Any) -> SourceRuntimeConf
     if not isinstance(raw_config, dict):
         raise ValueError(f'Runtime config for source "{source_name}" must be an object or boolean.')
 
-    unknown_keys = set(raw_config) - {'enabled', 'browser_mode'}
+    unknown_keys = set(raw_config) - {'enabled', 'browser_mode', 'archive_format'}
     if unknown_keys:
         unknown = ', '.join(sorted(unknown_keys))
         raise ValueError(f'Unknown runtime config key(s) for source "{source_name}": {unknown}.')
@@ -74,7 +121,13 @@ def _parse_source_config(source_name: str, raw_config: Any) -> SourceRuntimeConf
     if raw_config.get('browser_mode') is not None:
         browser_mode = normalize_browser_mode(raw_config['browser_mode'])
 
-    return SourceRuntimeConfig(enabled=enabled, browser_mode=browser_mode)
+    archive_format = None
+    if raw_config.get('archive_format') is not None:
+        archive_format = normalize_archive_format(raw_config['archive_format'])
+
+    return SourceRuntimeConfig(
+        enabled=enabled, browser_mode=browser_mode, archive_format=archive_format
+    )
 
 
 def _parse_optional_bool(source_name: str, value: Any) -> bool | None:
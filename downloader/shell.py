@@ -2,19 +2,26 @@ from __future__ import annotations
 
 import cmd
 import concurrent.futures
+import sqlite3
 import threading
 import time
 from collections.abc import Callable
 from dataclasses import dataclass
 from typing import Any
+from urllib.parse import urlsplit
 
 import requests
 from loguru import logger
 from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 
+from downloader.browser.fallback import FallbackBrowser
 from downloader.browser.manager import DriverManager
+from downloader.browser.persistence import CookieStore
+from downloader.browser.pool import DriverPool
 from downloader.comic import Comic, ComicSource
+from downloader.download.library import rebuild_library_index
+from downloader.job_queue import DONE, FAILED, DownloadJob, JobQueue
+from downloader.models import DownloadSummary
 from downloader.runtime_config import RuntimeConfig
 from downloader.sources import load_source_bindings
 from downloader.sources.profiles import SourceBinding, SourceProfile
@@ -54,6 +61,26 @@ def parse_volume_slice(args: list[str], book_count: int, vol_count: int) -> tupl
     raise ValueError('参数错误，请重新输入！')
 
 
+def _summary_message(summary: DownloadSummary) -> str:
+    return (
+        f'成功 {summary.downloaded}, 跳过 {summary.skipped}, '
+        f'失败 {summary.failed}, 部分 {summary.partial}'
+    )
+
+
+def _cookie_source_name(source: ComicSource) -> str:
+    profile = getattr(source, 'profile', None)
+    if isinstance(profile, SourceProfile):
+        return profile.source_name
+    return type(source).__name__
+
+
+def _cookie_source_hosts(source: ComicSource) -> list[str]:
+    """站点和图片服务器的主机名，只保存属于这些主机的 Cookie"""
+    urls = (source._source_base_url(), source._source_profile_value('base_img_url', ''))
+    return [host for url in urls if url and (host := urlsplit(str(url)).hostname)]
+
+
 @dataclass(frozen=True)
 class SearchTask:
     source_name: str
@@ -62,6 +89,8 @@ class SearchTask:
     search_func: Callable[[str], list]
     uses_driver: bool
     display_name: str
+    pooled: bool = False
+    """从浏览器池借用驱动，不需要与其他搜索任务串行"""
 
 
 @dataclass
@@ -78,7 +107,7 @@ def _execute_search_task(
     start = time.perf_counter()
     try:
         # Selenium driver 不是线程安全的，访问时强制串行化
-        if task.uses_driver:
+        if task.uses_driver and not task.pooled:
             if driver_lock is None:
                 raise RuntimeError('浏览器驱动锁未初始化')
             with driver_lock:
@@ -163,6 +192,8 @@ class Shell(cmd.Cmd):
         self.context.create(output_path)
         self.overwrite = overwrite
         self.runtime_config = runtime_config
+        if runtime_config is not None:
+            runtime_config.apply_bandwidth()
         self.search_driver_lock = threading.Lock()
         self.current_source_name = None
         self.prompt = self.presenter.prompt(self.current_source_name)
@@ -227,6 +258,7 @@ class Shell(cmd.Cmd):
             return False
         if isinstance(target, ComicSource):
             target.driver = self.context.driver
+            target.driver_pool = self.context.driver_pool(target)
         return True
 
     def _ensure_source_download_ready(self) -> bool:
@@ -300,12 +332,14 @@ class Shell(cmd.Cmd):
         if source_name not in self.sources:
             binding = self.source_bindings.get(source_name) or self.all_source_bindings[source_name]
             source_class = binding.source_class
-            self.sources[source_name] = source_class(
-                self.context.output_path,
-                self.context.http,
-                self.context.get_driver(binding.profile),
-                overwrite=self.overwrite,
-                profile=binding.profile,
+            self.sources[source_name] = self._prepare_source(
+                source_class(
+                    self.context.output_path,
+                    self.context.http,
+                    self.context.get_driver(binding.profile),
+                    overwrite=self.overwrite,
+                    profile=binding.profile,
+                )
             )
 
         self.context.source = self.sources[source_name]
@@ -315,21 +349,34 @@ class Shell(cmd.Cmd):
     def _build_search_func(
         self, binding: SourceBinding, uses_driver: bool
     ) -> Callable[[str], list]:
+        def _search_with(driver, keyword: str) -> list:
+            source = self._prepare_source(
+                binding.source_class(
+                    self.context.output_path,
+                    self.context.create_http_session(),
+                    driver,
+                    overwrite=self.overwrite,
+                    profile=binding.profile,
+                ),
+                remember_cookies=False,
+            )
+            try:
+                return source.search(keyword)
+            finally:
+                # 每次搜索用新的会话，搜索结束时就保存它拿到的 Cookie
+                self.context.save_cookies(source)
+
         def _search(keyword: str) -> list:
             driver = None
             if uses_driver:
+                pool = self.context.driver_pool(binding.profile)
+                if pool is not None:
+                    with pool.lease() as driver:
+                        return _search_with(driver, keyword)
                 if not self.context.ensure_driver(binding.profile):
                     raise RuntimeError('Browser driver was not initialized')
                 driver = self.context.driver
-            http = self.context.create_http_session()
-            source = binding.source_class(
-                self.context.output_path,
-                http,
-                driver,
-                overwrite=self.overwrite,
-                profile=binding.profile,
-            )
-            return source.search(keyword)
+            return _search_with(driver, keyword)
 
         return _search
 
@@ -347,19 +394,32 @@ class Shell(cmd.Cmd):
                     search_func=self._build_search_func(binding, uses_driver),
                     uses_driver=uses_driver,
                     display_name=getattr(source_class, 'name', source_name),
+                    pooled=uses_driver and binding.profile.driver_pool_size > 1,
                 )
             )
 
             if source_name not in self.sources:
-                self.sources[source_name] = source_class(
-                    self.context.output_path,
-                    self.context.http,
-                    self.context.get_driver(binding.profile),
-                    overwrite=self.overwrite,
-                    profile=binding.profile,
+                self.sources[source_name] = self._prepare_source(
+                    source_class(
+                        self.context.output_path,
+                        self.context.http,
+                        self.context.get_driver(binding.profile),
+                        overwrite=self.overwrite,
+                        profile=binding.profile,
+                    )
                 )
         return tasks
 
+    def _prepare_source(self, source: ComicSource, *, remember_cookies: bool = True) -> ComicSource:
+        """接入会话级的备用浏览器，并恢复该源上次保存的 Cookie
+
+        被拦截时改用浏览器的页面共用一个备用浏览器，而不是每页启动一个。
+        remember_cookies 的源在退出时保存 Cookie。
+        """
+        source.fallback_browser = self.context.fallback_browser(source)
+        self.context.restore_cookies(source, remember=remember_cookies)
+        return source
+
     def _filter_ready_search_tasks(self, tasks: list[SearchTask]) -> list[SearchTask]:
         ready_tasks = []
         skipped_sources = set()
@@ -473,8 +533,9 @@ class Shell(cmd.Cmd):
         if not self._ensure_source_page_ready():
             return
 
-        with self.presenter.status('正在获取详情...', spinner='dots'):
-            self.context.comic = self.context.source.info(url)
+        source = self.context.source
+        with self.presenter.status('正在获取详情...', spinner='dots'), source.leased_driver():
+            self.context.comic = source.info(url)
 
         if self.context.comic is None:
             self.presenter.error('未能获取动漫详情，请检查输入的地址或稍后重试。')
@@ -528,15 +589,20 @@ class Shell(cmd.Cmd):
 
     def do_v(self, arg):
         """下载动漫，输入v <章节序号> <起始序号> <截止序号>，例如：v 1 11 12"""
+        summary = self._download_vols(arg)
+        if summary:
+            self.__print_download_summary(summary)
+
+    def _download_vols(self, arg: str) -> DownloadSummary | None:
         if not self.context.source:
             self.presenter.warn('请您先选择动漫下载网站源！')
-            return
+            return None
         if not arg:
             self.presenter.warn('请输入动漫章节序号！')
-            return
+            return None
         if self.context.comic is None:
             self.presenter.warn('请先查看动漫详情！')
-            return
+            return None
 
         args = arg.split()
         try:
@@ -545,19 +611,16 @@ class Shell(cmd.Cmd):
             _, vol_slice = parse_volume_slice(args, len(self.context.comic.books), len(book.vols))
         except ValueError as e:
             self.presenter.warn(str(e))
-            return
+            return None
         vols = book.vols[vol_slice]
-        if not self._ensure_source_download_ready():
-            return
         source = self.context.source
-        if source is None:
-            return
-        summary = source.download_vols(
+        if source is None or not self._ensure_source_download_ready():
+            return None
+        return source.download_vols(
             self.context.comic.name or '未知漫画',
             book.name or '默认章节',
             vols,
         )
-        self.__print_download_summary(summary)
 
     def _download_loaded_comic(self):
         if self.context.comic is None:
@@ -637,6 +700,79 @@ class Shell(cmd.Cmd):
     def __print_download_summary(self, summary):
         self.presenter.download_summary(summary)
 
+    def do_index(self, arg):
+        """重建下载库索引，输入index rebuild，从磁盘重新扫描已下载的压缩包"""
+        if arg.strip() != 'rebuild':
+            self.presenter.warn('请输入 index rebuild 重建下载库索引！')
+            return
+        with self.presenter.status('正在扫描已下载的压缩包...'):
+            count = rebuild_library_index(self.context.output_path)
+        self.presenter.success(f'下载库索引已重建，共 {count} 个压缩包。')
+
+    def do_queue(self, arg):
+        """下载任务队列，输入queue add <动漫URL> [章节序号] [起始序号] [截止序号]、queue run、queue list 或 queue retry"""
+        command, _, rest = arg.strip().partition(' ')
+        handlers = {
+            'add': self._queue_add,
+            'run': self._queue_run,
+            'list': self._queue_list,
+            'retry': self._queue_retry,
+        }
+        handler = handlers.get(command)
+        if handler is None:
+            self.presenter.warn('请输入 queue add/run/list/retry！')
+            return
+        with JobQueue.for_output_dir(self.context.output_path) as queue:
+            handler(queue, rest.strip())
+
+    def _queue_add(self, queue: JobQueue, arg: str) -> None:
+        url, _, vols = arg.partition(' ')
+        if not url:
+            self.presenter.warn('请输入动漫URL地址！例如: queue add https://... 1 5 10')
+            return
+        job = queue.add(url, vols.strip())
+        self.presenter.success(f'已加入下载队列: #{job.id} {url} {job.vols}'.rstrip())
+
+    def _queue_list(self, queue: JobQueue, arg: str) -> None:
+        self.presenter.download_jobs(queue.jobs())
+
+    def _queue_retry(self, queue: JobQueue, arg: str) -> None:
+        self.presenter.info(f'已重新排队 {queue.retry_failed()} 个失败任务。')
+
+    def _queue_run(self, queue: JobQueue, arg: str) -> None:
+        requeued = queue.requeue_stale()
+        if requeued:
+            self.presenter.info(f'{requeued} 个中断的任务已重新排队。')
+        finished = 0
+        while (job := queue.claim()) is not None:
+            self.presenter.info(f'开始下载任务 #{job.id}: {job.url} {job.vols}'.rstrip())
+            with queue.lease(job.id):
+                try:
+                    summary = self._run_download_job(job)
+                except KeyboardInterrupt:
+                    queue.release(job.id)
+                    raise
+                except Exception as e:
+                    logger.error('下载任务 #{} 失败: {}', job.id, e, exc_info=True)
+                    queue.finish(job.id, FAILED, str(e))
+                    continue
+            if summary is None:
+                queue.finish(job.id, FAILED, '获取动漫信息失败')
+            else:
+                self.__print_download_summary(summary)
+                queue.finish(job.id, DONE if summary.ok else FAILED, _summary_message(summary))
+            finished += 1
+        self.presenter.success(f'下载队列已清空，本次执行 {finished} 个任务。')
+
+    def _run_download_job(self, job: DownloadJob) -> DownloadSummary | None:
+        if not job.vols:
+            return self._download_direct_url(job.url)
+        self.context.comic = None
+        self.do_i(job.url)
+        if self.context.comic is None:
+            return None
+        return self._download_vols(job.vols)
+
     def do_q(self, arg):
         """退出动漫下载器"""
         self.context.destroy()
@@ -682,6 +818,9 @@ class Context:
             self.presenter = TerminalPresenter(presenter_or_console)
         self.console = self.presenter.console
         self.driver_manager = DriverManager(self.presenter)
+        self._cookie_store: CookieStore | None = None
+        self._cookie_store_failed = False
+        self._cookie_sources: list[ComicSource] = []
         self.reset()
 
     @property
@@ -706,13 +845,8 @@ class Context:
         self.http = self.create_http_session()
 
     def create_http_session(self):
-        retry_strategy = Retry(
-            total=3,
-            status_forcelist=[400, 429, 500, 502, 503, 504],
-            allowed_methods=['GET'],
-            raise_on_status=False,
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # 重试由各个源的 RetryPolicy 负责，会话本身不再叠加 urllib3 的重试
+        adapter = HTTPAdapter()
         http = requests.Session()
         http.headers.update(
             {
@@ -740,6 +874,14 @@ class Context:
     ) -> bool:
         return self.driver_manager.init_driver(source_or_class)
 
+    def driver_pool(
+        self, source_or_class: SourceProfile | ComicSource | type[ComicSource] | None = None
+    ) -> DriverPool | None:
+        return self.driver_manager.driver_pool(source_or_class)
+
+    def fallback_browser(self, source: ComicSource) -> FallbackBrowser:
+        return self.driver_manager.fallback_browser(source)
+
     def _driver_cache_key(
         self, source_or_class: SourceProfile | ComicSource | type[ComicSource] | None = None
     ) -> tuple[str, bool]:
@@ -775,7 +917,49 @@ class Context:
     ) -> dict[str, Any] | None:
         return self.driver_manager._source_cloakbrowser_options(source_or_class)
 
+    def restore_cookies(self, source: ComicSource, *, remember: bool = True) -> None:
+        """把该源保存的 Cookie 载入它的会话；remember 的源在 destroy 时保存"""
+        store = self._source_cookie_store(source)
+        if store is None:
+            return
+        try:
+            store.load(_cookie_source_name(source), source.http.cookies)
+        except (sqlite3.Error, OSError) as e:
+            logger.warning('读取保存的 Cookie 失败: {}', e)
+        if remember:
+            self._cookie_sources.append(source)
+
+    def save_cookies(self, source: ComicSource) -> None:
+        store = self._source_cookie_store(source)
+        if store is None:
+            return
+        try:
+            store.save(
+                _cookie_source_name(source), source.http.cookies, _cookie_source_hosts(source)
+            )
+        except (sqlite3.Error, OSError) as e:
+            logger.warning('保存 Cookie 失败: {}', e)
+
+    def _source_cookie_store(self, source: ComicSource) -> CookieStore | None:
+        if not source._source_profile_value('persistent_cookies', False):
+            return None
+        if getattr(getattr(source, 'http', None), 'cookies', None) is None:
+            return None
+        if self._cookie_store is None and not self._cookie_store_failed:
+            try:
+                self._cookie_store = CookieStore()
+            except (sqlite3.Error, OSError) as e:
+                logger.warning('无法打开 Cookie 存储，本次不保存 Cookie: {}', e)
+                self._cookie_store_failed = True
+        return self._cookie_store
+
     def destroy(self):
+        for source in self._cookie_sources:
+            self.save_cookies(source)
+        self._cookie_sources.clear()
+        if self._cookie_store is not None:
+            self._cookie_store.close()
+            self._cookie_store = None
         self.driver_manager.destroy()
 
     def reset(self):
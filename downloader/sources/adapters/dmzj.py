@@ -27,7 +27,7 @@ class DmzjComic(ComicSource):
         search_url = f'http://sacg.dmzj.com/comicsum/search.php?s={quote(keyword)}'
         arr = []
         try:
-            r = self.http.get(search_url, timeout=30)
+            r = self._retrying_http().get(search_url, timeout=30)
             r.raise_for_status()
             js_code = r.text + '; ' + self.config['search_js']
             results = self.execute_js_safely(self.driver, js_code, [])
@@ -256,7 +256,9 @@ class DumanwuComic(ComicSource):
                 more_chapters_url=more_chapters_url,
                 comic_id=comic_id,
             )
-            response = self.http.post(more_chapters_url, data=payload, headers=headers, timeout=30)
+            response = self._retrying_http().post(
+                more_chapters_url, data=payload, headers=headers, timeout=30
+            )
             response.raise_for_status()
             json_response = response.json()
             self._append_more_chapter_response(comic_book, comic_id, json_response)
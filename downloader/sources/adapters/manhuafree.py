@@ -3,10 +3,19 @@ from __future__ import annotations
 import re
 from urllib.parse import quote
 
+import requests
 from lxml import etree  # pyright: ignore[reportAttributeAccessIssue]
 
 from downloader.browser.modes import REQUESTS_MODE
-from downloader.comic import Comic, ComicBook, ComicSource, ComicVolume, logger
+from downloader.comic import (
+    Comic,
+    ComicBook,
+    ComicSource,
+    ComicVolume,
+    ImageDownloadContext,
+    logger,
+)
+from downloader.download.host_selection import HostSelector
 
 # 漫画状态码映射
 STATUS_MAP = {'0': '完结', '1': '连载', '2': '暂停'}
@@ -15,6 +24,8 @@ STATUS_MAP = {'0': '完结', '1': '连载', '2': '暂停'}
 IMG_HOST_LINE_2 = 'https://f40-1-4.g-mh.online'
 IMG_HOST_LINE_2_VALUE = 2
 DEFAULT_IMG_HOST = 'https://t40-1-4.g-mh.online'
+IMG_HOST_PROBE_TIMEOUT = 10
+IMG_HOST_PROBE_BYTES = 256 * 1024
 
 # API 成功状态码
 API_SUCCESS_CODE = 200
@@ -30,12 +41,16 @@ class ManhuafreeComic(ComicSource):
 
     def __init__(self, output_dir, http, driver, overwrite=True, *, profile=None):
         super().__init__(output_dir, http, driver, overwrite, profile=profile)
+        # 各线路的测速成绩在整个会话内保留，章节之间共享
+        self.img_host_selector = HostSelector(
+            self.config.get('img_hosts') or (DEFAULT_IMG_HOST, IMG_HOST_LINE_2)
+        )
 
     def _api_get(self, path, params=None):
         """调用 API 并返回 JSON 数据，失败返回 None"""
         api_url = f'{self.config["api_base_url"]}{path}'
         try:
-            resp = self.http.get(
+            resp = self._retrying_http().get(
                 api_url,
                 params=params,
                 headers={'Referer': self.base_url, 'User-Agent': 'Mozilla/5.0'},
@@ -250,4 +265,44 @@ class ManhuafreeComic(ComicSource):
             else:
                 img_urls.append(img_host + img_path)
         logger.info('成功解析了 {} 张图片.', len(img_urls))
-        return img_urls
+        # API 指定的线路只作为默认值，首个章节用前几张图片测速后改用更快的线路
+        self.img_host_selector.probe(img_urls, self._probe_img_host)
+        return [self.img_host_selector.rewrite(img_url) for img_url in img_urls]
+
+    def _probe_img_host(self, img_url):
+        """测速请求与图片下载一样遵守按主机限速和带宽上限，只读取图片开头的一段"""
+        context = ImageDownloadContext(path=self.output_dir, use_base_img_url=False)
+        self._wait_for_download_slot(context, img_url)
+        headers = {'Referer': self.base_url, 'Range': f'bytes=0-{IMG_HOST_PROBE_BYTES - 1}'}
+        resp = self.http.get(img_url, headers=headers, timeout=IMG_HOST_PROBE_TIMEOUT, stream=True)
+        try:
+            resp.raise_for_status()
+            received = 0
+            for chunk in resp.iter_content(chunk_size=1024 * 64):
+                self._throttle_bandwidth(context, len(chunk))
+                received += len(chunk)
+                # 服务器忽略 Range 时也只读这么多
+                if received >= IMG_HOST_PROBE_BYTES:
+                    break
+            return received
+        finally:
+            resp.close()
+
+    def _fetch_image_hedged(self, full_img_url, context, tmp_path, file_path):
+        """每次重试都按当前成绩选择线路，线路连续出错时自动切到另一条"""
+        img_url = self.img_host_selector.rewrite(full_img_url)
+        return super()._fetch_image_hedged(img_url, context, tmp_path, file_path)
+
+    def _hedge_image_url(self, full_img_url):
+        return self.img_host_selector.alternate(full_img_url)
+
+    def _fetch_image(self, full_img_url, context, tmp_path, file_path):
+        try:
+            return super()._fetch_image(full_img_url, context, tmp_path, file_path)
+        except (requests.exceptions.RequestException, OSError):
+            self.img_host_selector.record_failure(full_img_url)
+            raise
+
+    def _record_image_transfer(self, full_img_url, transfer):
+        # 只计响应本身的耗时，并发排队和带宽限速的等待不算在线路头上
+        self.img_host_selector.record_success(full_img_url, transfer.seconds, transfer.nbytes)
@@ -27,7 +27,7 @@ class MaoflyComic(ComicSource):
         js_url = f'{self.base_url}/static/js/string.min.js'
         try:
             logger.info('正在为 {} 初始化JS解码器...', self.name)
-            r = self.http.get(js_url, timeout=30)
+            r = self._retrying_http().get(js_url, timeout=30)
             r.raise_for_status()
             self.jsstring = r.text
             logger.info('成功获取JS解码脚本: {}', js_url)
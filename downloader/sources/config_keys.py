@@ -3,13 +3,36 @@ SOURCE_CONFIG_ATTRIBUTE_KEYS = (
     'base_img_url',
     'download_interval',
     'image_request_interval',
+    'image_requests_per_second',
+    'image_request_burst',
     'page_load_wait_seconds',
     'scroll_wait_seconds',
     'max_scroll_attempts',
+    'volume_parse_lookahead',
+    'concurrent_volumes',
+    'prewarm_connections',
+    'image_hedge_ratio',
+    'retry_budget_ratio',
+    'driver_pool_size',
+    'adaptive_download_workers',
+    'image_download_engine',
+    'async_connections_per_host',
+    'image_blob_store',
+    'stream_to_archive',
+    'keep_image_dir',
+    'archive_format',
+    'archive_workers',
+    'repair_archives',
+    'download_journal',
+    'library_index',
     'browser_mode',
     'browser_wait_selector',
     'browser_wait_seconds',
     'browser_headless',
+    'browser_fixed_waits',
+    'browser_cookie_bridge',
+    'persistent_cookies',
+    'persistent_browser_profile',
     'seleniumbase_wait_selector',
     'seleniumbase_wait_seconds',
     'seleniumbase_headless',
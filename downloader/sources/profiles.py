@@ -17,6 +17,16 @@ from downloader.browser.modes import (
     is_driver_backed_browser_mode,
     normalize_browser_mode,
 )
+from downloader.download.archive_formats import (
+    ZIP_FORMAT,
+    ArchiveFormatName,
+    normalize_archive_format,
+)
+from downloader.download.async_images import (
+    THREAD_ENGINE,
+    ImageDownloadEngineName,
+    normalize_image_download_engine,
+)
 from downloader.runtime_config import RuntimeConfig
 from downloader.sources.config_keys import SOURCE_CONFIG_ATTRIBUTE_KEYS
 
@@ -26,6 +36,8 @@ PROFILE_ATTRIBUTE_DEFAULTS: dict[str, Any] = {
     'browser_mode': REQUESTS_MODE,
     'download_interval': 0,
     'image_request_interval': None,
+    'image_requests_per_second': None,
+    'image_request_burst': 1,
     'page_load_wait_seconds': None,
     'scroll_wait_seconds': None,
     'max_scroll_attempts': None,
@@ -33,9 +45,30 @@ PROFILE_ATTRIBUTE_DEFAULTS: dict[str, Any] = {
     'search_requires_driver': False,
     'image_retry_count': 1,
     'max_download_workers': 5,
+    'adaptive_download_workers': False,
+    'image_download_engine': THREAD_ENGINE,
+    'async_connections_per_host': 16,
+    'image_blob_store': False,
+    'stream_to_archive': False,
+    'keep_image_dir': True,
+    'archive_format': ZIP_FORMAT,
+    'archive_workers': 0,
+    'repair_archives': False,
+    'download_journal': False,
+    'library_index': False,
+    'volume_parse_lookahead': 0,
+    'concurrent_volumes': 1,
+    'prewarm_connections': False,
+    'image_hedge_ratio': 0.0,
+    'retry_budget_ratio': 0.2,
+    'driver_pool_size': 1,
     'browser_wait_selector': None,
     'browser_wait_seconds': None,
     'browser_headless': None,
+    'browser_fixed_waits': False,
+    'browser_cookie_bridge': False,
+    'persistent_cookies': False,
+    'persistent_browser_profile': False,
     'seleniumbase_wait_selector': None,
     'seleniumbase_wait_seconds': 20.0,
     'seleniumbase_headless': None,
@@ -57,6 +90,8 @@ class SourceProfile:
     browser_mode: BrowserModeName = REQUESTS_MODE
     download_interval: float = 0
     image_request_interval: float | None = None
+    image_requests_per_second: float | None = None
+    image_request_burst: int = 1
     page_load_wait_seconds: float | None = None
     scroll_wait_seconds: float | None = None
     max_scroll_attempts: int | None = None
@@ -64,9 +99,30 @@ class SourceProfile:
     search_requires_driver: bool = False
     image_retry_count: int = 1
     max_download_workers: int = 5
+    adaptive_download_workers: bool = False
+    image_download_engine: ImageDownloadEngineName = THREAD_ENGINE
+    async_connections_per_host: int = 16
+    image_blob_store: bool = False
+    stream_to_archive: bool = False
+    keep_image_dir: bool = True
+    archive_format: ArchiveFormatName = ZIP_FORMAT
+    archive_workers: int = 0
+    repair_archives: bool = False
+    download_journal: bool = False
+    library_index: bool = False
+    volume_parse_lookahead: int = 0
+    concurrent_volumes: int = 1
+    prewarm_connections: bool = False
+    image_hedge_ratio: float = 0.0
+    retry_budget_ratio: float = 0.2
+    driver_pool_size: int = 1
     browser_wait_selector: str | None = None
     browser_wait_seconds: float | None = None
     browser_headless: bool | None = None
+    browser_fixed_waits: bool = False
+    browser_cookie_bridge: bool = False
+    persistent_cookies: bool = False
+    persistent_browser_profile: bool = False
     seleniumbase_wait_selector: str | None = None
     seleniumbase_wait_seconds: float = 20.0
     seleniumbase_headless: bool | None = None
@@ -108,6 +164,8 @@ def resolve_source_profile(
     )
     if runtime_source_config and runtime_source_config.browser_mode is not None:
         values['browser_mode'] = runtime_source_config.browser_mode
+    if runtime_source_config and runtime_source_config.archive_format is not None:
+        values['archive_format'] = runtime_source_config.archive_format
 
     source_session_overrides = (
         session_overrides.get(definition.module_name, {}) if session_overrides else {}
@@ -200,12 +258,43 @@ def _normalize_profile_values(values: Mapping[str, Any]) -> dict[str, Any]:
     normalized['browser_mode'] = normalize_browser_mode(normalized.get('browser_mode'))
     normalized['download_interval'] = float(normalized.get('download_interval') or 0)
     normalized['image_request_interval'] = _optional_float(normalized.get('image_request_interval'))
+    normalized['image_requests_per_second'] = _optional_float(
+        normalized.get('image_requests_per_second')
+    )
+    normalized['image_request_burst'] = max(1, int(normalized.get('image_request_burst') or 1))
     normalized['page_load_wait_seconds'] = _optional_float(normalized.get('page_load_wait_seconds'))
     normalized['scroll_wait_seconds'] = _optional_float(normalized.get('scroll_wait_seconds'))
     normalized['max_scroll_attempts'] = _optional_int(normalized.get('max_scroll_attempts'))
     normalized['image_retry_count'] = int(normalized.get('image_retry_count') or 1)
     normalized['max_download_workers'] = max(1, int(normalized.get('max_download_workers') or 5))
+    normalized['adaptive_download_workers'] = bool(normalized.get('adaptive_download_workers'))
+    normalized['image_download_engine'] = normalize_image_download_engine(
+        normalized.get('image_download_engine')
+    )
+    normalized['async_connections_per_host'] = max(
+        1, int(normalized.get('async_connections_per_host') or 16)
+    )
+    normalized['image_blob_store'] = bool(normalized.get('image_blob_store'))
+    normalized['stream_to_archive'] = bool(normalized.get('stream_to_archive'))
+    normalized['keep_image_dir'] = bool(normalized.get('keep_image_dir'))
+    normalized['archive_format'] = normalize_archive_format(normalized.get('archive_format'))
+    normalized['archive_workers'] = max(0, int(normalized.get('archive_workers') or 0))
+    normalized['repair_archives'] = bool(normalized.get('repair_archives'))
+    normalized['download_journal'] = bool(normalized.get('download_journal'))
+    normalized['library_index'] = bool(normalized.get('library_index'))
+    normalized['volume_parse_lookahead'] = max(
+        0, int(normalized.get('volume_parse_lookahead') or 0)
+    )
+    normalized['concurrent_volumes'] = max(1, int(normalized.get('concurrent_volumes') or 1))
+    normalized['prewarm_connections'] = bool(normalized.get('prewarm_connections'))
+    normalized['image_hedge_ratio'] = max(0.0, float(normalized.get('image_hedge_ratio') or 0))
+    normalized['retry_budget_ratio'] = max(0.0, float(normalized.get('retry_budget_ratio') or 0))
+    normalized['driver_pool_size'] = max(1, int(normalized.get('driver_pool_size') or 1))
     normalized['browser_wait_seconds'] = _optional_float(normalized.get('browser_wait_seconds'))
+    normalized['browser_fixed_waits'] = bool(normalized.get('browser_fixed_waits'))
+    normalized['browser_cookie_bridge'] = bool(normalized.get('browser_cookie_bridge'))
+    normalized['persistent_cookies'] = bool(normalized.get('persistent_cookies'))
+    normalized['persistent_browser_profile'] = bool(normalized.get('persistent_browser_profile'))
     normalized['seleniumbase_wait_seconds'] = float(
         normalized.get('seleniumbase_wait_seconds') or 0
     )
@@ -10,6 +10,7 @@ from rich.rule import Rule
 from rich.table import Table
 from rich.text import Text
 
+from downloader.job_queue import DownloadJob
 from downloader.models import Comic, DownloadSummary, VolumeDownloadResult
 
 # ---------------------------------------------------------------------------
@@ -28,6 +29,7 @@ MUTED = 'dim'
 
 BRAND = '动漫下载器'
 MAX_FAILURE_DETAIL_ROWS = 5
+BYTES_PER_UNIT = 1024
 MAX_URL_DISPLAY_WIDTH = 50
 
 
@@ -97,6 +99,8 @@ class TerminalPresenter:
             f'  [{ACCENT}]d[/]  <序号/URL>     全量下载动漫\n'
             f'  [{ACCENT}]v[/]  <章节> [范围]  按范围下载章节\n'
             f'  [{ACCENT}]source[/]            手动切换下载源\n'
+            f'  [{ACCENT}]index[/] rebuild     重建下载库索引\n'
+            f'  [{ACCENT}]queue[/] add/run     管理下载任务队列\n'
             f'  [{ACCENT}]help[/] / [{ACCENT}]?[/]        查看命令速查\n'
             f'  [{ACCENT}]q[/]                 退出'
         )
@@ -268,6 +272,36 @@ class TerminalPresenter:
 
         return table
 
+    # ------------------------------------------------------------------
+    # 下载队列
+    # ------------------------------------------------------------------
+    def download_jobs(self, jobs: list[DownloadJob]) -> None:
+        if not jobs:
+            self.info('下载队列为空。')
+            return
+        table = Table(
+            show_header=True,
+            header_style=f'bold {ACCENT}',
+            border_style=MUTED,
+            pad_edge=False,
+        )
+        table.add_column('#', justify='right', no_wrap=True, style=ACCENT)
+        table.add_column('状态', no_wrap=True)
+        table.add_column('URL', overflow='fold', style=MUTED)
+        table.add_column('范围', no_wrap=True)
+        table.add_column('次数', justify='right')
+        table.add_column('说明', overflow='fold')
+        for job in jobs:
+            table.add_row(
+                str(job.id),
+                JOB_STATUS_BADGES.get(job.status, job.status),
+                job.url,
+                job.vols or '全部',
+                str(job.attempts),
+                job.message or '',
+            )
+        self.print(table)
+
     # ------------------------------------------------------------------
     # 下载汇总
     # ------------------------------------------------------------------
@@ -338,12 +372,24 @@ class TerminalPresenter:
 
     @staticmethod
     def _format_download_overview(summary: DownloadSummary) -> str:
-        return (
+        overview = (
             f'下载完成：[{SUCCESS}]成功 {summary.downloaded}[/]  '
             f'[{MUTED}]跳过 {summary.skipped}[/]  '
             f'[{WARN}]失败 {summary.failed}[/]  '
             f'[{WARN}]部分 {summary.partial}[/]'
         )
+        if summary.deduplicated_bytes:
+            overview += f'  [{MUTED}]去重节省 {_format_bytes(summary.deduplicated_bytes)}[/]'
+        return overview
+
+
+def _format_bytes(size: int) -> str:
+    value = float(size)
+    for unit in ('B', 'KB', 'MB'):
+        if value < BYTES_PER_UNIT:
+            return f'{value:.0f} {unit}' if unit == 'B' else f'{value:.1f} {unit}'
+        value /= BYTES_PER_UNIT
+    return f'{value:.1f} GB'
 
 
 # 向后兼容：保持旧的 status badge 字典可见（如外部引用）。
@@ -353,3 +399,10 @@ STATUS_BADGES = {
     'partial': f'[{WARN}]△[/]',
     'failed': f'[{ERROR}]✗[/]',
 }
+
+JOB_STATUS_BADGES = {
+    'queued': f'[{MUTED}]排队中[/]',
+    'running': f'[{ACCENT}]下载中[/]',
+    'done': f'[{SUCCESS}]已完成[/]',
+    'failed': f'[{ERROR}]失败[/]',
+}
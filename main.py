@@ -22,6 +22,9 @@ USAGE = """用法:
   comic_downloader [下载路径] info <漫画URL或搜索结果序号>
   comic_downloader [下载路径] download <漫画URL或搜索结果序号>
   comic_downloader [下载路径] download_vols <漫画URL> <章节序号> [起始序号] [截止序号]
+  comic_downloader [下载路径] index rebuild
+  comic_downloader [下载路径] queue add <漫画URL> [章节序号] [起始序号] [截止序号]
+  comic_downloader [下载路径] queue run|list|retry
 
 选项:
   -d, --debug     输出调试日志到终端
@@ -119,7 +122,7 @@ def _pop_config_path(args: list[str]) -> str | None:
 
 
 def _parse_command(args: list[str]) -> tuple[str, str | None, list[str]]:
-    subcommands = {'search', 'info', 'download', 'download_vols'}
+    subcommands = {'search', 'info', 'download', 'download_vols', 'index', 'queue'}
     subcommand = None
     subcommand_args = []
     output_path = os.getcwd()
@@ -152,6 +155,10 @@ def _run_command(shell: Shell, subcommand: str | None, subcommand_args: list[str
         shell.do_d(' '.join(subcommand_args))
     elif subcommand == 'download_vols':
         _run_download_vols(shell, subcommand_args)
+    elif subcommand == 'index':
+        shell.do_index(' '.join(subcommand_args))
+    elif subcommand == 'queue':
+        shell.do_queue(' '.join(subcommand_args))
     else:
         shell.cmdloop()
 
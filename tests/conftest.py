@@ -6,6 +6,8 @@ from uuid import uuid4
 
 import pytest
 
+from downloader.browser import persistence
+
 
 @pytest.fixture
 def tmp_path():
@@ -16,3 +18,14 @@ def tmp_path():
         yield path
     finally:
         shutil.rmtree(path, ignore_errors=True)
+
+
+@pytest.fixture(autouse=True)
+def isolated_app_cache(monkeypatch):
+    """Keep saved cookies and browser profiles out of the real user cache directory."""
+    path = Path.cwd() / 'downloaded_files' / 'test-cache' / uuid4().hex
+    monkeypatch.setattr(persistence, 'app_cache_dir', lambda: path)
+    try:
+        yield path
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
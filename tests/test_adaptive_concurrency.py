@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+import requests
+
+from downloader.comic import ComicSource
+from downloader.download.concurrency import AdaptiveConcurrencyLimiter
+from downloader.models import ImageDownloadCancelledError
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _succeed(limiter: AdaptiveConcurrencyLimiter, count: int, latency: float = 0.1) -> None:
+    for _ in range(count):
+        assert limiter.acquire()
+        limiter.release(latency)
+
+
+def test_limit_grows_additively_up_to_ceiling():
+    limiter = AdaptiveConcurrencyLimiter(6, clock=FakeClock())
+    assert limiter.limit == 3
+
+    _succeed(limiter, 3)
+    assert limiter.limit == 3
+    _succeed(limiter, 1)
+    assert limiter.limit == 4
+
+    _succeed(limiter, 50)
+    assert limiter.limit == 6
+    assert limiter.decisions[-1].reason == '响应稳定'
+
+
+def test_congestion_status_halves_limit_once_per_cooldown():
+    clock = FakeClock()
+    limiter = AdaptiveConcurrencyLimiter(8, initial=8, clock=clock)
+
+    decision = limiter.release(status_code=429)
+    assert decision is not None
+    assert (decision.previous, decision.limit, decision.reason) == (8, 4, 'HTTP 429')
+
+    assert limiter.release(status_code=503) is None
+    assert limiter.limit == 4
+
+    clock.now += 2
+    limiter.release(status_code=503)
+    assert limiter.limit == 2
+
+
+def test_limit_never_drops_below_floor():
+    clock = FakeClock()
+    limiter = AdaptiveConcurrencyLimiter(4, initial=1, clock=clock)
+
+    assert limiter.release(status_code=429) is None
+    assert limiter.limit == 1
+
+
+def test_latency_spike_decreases_limit():
+    limiter = AdaptiveConcurrencyLimiter(8, initial=8, clock=FakeClock())
+    _succeed(limiter, 5, latency=0.2)
+
+    decision = limiter.release(1.0)
+
+    assert decision is not None
+    assert decision.limit == 4
+    assert decision.reason.startswith('延迟突增')
+
+
+def test_acquire_gives_up_when_cancelled():
+    limiter = AdaptiveConcurrencyLimiter(1)
+    assert limiter.acquire()
+    cancel_event = threading.Event()
+    cancel_event.set()
+
+    assert limiter.acquire(cancel_event) is False
+    assert limiter.in_flight == 1
+
+
+def test_acquire_waits_for_a_released_slot():
+    limiter = AdaptiveConcurrencyLimiter(1)
+    assert limiter.acquire()
+    acquired = threading.Event()
+
+    def worker():
+        limiter.acquire()
+        acquired.set()
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    assert acquired.wait(0.2) is False
+    limiter.release(0.1)
+    assert acquired.wait(1) is True
+    thread.join()
+
+
+class AdaptiveSource(ComicSource):
+    name = 'adaptive-source'
+    base_url = 'https://example.test'
+    max_download_workers = 4
+    adaptive_download_workers = True
+
+    def search(self, keyword):
+        return []
+
+    def info(self, url):
+        return None
+
+    def __parse_imgs__(self, url):
+        return []
+
+
+class ThrottledResponse:
+    status_code = 429
+
+
+def test_throttled_image_request_shrinks_scheduler_limit(tmp_path, monkeypatch):
+    source = AdaptiveSource(str(tmp_path), None, None)
+
+    def throttled(full_img_url, context, partial=None):
+        raise requests.exceptions.HTTPError(response=ThrottledResponse())
+
+    monkeypatch.setattr(source, '_request_image', throttled)
+
+    with source._create_image_scheduler(4) as scheduler:
+        context = scheduler.create_context(str(tmp_path), False)
+        with pytest.raises(requests.exceptions.HTTPError):
+            source._fetch_image('https://example.test/1.jpg', context, 'a.tmp', 'a.jpg')
+        assert scheduler.concurrency is not None
+        assert scheduler.concurrency.limit == 1
+        assert scheduler.concurrency.in_flight == 0
+
+        context.cancel_event.set()
+        scheduler.concurrency.acquire()
+        with pytest.raises(ImageDownloadCancelledError):
+            source._fetch_image('https://example.test/2.jpg', context, 'b.tmp', 'b.jpg')
+
+
+def test_image_adapter_leaves_retries_to_the_source_policy(tmp_path):
+    source = AdaptiveSource(str(tmp_path), None, None)
+    retry = source._create_image_http_session().get_adapter('https://').max_retries
+    assert retry.total == 0
+    assert not retry.status_forcelist
+
+
+def test_adaptive_workers_are_off_by_default(tmp_path):
+    source = AdaptiveSource(str(tmp_path), None, None)
+    source.adaptive_download_workers = ComicSource.adaptive_download_workers
+
+    assert source._create_image_scheduler(2).concurrency is None
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import os
+import threading
+import zipfile
+from typing import Any, cast
+
+import pytest
+
+from downloader.comic import ComicSource
+from downloader.download.finalizer import ArchiveFinalizer
+from downloader.download.progress import NoopDownloadProgress
+from downloader.models import ComicVolume
+
+
+class BackgroundArchiveSource(ComicSource):
+    name = 'background-archive-source'
+    base_url = 'https://example.test'
+    volume_parse_lookahead = 0
+    archive_workers = 1
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.downloading: dict[str, threading.Event] = {
+            url: threading.Event() for url in ('v1', 'v2')
+        }
+        self.archive_threads: list[str] = []
+
+    def create_download_progress(self):
+        return NoopDownloadProgress()
+
+    def search(self, keyword):
+        return []
+
+    def info(self, url):
+        return None
+
+    def __parse_imgs__(self, url):
+        return [f'{url}-0001.jpg']
+
+    def __download_vol_images__(self, path, vol_name, source_url, imgs, progress=None):
+        self.downloading[source_url].set()
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, '0001.jpg'), 'wb') as f:
+            f.write(b'page')
+        return self._finalize_volume_download(path, vol_name, source_url, len(imgs), [])
+
+    def _archive_volume(self, path, vol_name, source_url, expected_count, downloaded_count):
+        self.archive_threads.append(threading.current_thread().name)
+        if vol_name == 'v1':
+            # 第一卷的压缩必须等到第二卷开始下载才能完成
+            assert self.downloading['v2'].wait(1)
+        return super()._archive_volume(path, vol_name, source_url, expected_count, downloaded_count)
+
+
+def _volumes():
+    return [ComicVolume(name, name) for name in ('v1', 'v2')]
+
+
+def test_next_volume_downloads_while_previous_volume_is_archived(tmp_path):
+    source = BackgroundArchiveSource(str(tmp_path), cast(Any, object()), None)
+
+    summary = source.download_vols('comic', 'book', _volumes())
+
+    assert [result.status for result in summary.volume_results] == ['downloaded', 'downloaded']
+    assert [result.archive_path for result in summary.volume_results] == [
+        str(tmp_path / 'comic' / 'book' / 'v1.zip'),
+        str(tmp_path / 'comic' / 'book' / 'v2.zip'),
+    ]
+    assert all(result.finalizing is None for result in summary.volume_results)
+    assert all(name.startswith('archive-finalizer') for name in source.archive_threads)
+    with zipfile.ZipFile(summary.volume_results[0].archive_path) as archive:
+        assert archive.namelist() == ['0001.jpg']
+
+
+def test_default_archive_workers_archive_inline(tmp_path):
+    source = BackgroundArchiveSource(str(tmp_path), cast(Any, object()), None)
+    source.archive_workers = ComicSource.archive_workers
+    source.downloading['v2'].set()
+
+    summary = source.download_vols('comic', 'book', _volumes())
+
+    assert [result.archive_path is not None for result in summary.volume_results] == [True, True]
+    assert set(source.archive_threads) == {threading.current_thread().name}
+
+
+def test_finalizer_blocks_submissions_beyond_its_queue():
+    release = threading.Event()
+    finalizer = ArchiveFinalizer(1)
+    futures = [finalizer.submit(release.wait, 1) for _ in range(3)]
+    blocked = threading.Thread(target=finalizer.submit, args=(release.wait, 1))
+
+    blocked.start()
+    blocked.join(0.1)
+    assert blocked.is_alive()
+
+    release.set()
+    blocked.join(1)
+    finalizer.close()
+    assert all(future.result() for future in futures)
+
+
+def test_interrupted_finalizer_cancels_queued_archives():
+    release = threading.Event()
+    with pytest.raises(KeyboardInterrupt), ArchiveFinalizer(1) as finalizer:
+        running = finalizer.submit(release.wait, 1)
+        queued = finalizer.submit(release.wait, 1)
+        threading.Timer(0.05, release.set).start()
+        raise KeyboardInterrupt
+
+    assert running.result() is True
+    assert queued.cancelled()
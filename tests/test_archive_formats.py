@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import tarfile
+import zipfile
+from typing import Any, ClassVar, cast
+
+import pytest
+
+from downloader.comic import ComicSource
+from downloader.download.archive_formats import archive_extensions_for_lookup
+from downloader.runtime_config import RuntimeConfig, SourceRuntimeConfig
+from downloader.sources import SOURCE_DEFINITIONS
+from downloader.sources.adapters.morui import MoruiComic
+from downloader.sources.profiles import _normalize_profile_values, resolve_source_profile
+
+
+class NoHttp:
+    headers: ClassVar[dict[str, str]] = {}
+
+
+class ArchivingSource(ComicSource):
+    name = 'archiving-source'
+    base_url = 'https://example.test'
+
+    def search(self, keyword):
+        return []
+
+    def info(self, url):
+        return None
+
+    def __parse_imgs__(self, url):
+        return []
+
+
+def _source(tmp_path, archive_format: str, **attrs: Any) -> ArchivingSource:
+    source = ArchivingSource(str(tmp_path), cast(Any, NoHttp()), None)
+    source.archive_format = cast(Any, archive_format)
+    for key, value in attrs.items():
+        setattr(source, key, value)
+    return source
+
+
+def _image_dir(tmp_path, count: int = 3):
+    image_dir = tmp_path / 'chapter'
+    image_dir.mkdir()
+    for index in range(1, count + 1):
+        (image_dir / f'{index:04d}.jpg').write_bytes(b'page-%d' % index)
+    (image_dir / '0004.jpg.tmp').write_bytes(b'partial')
+    return image_dir
+
+
+def test_cbz_archive_stores_images_without_compression(tmp_path):
+    image_dir = _image_dir(tmp_path)
+    source = _source(tmp_path, 'cbz')
+
+    result = source._finalize_existing_download_dir(
+        str(image_dir), 'chapter', 'https://example.test/chapter', 3, []
+    )
+
+    assert result.status == 'downloaded'
+    assert result.archive_path == str(tmp_path / 'chapter.cbz')
+    with zipfile.ZipFile(result.archive_path) as archive:
+        assert archive.namelist() == ['0001.jpg', '0002.jpg', '0003.jpg']
+        assert {info.compress_type for info in archive.infolist()} == {zipfile.ZIP_STORED}
+    assert not list(tmp_path.glob('*.part'))
+
+
+def test_tar_archive_contains_images_and_removes_dir_when_requested(tmp_path):
+    image_dir = _image_dir(tmp_path)
+    source = _source(tmp_path, 'tar', keep_image_dir=False)
+
+    result = source._finalize_existing_download_dir(
+        str(image_dir), 'chapter', 'https://example.test/chapter', 3, []
+    )
+
+    assert result.archive_path == str(tmp_path / 'chapter.tar')
+    with tarfile.open(result.archive_path) as archive:
+        assert archive.getnames() == ['0001.jpg', '0002.jpg', '0003.jpg']
+    assert not image_dir.exists()
+
+
+def test_none_format_keeps_image_dir_without_archive(tmp_path):
+    image_dir = _image_dir(tmp_path)
+    source = _source(tmp_path, 'none', keep_image_dir=False)
+
+    result = source._finalize_existing_download_dir(
+        str(image_dir), 'chapter', 'https://example.test/chapter', 3, []
+    )
+
+    assert result.status == 'downloaded'
+    assert result.archive_path is None
+    assert (image_dir / '0003.jpg').exists()
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['chapter']
+
+
+def test_image_count_mismatch_still_reports_partial(tmp_path):
+    image_dir = _image_dir(tmp_path, count=2)
+    source = _source(tmp_path, 'cbz')
+
+    result = source._finalize_existing_download_dir(
+        str(image_dir), 'chapter', 'https://example.test/chapter', 3, []
+    )
+
+    assert result.status == 'partial'
+    assert result.archive_path is None
+    assert not (tmp_path / 'chapter.cbz').exists()
+
+
+def test_existing_zip_archive_is_detected_for_other_formats(tmp_path):
+    (tmp_path / '001 chapter.zip').write_bytes(b'archive')
+    source = _source(tmp_path, 'cbz', overwrite=False)
+
+    assert source._find_existing_archive(str(tmp_path), '1 chapter') == str(
+        tmp_path / '001 chapter.zip'
+    )
+
+
+def test_existing_archive_lookup_probes_configured_format_and_zip_only():
+    assert archive_extensions_for_lookup('zip') == ['.zip']
+    assert archive_extensions_for_lookup('cbz') == ['.cbz', '.zip']
+    assert archive_extensions_for_lookup('none') == ['.zip']
+
+
+def test_runtime_archive_format_override_resolves_profile():
+    definition = next(item for item in SOURCE_DEFINITIONS if item.module_name == 'morui')
+    runtime_config = RuntimeConfig(sources={'morui': SourceRuntimeConfig(archive_format='cbz')})
+
+    profile = resolve_source_profile(definition, MoruiComic, runtime_config=runtime_config)
+
+    assert profile.archive_format == 'cbz'
+    assert MoruiComic.archive_format == 'zip'
+
+
+def test_unknown_archive_format_is_rejected():
+    with pytest.raises(ValueError, match='archive format'):
+        _normalize_profile_values({'archive_format': 'rar'})
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any, ClassVar, cast
+
+import httpx
+import pytest
+
+from downloader.comic import ComicSource
+from downloader.download.async_images import AsyncImageDownloader
+from downloader.download.retry import RetryPolicy
+from downloader.models import ImageDownloadCancelledError, ImageDownloadContext
+from downloader.sources.profiles import _normalize_profile_values
+
+
+class SourceHttp:
+    headers: ClassVar[dict[str, str]] = {'user-agent': 'test-agent'}
+
+
+class AsyncEngineSource(ComicSource):
+    name = 'async-engine-source'
+    base_url = 'https://example.test'
+    image_download_engine = 'async'
+    async_connections_per_host = 2
+
+    def __init__(self, *args, handler=None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.handler = handler
+
+    def search(self, keyword):
+        return []
+
+    def info(self, url):
+        return None
+
+    def __parse_imgs__(self, url):
+        return []
+
+    def _create_async_image_client(self):
+        return httpx.AsyncClient(
+            headers=dict(self.http.headers), transport=httpx.MockTransport(self.handler)
+        )
+
+
+def test_async_engine_downloads_images_with_per_host_limit(tmp_path):
+    in_flight = 0
+    peak = 0
+    threads: set[str] = set()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        threads.add(threading.current_thread().name)
+        assert request.headers['referer'] == 'https://example.test'
+        assert request.headers['user-agent'] == 'test-agent'
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, content=request.url.path.encode())
+
+    source = AsyncEngineSource(str(tmp_path), cast(Any, SourceHttp()), None, handler=handler)
+    image_dir = tmp_path / 'chapter'
+    imgs = [f'https://img.example.test/{index}.jpg' for index in range(6)]
+
+    result = source.__download_vol_images__(
+        str(image_dir), 'chapter', 'https://example.test/chapter', imgs
+    )
+
+    assert result.status == 'downloaded'
+    assert result.downloaded_count == 6
+    assert peak == 2
+    assert threads == {threading.current_thread().name}
+
+
+def test_async_engine_reports_failed_images_after_retries(tmp_path):
+    requested: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requested.append(request.url.path)
+        if request.url.path == '/busy.jpg':
+            return httpx.Response(503)
+        return httpx.Response(200, content=b'image')
+
+    source = AsyncEngineSource(str(tmp_path), cast(Any, SourceHttp()), None, handler=handler)
+    context = ImageDownloadContext(path=str(tmp_path), use_base_img_url=False)
+    downloader = AsyncImageDownloader(source, context, 4)
+
+    failures = downloader.run(
+        ['https://img.example.test/ok.jpg', 'https://img.example.test/busy.jpg']
+    )
+
+    assert [failure.index for failure in failures] == [2]
+    assert requested.count('/busy.jpg') == 2
+    assert (tmp_path / '0001.jpg').read_bytes() == b'image'
+    assert not list(tmp_path.glob('*.tmp'))
+
+
+def test_async_engine_cancels_pending_images_and_leaves_no_tmp_files(tmp_path):
+    context = ImageDownloadContext(path=str(tmp_path), use_base_img_url=False)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        context.cancel_event.set()
+        await asyncio.sleep(5)
+        return httpx.Response(200, content=b'image')
+
+    source = AsyncEngineSource(str(tmp_path), cast(Any, SourceHttp()), None, handler=handler)
+    downloader = AsyncImageDownloader(source, context, 4)
+
+    with pytest.raises(ImageDownloadCancelledError):
+        downloader.run([f'https://img.example.test/{index}.jpg' for index in range(3)])
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_unknown_image_download_engine_is_rejected():
+    with pytest.raises(ValueError, match='image download engine'):
+        _normalize_profile_values({'image_download_engine': 'fibers'})
+
+
+def test_async_engine_resumes_partial_image_with_range(tmp_path):
+    (tmp_path / '0001.jpg.tmp').write_bytes(b'abcd')
+    (tmp_path / '0001.jpg.tmp.meta').write_text(
+        '{"etag": "\\"v1\\"", "last_modified": null, "content_length": 8}', encoding='utf-8'
+    )
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.headers['range'] == 'bytes=4-'
+        return httpx.Response(206, content=b'efgh', headers={'Content-Range': 'bytes 4-7/8'})
+
+    source = AsyncEngineSource(str(tmp_path), cast(Any, SourceHttp()), None, handler=handler)
+    context = ImageDownloadContext(path=str(tmp_path), use_base_img_url=False)
+
+    assert AsyncImageDownloader(source, context, 1).run(['https://img.example.test/1.jpg']) == []
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['0001.jpg']
+    assert (tmp_path / '0001.jpg').read_bytes() == b'abcdefgh'
+
+
+def test_async_engine_refetches_from_zero_after_416(tmp_path):
+    (tmp_path / '0001.jpg.tmp').write_bytes(b'abcd')
+    (tmp_path / '0001.jpg.tmp.meta').write_text(
+        '{"etag": "\\"v1\\"", "last_modified": null, "content_length": 8}', encoding='utf-8'
+    )
+    ranges: list[str | None] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        ranges.append(request.headers.get('range'))
+        if 'range' in request.headers:
+            return httpx.Response(416)
+        return httpx.Response(200, content=b'new-image')
+
+    source = AsyncEngineSource(str(tmp_path), cast(Any, SourceHttp()), None, handler=handler)
+    context = ImageDownloadContext(path=str(tmp_path), use_base_img_url=False)
+
+    assert AsyncImageDownloader(source, context, 1).run(['https://img.example.test/1.jpg']) == []
+    assert ranges == ['bytes=4-', None]
+    assert (tmp_path / '0001.jpg').read_bytes() == b'new-image'
+
+
+def test_async_engine_retries_mismatched_content_range_from_zero(tmp_path):
+    (tmp_path / '0001.jpg.tmp').write_bytes(b'abcd')
+    (tmp_path / '0001.jpg.tmp.meta').write_text(
+        '{"etag": "\\"v1\\"", "last_modified": null, "content_length": 8}', encoding='utf-8'
+    )
+    ranges: list[str | None] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        ranges.append(request.headers.get('range'))
+        if request.url.path == '/2.jpg':
+            return httpx.Response(200, content=b'other')
+        if 'range' in request.headers:
+            return httpx.Response(206, content=b'cdefgh', headers={'Content-Range': 'bytes 2-7/8'})
+        return httpx.Response(200, content=b'abcdefgh')
+
+    source = AsyncEngineSource(str(tmp_path), cast(Any, SourceHttp()), None, handler=handler)
+    source.retry_policy = RetryPolicy(rand=lambda: 0.0)
+    context = ImageDownloadContext(path=str(tmp_path), use_base_img_url=False)
+    imgs = ['https://img.example.test/1.jpg', 'https://img.example.test/2.jpg']
+
+    assert AsyncImageDownloader(source, context, 1).run(imgs) == []
+    assert ranges.count('bytes=4-') == 1
+    assert (tmp_path / '0001.jpg').read_bytes() == b'abcdefgh'
+    assert (tmp_path / '0002.jpg').read_bytes() == b'other'
+
+
+def test_async_engine_writes_each_chunk_as_it_arrives(tmp_path):
+    chunk_size = 64 * 1024
+    tmp_file = tmp_path / '0001.jpg.tmp'
+    written_before_second_chunk: list[int] = []
+
+    async def body():
+        yield b'a' * chunk_size
+        written_before_second_chunk.append(tmp_file.stat().st_size)
+        yield b'b' * chunk_size
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=body())
+
+    source = AsyncEngineSource(str(tmp_path), cast(Any, SourceHttp()), None, handler=handler)
+    context = ImageDownloadContext(path=str(tmp_path), use_base_img_url=False)
+
+    assert AsyncImageDownloader(source, context, 1).run(['https://img.example.test/1.jpg']) == []
+    assert written_before_second_chunk == [chunk_size]
+    assert (tmp_path / '0001.jpg').read_bytes() == b'a' * chunk_size + b'b' * chunk_size
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import datetime
+import threading
+
+import pytest
+
+from downloader.download.bandwidth import (
+    BandwidthGovernor,
+    BandwidthSchedule,
+    parse_bandwidth_rate,
+)
+from downloader.runtime_config import RuntimeConfig
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _at(hour: int, minute: int = 0):
+    return lambda: datetime.datetime(2024, 1, 1, hour, minute)
+
+
+@pytest.mark.parametrize(
+    ('value', 'expected'),
+    [(None, None), (0, None), (2048, 2048.0), ('512K', 512 * 1024.0), ('1.5MB/s', 1.5 * 1024**2)],
+)
+def test_parse_bandwidth_rate(value, expected):
+    assert parse_bandwidth_rate(value) == expected
+
+
+def test_parse_bandwidth_rate_rejects_garbage():
+    with pytest.raises(ValueError):
+        parse_bandwidth_rate('fast')
+
+
+def test_governor_spaces_concurrent_workers_at_the_cap():
+    clock = FakeClock()
+    governor = BandwidthGovernor(clock=clock)
+    governor.configure(limit=1000)
+    delays: list[float] = []
+    lock = threading.Lock()
+
+    def worker() -> None:
+        for _ in range(5):
+            delay = governor.reserve(100)
+            with lock:
+                delays.append(delay)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # 500 字节的突发额度之后，2000 字节需要 1.5 秒才能发完
+    assert max(delays) == pytest.approx(1.5)
+    assert sorted(delays)[5:] == pytest.approx([0.1 * step for step in range(1, 16)])
+
+
+def test_schedule_picks_limit_by_time_of_day_and_wraps_midnight():
+    night = BandwidthSchedule.parse('23:00-07:00', None)
+    day = BandwidthSchedule.parse('09:00-18:00', '1M')
+    governor = BandwidthGovernor(wall_clock=_at(12))
+    governor.configure(limit=4096, schedules=(night, day))
+
+    assert governor.current_limit() == 1024**2
+    governor._wall_clock = _at(2)
+    assert governor.current_limit() is None
+    assert governor.reserve(10**9) == 0.0
+    governor._wall_clock = _at(20)
+    assert governor.current_limit() == 4096
+
+
+def test_cancelled_consume_refunds_its_bytes():
+    clock = FakeClock()
+    governor = BandwidthGovernor(clock=clock)
+    governor.configure(limit=100)
+    governor.reserve(50)
+    cancelled = threading.Event()
+    cancelled.set()
+
+    assert governor.consume(100, cancelled) is False
+    assert governor.reserve(50) == pytest.approx(0.5)
+
+
+def test_runtime_config_parses_bandwidth_section():
+    config = RuntimeConfig.from_mapping(
+        {'bandwidth': {'limit': '2M', 'schedules': [{'time': '08:00-24:00', 'limit': '256K'}]}}
+    )
+
+    assert config.bandwidth_limit == 2 * 1024**2
+    assert config.bandwidth_schedules == (
+        BandwidthSchedule(datetime.time(8), datetime.time(0), 256 * 1024.0),
+    )
+    assert RuntimeConfig.from_mapping({'bandwidth': '1M'}).bandwidth_limit == 1024**2
+    with pytest.raises(ValueError):
+        RuntimeConfig.from_mapping({'bandwidth': {'schedules': [{'time': '8-9'}]}})
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import os
+from typing import Any
+
+import requests
+
+from downloader.browser import manager as manager_module, persistence
+from downloader.browser.manager import DriverManager
+from downloader.browser.persistence import (
+    CookieStore,
+    FileLock,
+    acquire_browser_profile,
+    prune_browser_profiles,
+)
+from downloader.comic import ComicSource
+from downloader.shell import Context
+
+NOW = 1_000_000.0
+
+
+class QuietPresenter:
+    def print(self, message: Any = '', style: str | None = None) -> None:
+        return None
+
+
+class PersistentProfileSource(ComicSource):
+    browser_mode = 'seleniumbase'
+    persistent_browser_profile = True
+
+    def search(self, keyword):
+        return []
+
+    def info(self, url):
+        return None
+
+    def __parse_imgs__(self, url):
+        return []
+
+
+def _jar() -> requests.cookies.RequestsCookieJar:
+    jar = requests.cookies.RequestsCookieJar()
+    jar.set('cf_clearance', 'ok', domain='.example.test', path='/', expires=int(NOW) + 3600)
+    jar.set('session', 's1', domain='www.example.test', path='/')
+    jar.set('stale', 'x', domain='www.example.test', path='/', expires=int(NOW) - 1)
+    jar.set('tracker', 't', domain='ads.other.test', path='/', expires=int(NOW) + 3600)
+    return jar
+
+
+def test_cookie_store_round_trips_unexpired_cookies_of_the_source_hosts(tmp_path):
+    path = tmp_path / 'cookies.sqlite3'
+    with CookieStore(path, clock=lambda: NOW) as store:
+        assert store.save('site', _jar(), ['www.example.test']) == 2
+
+    restored = requests.cookies.RequestsCookieJar()
+    with CookieStore(path, clock=lambda: NOW) as store:
+        assert store.load('site', restored) == 2
+        assert store.load('other-site', requests.cookies.RequestsCookieJar()) == 0
+
+    cookies = {cookie.name: cookie for cookie in restored}
+    assert cookies['cf_clearance'].expires == int(NOW) + 3600
+    assert cookies['session'].expires is None
+
+    later = NOW + persistence.SESSION_COOKIE_MAX_AGE_SECONDS + 1
+    with CookieStore(path, clock=lambda: later) as store:
+        assert store.load('site', requests.cookies.RequestsCookieJar()) == 0
+
+
+def test_cookie_stores_of_two_processes_merge(tmp_path):
+    path = tmp_path / 'cookies.sqlite3'
+    first = CookieStore(path, clock=lambda: NOW)
+    second = CookieStore(path, clock=lambda: NOW)
+    jar = requests.cookies.RequestsCookieJar()
+    jar.set('other', 'v', domain='www.example.test', path='/')
+
+    first.save('site', _jar(), ['www.example.test'])
+    second.save('site', jar, ['www.example.test'])
+
+    restored = requests.cookies.RequestsCookieJar()
+    first.load('site', restored)
+    assert {cookie.name for cookie in restored} == {'cf_clearance', 'session', 'other'}
+    first.close()
+    second.close()
+
+
+class CookieSource(PersistentProfileSource):
+    name = 'cookie-source'
+    base_url = 'https://www.example.test'
+
+
+def test_context_keeps_cookies_only_for_sources_that_opt_in(isolated_app_cache, tmp_path):
+    context = Context(QuietPresenter())
+    default_source = CookieSource(str(tmp_path), requests.Session(), None)
+    default_source.http.cookies.set('cf_clearance', 'ok', domain='www.example.test', path='/')
+
+    context.restore_cookies(default_source)
+    context.destroy()
+    assert not (isolated_app_cache / persistence.COOKIE_STORE_FILE_NAME).exists()
+
+    opted_in = CookieSource(str(tmp_path), requests.Session(), None)
+    opted_in.persistent_cookies = True
+    opted_in.http.cookies.set('cf_clearance', 'ok', domain='www.example.test', path='/')
+    context = Context(QuietPresenter())
+    context.restore_cookies(opted_in)
+    context.destroy()
+
+    restored = CookieSource(str(tmp_path), requests.Session(), None)
+    restored.persistent_cookies = True
+    context = Context(QuietPresenter())
+    context.restore_cookies(restored, remember=False)
+    assert restored.http.cookies.get('cf_clearance') == 'ok'
+    context.destroy()
+
+
+def test_profile_slots_are_locked_per_browser_and_pruned_when_stale(tmp_path):
+    first = acquire_browser_profile('seleniumbase-headless', tmp_path)
+    second = acquire_browser_profile('seleniumbase-headless', tmp_path)
+
+    assert first is not None
+    assert second is not None
+    assert first.path != second.path
+    assert not FileLock(tmp_path / 'seleniumbase-headless-0.lock').acquire()
+
+    second.release()
+    last_used = os.path.getmtime(tmp_path / 'seleniumbase-headless-1.lock')
+    os.utime(tmp_path / 'seleniumbase-headless-0.lock', (last_used, last_used))
+
+    assert prune_browser_profiles(tmp_path, clock=lambda: last_used + 1) == 0
+    stale = last_used + persistence.BROWSER_PROFILE_MAX_AGE_SECONDS + 1
+    assert prune_browser_profiles(tmp_path, clock=lambda: stale) == 1
+    assert not second.path.exists()
+    assert first.path.exists()
+    first.release()
+
+
+def test_manager_passes_the_profile_dir_and_releases_it_on_destroy(monkeypatch, tmp_path):
+    created = []
+
+    class FakeSeleniumBaseDriver:
+        def __init__(self, **kwargs) -> None:
+            self.kwargs = kwargs
+            created.append(self)
+
+        def quit(self) -> None:
+            return None
+
+    monkeypatch.setattr(manager_module, 'SeleniumBaseDriver', FakeSeleniumBaseDriver)
+    monkeypatch.setattr(
+        manager_module,
+        'acquire_browser_profile',
+        lambda name: acquire_browser_profile(name, tmp_path),
+    )
+    manager = DriverManager(QuietPresenter())
+
+    assert manager.ensure_driver(PersistentProfileSource)
+    user_data_dir = created[0].kwargs['user_data_dir']
+    assert user_data_dir == str(tmp_path / 'seleniumbase-headless-0')
+
+    manager.destroy()
+    assert FileLock(tmp_path / 'seleniumbase-headless-0.lock').acquire()
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, cast
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from downloader.comic import ComicSource
+from downloader.download.connections import (
+    ConnectionPrewarmer,
+    DnsCache,
+    DnsCachingHTTPAdapter,
+    image_origins,
+)
+
+
+class ImageHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Length', '4')
+        self.end_headers()
+        self.wfile.write(b'page')
+
+    def log_message(self, format, *args):
+        return
+
+
+class CountingServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(('127.0.0.1', 0), ImageHandler)
+        self.accepted = 0
+        self.first_accept = threading.Event()
+
+    def get_request(self):
+        request = super().get_request()
+        self.accepted += 1
+        self.first_accept.set()
+        return request
+
+
+class PrewarmSource(ComicSource):
+    name = 'prewarm-source'
+    base_url = 'https://example.test'
+
+    def search(self, keyword):
+        return []
+
+    def info(self, url):
+        return None
+
+    def __parse_imgs__(self, url):
+        return []
+
+
+def test_dns_cache_is_used_only_by_the_image_adapter():
+    server = CountingServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    port = server.server_address[1]
+    calls = []
+
+    def resolver(host, port, *args, **kwargs):
+        calls.append(host)
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, '', ('127.0.0.1', port))]
+
+    original = socket.getaddrinfo
+    session = requests.Session()
+    session.mount('http://', DnsCachingHTTPAdapter(DnsCache(resolver)))
+    try:
+        for index in (1, 2):
+            response = session.get(
+                f'http://img.test:{port}/{index}.jpg', headers={'Connection': 'close'}, timeout=5
+            )
+            assert response.content == b'page'
+        assert socket.getaddrinfo is original
+    finally:
+        session.close()
+        server.shutdown()
+        server.server_close()
+
+    assert server.accepted == 2
+    assert calls == ['img.test']
+
+
+def test_dns_cache_entries_expire_after_the_ttl():
+    calls = []
+    now = [0.0]
+
+    def resolver(host, port, *args, **kwargs):
+        calls.append(host)
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, '', (f'10.0.0.{len(calls)}', port))]
+
+    cache = DnsCache(resolver, ttl=30, clock=lambda: now[0])
+    assert cache.resolve('img.test', 443) == cache.resolve('img.test', 443)
+    now[0] = 31
+
+    assert cache.resolve('img.test', 443)[0][4] == ('10.0.0.2', 443)
+    assert calls == ['img.test', 'img.test']
+
+
+def test_image_origins_groups_urls_by_host():
+    origins = image_origins(
+        ['https://a.test/1.jpg', 'https://a.test/2.jpg', 'http://b.test/1.jpg', '/relative.jpg']
+    )
+
+    assert origins == {'https://a.test/': 2, 'http://b.test/': 1}
+
+
+def test_prewarmed_connection_is_reused_by_the_first_request():
+    server = CountingServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    session = requests.Session()
+    session.mount('http://', HTTPAdapter(pool_maxsize=2))
+    url = f'http://127.0.0.1:{server.server_address[1]}/0001.jpg'
+    try:
+        prewarmer = ConnectionPrewarmer(lambda fn, *args: fn(*args), lambda: session)
+
+        assert prewarmer.prewarm([url], max_connections=2) == [True]
+        assert prewarmer.prewarm([url], max_connections=2) == []
+        # 握手在内核里完成，服务器线程稍后才 accept
+        assert server.first_accept.wait(5)
+        assert server.accepted == 1
+
+        assert session.get(url, timeout=5).content == b'page'
+        assert server.accepted == 1
+    finally:
+        session.close()
+        server.shutdown()
+        server.server_close()
+
+
+def test_prewarm_is_off_by_default(tmp_path):
+    source = PrewarmSource(str(tmp_path), cast(Any, None), None)
+
+    with source.image_download_run():
+        assert source.connection_prewarmer is None
+        assert not isinstance(source.image_http_adapter, DnsCachingHTTPAdapter)
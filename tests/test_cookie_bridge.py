@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import requests
+
+from downloader.browser import drivers as browser_drivers
+from downloader.browser.cookie_bridge import bridge_browser_session
+from downloader.browser.modes import REQUESTS_MODE, SELENIUMBASE_MODE
+from downloader.browser.page_loading import PageLoadAdapters, PageLoader, PageLoadRequest
+
+PAGE = '<html><body><h1>{}</h1></body></html>'
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, text: str = '') -> None:
+        self.status_code = status_code
+        self.text = text
+        self.encoding = None
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(response=self)
+
+
+class SessionHttp:
+    """Real cookie jar and headers, scripted responses."""
+
+    def __init__(self, *responses: FakeResponse) -> None:
+        self.cookies = requests.cookies.RequestsCookieJar()
+        self.headers: dict[str, str] = {}
+        self.responses = list(responses)
+        self.get_urls: list[str] = []
+
+    def get(self, url, **kwargs):
+        self.get_urls.append(url)
+        return self.responses.pop(0)
+
+
+class FakeCdp:
+    def get_page_source(self):
+        return PAGE.format('Browser')
+
+
+class FakeBrowser:
+    def __init__(self) -> None:
+        self.cdp = FakeCdp()
+        self.activated_urls: list[str] = []
+
+    def activate_cdp_mode(self, url: str) -> None:
+        self.activated_urls.append(url)
+
+    def get_cookies(self):
+        return [
+            {'name': 'cf_clearance', 'value': 'ok', 'domain': 'example.test', 'expires': 4e9},
+            {'name': 'session', 'value': 's1', 'domain': 'example.test', 'expires': -1},
+        ]
+
+    def get_user_agent(self) -> str:
+        return 'BrowserUA/1.0'
+
+
+def _request(path: str) -> PageLoadRequest:
+    return PageLoadRequest(
+        url=f'https://example.test/{path}',
+        base_url='https://example.test',
+        browser_mode=SELENIUMBASE_MODE,
+        bridge_cookies=True,
+    )
+
+
+def test_bridge_copies_cookies_with_expiry_and_user_agent():
+    http = SessionHttp()
+
+    assert bridge_browser_session(FakeBrowser(), http)
+
+    cookies = {cookie.name: cookie for cookie in http.cookies}
+    assert cookies['cf_clearance'].value == 'ok'
+    assert cookies['cf_clearance'].expires == 4_000_000_000
+    assert cookies['session'].expires is None
+    assert http.headers['User-Agent'] == 'BrowserUA/1.0'
+
+
+def test_bridge_reads_cookies_through_the_seleniumbase_driver(monkeypatch):
+    class BrokenCdp:
+        def get_all_cookies(self):
+            raise RuntimeError('cdp gone')
+
+    class FakeSb:
+        cdp = BrokenCdp()
+
+        def get_cookies(self):
+            return [{'name': 'session', 'value': 'webdriver', 'domain': 'example.test'}]
+
+        def get_user_agent(self):
+            return 'BrowserUA/1.0'
+
+    class FakeContext:
+        def __enter__(self):
+            return FakeSb()
+
+        def __exit__(self, exc_type, exc, tb):
+            return False
+
+    monkeypatch.setattr(browser_drivers, 'SB', lambda **kwargs: FakeContext())
+    driver = browser_drivers.SeleniumBaseDriver(headless=True, timeout_seconds=3.0)
+    http = SessionHttp()
+
+    assert bridge_browser_session(driver, http)
+
+    assert {cookie.name: cookie.value for cookie in http.cookies} == {'session': 'webdriver'}
+    assert http.headers['User-Agent'] == 'BrowserUA/1.0'
+
+
+def test_pages_return_to_requests_until_a_block_reappears():
+    http = SessionHttp(
+        FakeResponse(200, PAGE.format('Plain')),
+        FakeResponse(403),
+    )
+    browser = FakeBrowser()
+    loader = PageLoader()
+    adapters = PageLoadAdapters(http=http, browsers={SELENIUMBASE_MODE: browser})
+
+    first = loader.load(_request('1'), adapters)
+    second = loader.load(_request('2'), adapters)
+    third = loader.load(_request('3'), adapters)
+
+    assert first.browser_mode == SELENIUMBASE_MODE
+    assert second.browser_mode == REQUESTS_MODE
+    assert second.root.xpath('string(//h1)') == 'Plain'
+    assert third.browser_mode == SELENIUMBASE_MODE
+    assert browser.activated_urls == ['https://example.test/1', 'https://example.test/3']
+    assert http.get_urls == ['https://example.test/2', 'https://example.test/3']
+
+
+def test_browser_mode_pages_stay_in_the_browser_without_the_bridge():
+    http = SessionHttp()
+    browser = FakeBrowser()
+    loader = PageLoader()
+    adapters = PageLoadAdapters(http=http, browsers={SELENIUMBASE_MODE: browser})
+    request = PageLoadRequest(
+        url='https://example.test/1',
+        base_url='https://example.test',
+        browser_mode=SELENIUMBASE_MODE,
+    )
+
+    loader.load(request, adapters)
+    loader.load(request, adapters)
+
+    assert len(browser.activated_urls) == 2
+    assert http.get_urls == []
+    assert len(http.cookies) == 0
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import zipfile
+from typing import Any, ClassVar, cast
+
+import requests
+
+from downloader.comic import ComicSource
+from downloader.download.journal import JOURNAL_FILE_NAME, JournalEntry, VolumeJournal
+
+IMAGES = [f'https://img.test/{index}.jpg' for index in (1, 2, 3)]
+
+
+class PageResponse:
+    def __init__(self, payload: bytes, status_code: int = 200) -> None:
+        self.payload = payload
+        self.status_code = status_code
+        self.headers: dict[str, str] = {}
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f'HTTP {self.status_code}')
+
+    def iter_content(self, chunk_size: int = 1):
+        yield self.payload
+
+
+class PageSession:
+    def __init__(self, missing: set[str] | None = None) -> None:
+        self.missing = missing or set()
+        self.requested: list[str] = []
+
+    def get(self, url, **kwargs):
+        self.requested.append(url)
+        if url in self.missing:
+            return PageResponse(b'', status_code=404)
+        return PageResponse(url.encode('utf-8'))
+
+
+class NoHttp:
+    headers: ClassVar[dict[str, str]] = {}
+
+
+class JournalSource(ComicSource):
+    name = 'journal-source'
+    base_url = 'https://example.test'
+    download_journal = True
+
+    def __init__(self, *args, session: PageSession, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.session = session
+        self.probed: list[str] = []
+
+    def search(self, keyword):
+        return []
+
+    def info(self, url):
+        return None
+
+    def __parse_imgs__(self, url):
+        return []
+
+    def _create_image_http_session(self):
+        return self.session
+
+    def _can_reuse_image(self, file_path: str) -> bool:
+        self.probed.append(file_path.rsplit('/', 1)[-1])
+        return super()._can_reuse_image(file_path)
+
+
+def _entry(index: int) -> JournalEntry:
+    return JournalEntry(index=index, size=4, digest='abc', url=f'https://img.test/{index}.jpg')
+
+
+def test_journal_survives_reload_and_ignores_torn_last_line(tmp_path):
+    with VolumeJournal(str(tmp_path)) as journal:
+        journal.record(_entry(1))
+        journal.record(_entry(2))
+    with open(tmp_path / JOURNAL_FILE_NAME, 'a', encoding='utf-8') as f:
+        f.write('{"index": 3, "si')
+
+    with VolumeJournal(str(tmp_path)) as journal:
+        assert journal.names == ['0001.jpg', '0002.jpg']
+        journal.record(_entry(4))
+
+    assert VolumeJournal(str(tmp_path)).names == ['0001.jpg', '0002.jpg', '0004.jpg']
+    assert '0001.jpg' not in VolumeJournal(str(tmp_path), fresh=True)
+    assert not (tmp_path / JOURNAL_FILE_NAME).exists()
+
+
+def test_resumed_volume_trusts_the_journal_instead_of_probing_files(tmp_path):
+    image_dir = tmp_path / 'chapter'
+    source = JournalSource(
+        str(tmp_path),
+        cast(Any, NoHttp()),
+        None,
+        overwrite=False,
+        session=PageSession(missing={IMAGES[2]}),
+    )
+
+    first = source.__download_vol_images__(
+        str(image_dir), 'chapter', 'https://example.test/chapter', IMAGES
+    )
+
+    assert first.status == 'partial'
+    assert VolumeJournal(str(image_dir)).names == ['0001.jpg', '0002.jpg']
+
+    source.session = PageSession()
+    source.probed.clear()
+    second = source.__download_vol_images__(
+        str(image_dir), 'chapter', 'https://example.test/chapter', IMAGES
+    )
+
+    assert second.status == 'downloaded'
+    assert source.session.requested == [IMAGES[2]]
+    assert source.probed == ['0003.jpg']
+    with zipfile.ZipFile(second.archive_path) as archive:
+        assert archive.namelist() == ['0001.jpg', '0002.jpg', '0003.jpg']
+
+
+def test_image_deleted_after_journalling_rebuilds_the_journal(tmp_path):
+    image_dir = tmp_path / 'chapter'
+    image_dir.mkdir()
+    with VolumeJournal(str(image_dir)) as journal:
+        for index in (1, 2):
+            (image_dir / f'{index:04d}.jpg').write_bytes(b'page')
+            journal.record(_entry(index))
+    (image_dir / '0002.jpg').unlink()
+    source = JournalSource(str(tmp_path), cast(Any, NoHttp()), None, session=PageSession())
+
+    result = source._finalize_existing_download_dir(
+        str(image_dir), 'chapter', 'https://example.test/chapter', 2, []
+    )
+
+    assert result.status == 'partial'
+    assert result.downloaded_count == 1
+    assert not (tmp_path / 'chapter.zip').exists()
+    assert not (tmp_path / 'chapter.zip.part').exists()
+    assert VolumeJournal(str(image_dir)).names == ['0001.jpg']
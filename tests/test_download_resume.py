@@ -1,14 +1,18 @@
 from __future__ import annotations
 
+import json
 import threading
-import time
 from pathlib import Path
 from typing import Any, ClassVar, cast
 
 import pytest
+import requests
 
 from downloader import comic as comic_module
 from downloader.comic import ComicSource, ImageDownloadCancelledError, ImageDownloadContext
+from downloader.download.rate_limit import IMAGE_HOST_RATE_LIMITER
+from downloader.download.resume import partial_meta_path
+from downloader.download.retry import RetryPolicy
 
 
 class NoNetworkHttp:
@@ -103,14 +107,14 @@ def test_download_rate_wait_is_cancelled_promptly(tmp_path):
     source = ResumeSource(str(tmp_path), cast(Any, NoNetworkHttp()), None)
     source.download_interval = 30
     context = ImageDownloadContext(path=str(tmp_path), use_base_img_url=False)
-    context.last_request_at[0] = time.monotonic()
+    IMAGE_HOST_RATE_LIMITER.bucket('rate-wait.example.test', 1 / 30).reserve()
     entered_wait = threading.Event()
     exited_wait = threading.Event()
 
     def wait_for_slot():
         entered_wait.set()
         with pytest.raises(ImageDownloadCancelledError):
-            source._wait_for_download_slot(context)
+            source._wait_for_download_slot(context, 'https://rate-wait.example.test/0001.jpg')
         exited_wait.set()
 
     worker = threading.Thread(target=wait_for_slot)
@@ -122,3 +126,158 @@ def test_download_rate_wait_is_cancelled_promptly(tmp_path):
 
     assert exited_wait.is_set()
     assert worker.is_alive() is False
+
+
+class RangeResponse:
+    def __init__(
+        self, status_code: int, chunks: list[bytes], headers: dict[str, str], fail_after=None
+    ):
+        self.status_code = status_code
+        self.chunks = chunks
+        self.headers = headers
+        self.fail_after = fail_after
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(response=cast(Any, self))
+
+    def iter_content(self, chunk_size: int = 1):
+        for index, chunk in enumerate(self.chunks):
+            if index == self.fail_after:
+                raise requests.exceptions.ConnectionError('connection reset')
+            yield chunk
+
+
+class RangeSession:
+    def __init__(self, responses: list[RangeResponse]) -> None:
+        self.responses = responses
+        self.request_headers: list[dict[str, str]] = []
+
+    def get(self, url, headers=None, **kwargs):
+        self.request_headers.append(dict(headers or {}))
+        return self.responses.pop(0)
+
+
+def _range_source(tmp_path, session: RangeSession) -> ResumeSource:
+    source = ResumeSource(str(tmp_path), cast(Any, NoNetworkHttp()), None)
+    source.max_download_workers = 1
+    source._create_image_http_session = lambda: session
+    return source
+
+
+def _write_partial(image_dir: Path, payload: bytes, validators: dict[str, Any]) -> Path:
+    image_dir.mkdir(exist_ok=True)
+    tmp_path = image_dir / '0001.jpg.tmp'
+    tmp_path.write_bytes(payload)
+    Path(partial_meta_path(str(tmp_path))).write_text(json.dumps(validators), encoding='utf-8')
+    return tmp_path
+
+
+def _download_single_image(source: ResumeSource, image_dir: Path):
+    return source.__download_vol_images__(
+        str(image_dir), 'chapter', 'https://example.test/chapter', ['https://img.test/1.jpg']
+    )
+
+
+def test_partial_image_is_resumed_with_range_request(tmp_path):
+    image_dir = tmp_path / 'chapter'
+    tmp_file = _write_partial(
+        image_dir, b'abcd', {'etag': '"v1"', 'last_modified': None, 'content_length': 10}
+    )
+    session = RangeSession([RangeResponse(206, [b'efghij'], {'Content-Range': 'bytes 4-9/10'})])
+
+    result = _download_single_image(_range_source(tmp_path, session), image_dir)
+
+    assert result.status == 'downloaded'
+    assert session.request_headers[0]['Range'] == 'bytes=4-'
+    assert session.request_headers[0]['If-Range'] == '"v1"'
+    assert (image_dir / '0001.jpg').read_bytes() == b'abcdefghij'
+    assert not tmp_file.exists()
+    assert not Path(partial_meta_path(str(tmp_file))).exists()
+
+
+def test_full_response_replaces_partial_image(tmp_path):
+    image_dir = tmp_path / 'chapter'
+    _write_partial(image_dir, b'old', {'etag': '"v1"', 'last_modified': None, 'content_length': 9})
+    session = RangeSession([RangeResponse(200, [b'new-image'], {'ETag': '"v2"'})])
+
+    _download_single_image(_range_source(tmp_path, session), image_dir)
+
+    assert (image_dir / '0001.jpg').read_bytes() == b'new-image'
+
+
+def test_interrupted_transfer_keeps_partial_for_next_attempt(tmp_path):
+    image_dir = tmp_path / 'chapter'
+    session = RangeSession(
+        [
+            RangeResponse(
+                200,
+                [b'abcd', b'efgh'],
+                {'ETag': '"v1"', 'Content-Length': '8'},
+                fail_after=1,
+            ),
+            RangeResponse(206, [b'efgh'], {'Content-Range': 'bytes 4-7/8'}),
+        ]
+    )
+
+    result = _download_single_image(_range_source(tmp_path, session), image_dir)
+
+    assert result.status == 'downloaded'
+    assert 'Range' not in session.request_headers[0]
+    assert session.request_headers[1]['Range'] == 'bytes=4-'
+    assert (image_dir / '0001.jpg').read_bytes() == b'abcdefgh'
+
+
+def test_mismatched_content_range_restarts_from_zero(tmp_path):
+    image_dir = tmp_path / 'chapter'
+    _write_partial(image_dir, b'abcd', {'etag': '"v1"', 'last_modified': None, 'content_length': 8})
+    session = RangeSession(
+        [
+            RangeResponse(206, [b'cdefgh'], {'Content-Range': 'bytes 2-7/8'}),
+            RangeResponse(200, [b'abcdefgh'], {'ETag': '"v1"'}),
+        ]
+    )
+
+    result = _download_single_image(_range_source(tmp_path, session), image_dir)
+
+    assert result.status == 'downloaded'
+    assert 'Range' not in session.request_headers[1]
+    assert (image_dir / '0001.jpg').read_bytes() == b'abcdefgh'
+
+
+def test_streamed_responses_are_closed_on_success_and_failure(tmp_path):
+    image_dir = tmp_path / 'chapter'
+    interrupted = RangeResponse(200, [b'ab', b'cd'], {'Content-Length': '4'}, fail_after=1)
+    rejected = RangeResponse(500, [], {})
+    complete = RangeResponse(200, [b'abcd'], {})
+    session = RangeSession([interrupted, rejected, complete])
+    source = _range_source(tmp_path, session)
+    source.image_retry_count = 3
+    source.retry_policy = RetryPolicy(rand=lambda: 0.0)
+
+    result = _download_single_image(source, image_dir)
+
+    assert result.status == 'downloaded'
+    assert [interrupted.closed, rejected.closed, complete.closed] == [True, True, True]
+
+
+def test_unsatisfiable_range_refetches_the_whole_image(tmp_path):
+    image_dir = tmp_path / 'chapter'
+    tmp_file = _write_partial(
+        image_dir, b'abcd', {'etag': '"v1"', 'last_modified': None, 'content_length': 8}
+    )
+    rejected = RangeResponse(416, [], {})
+    session = RangeSession([rejected, RangeResponse(200, [b'new-image'], {'ETag': '"v2"'})])
+
+    result = _download_single_image(_range_source(tmp_path, session), image_dir)
+
+    assert result.status == 'downloaded'
+    assert session.request_headers[0]['Range'] == 'bytes=4-'
+    assert 'Range' not in session.request_headers[1]
+    assert rejected.closed
+    assert (image_dir / '0001.jpg').read_bytes() == b'new-image'
+    assert not tmp_file.exists()
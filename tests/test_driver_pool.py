@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import concurrent.futures
+import threading
+from typing import Any
+
+import pytest
+
+from downloader.browser.manager import DriverManager
+from downloader.browser.pool import DriverPool
+from downloader.comic import ComicSource
+
+
+class FakeDriver:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.healthy = True
+        self.quit_calls = 0
+
+    def is_healthy(self) -> bool:
+        return self.healthy
+
+    def quit(self) -> None:
+        self.quit_calls += 1
+
+
+class DriverFactory:
+    def __init__(self) -> None:
+        self.created: list[FakeDriver] = []
+
+    def __call__(self) -> FakeDriver:
+        driver = FakeDriver(f'driver-{len(self.created) + 1}')
+        self.created.append(driver)
+        return driver
+
+
+class QuietPresenter:
+    def print(self, message: Any = '', style: str | None = None) -> None:
+        return None
+
+
+class PooledSource(ComicSource):
+    browser_mode = 'seleniumbase'
+    driver_pool_size = 2
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.both_parsing = threading.Barrier(2, timeout=5)
+        self.parsed_with: dict[str, Any] = {}
+
+    def search(self, keyword):
+        return []
+
+    def info(self, url):
+        return None
+
+    def __parse_imgs__(self, url):
+        self.both_parsing.wait()
+        self.parsed_with[url] = self.driver
+        return [f'{url}/1.jpg']
+
+
+def test_pool_creates_instances_lazily_up_to_its_size():
+    factory = DriverFactory()
+    pool = DriverPool(factory, 2)
+
+    first = pool.checkout()
+    second = pool.checkout()
+    with pytest.raises(TimeoutError):
+        pool.checkout(timeout=0.01)
+    pool.checkin(first)
+
+    assert pool.checkout() is first
+    assert factory.created == [first, second]
+    assert pool.in_use == 2
+
+
+def test_unhealthy_instance_is_replaced_on_checkout():
+    factory = DriverFactory()
+    retired = []
+    seed = FakeDriver('seed')
+    pool = DriverPool(factory, 1, seed=seed, retire=retired.append)
+
+    seed.healthy = False
+    replacement = pool.checkout()
+
+    assert replacement is factory.created[0]
+    assert retired == [seed]
+
+
+def test_instance_is_recycled_after_max_uses_and_on_failure():
+    factory = DriverFactory()
+    pool = DriverPool(factory, 1, max_uses=2)
+
+    for _ in range(2):
+        with pool.lease():
+            pass
+    with pytest.raises(RuntimeError), pool.lease() as driver:
+        driver.healthy = False
+        raise RuntimeError('page crashed')
+
+    assert [driver.quit_calls for driver in factory.created] == [1, 1]
+    assert len(factory.created) == 2
+
+
+def test_source_parses_chapters_in_parallel_with_pooled_drivers(tmp_path):
+    seed = FakeDriver('seed')
+    source = PooledSource(str(tmp_path), None, seed)
+    source.driver_pool = DriverPool(DriverFactory(), 2, seed=seed)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        results = list(executor.map(source._parse_images_now, ['ch1', 'ch2']))
+
+    assert results == [['ch1/1.jpg'], ['ch2/1.jpg']]
+    assert source.parsed_with['ch1'] is not source.parsed_with['ch2']
+    assert source.driver is seed
+    assert source._concurrent_volume_limit() == 1
+    source.concurrent_volumes = 4
+    assert source._concurrent_volume_limit() == 2
+
+
+def test_manager_pool_is_seeded_with_the_cached_driver(monkeypatch):
+    factory = DriverFactory()
+
+    def fake_init_driver(self, source_or_class=None):
+        self.current_driver = factory()
+        return True
+
+    monkeypatch.setattr(DriverManager, 'init_driver', fake_init_driver)
+    manager = DriverManager(QuietPresenter())
+
+    assert manager.driver_pool(ComicSource) is None
+    assert manager.ensure_driver(PooledSource)
+    seed = manager.current_driver
+    pool = manager.driver_pool(PooledSource)
+    assert pool is not None
+    assert manager.driver_pool(PooledSource) is pool
+
+    with pool.lease() as first, pool.lease() as second:
+        assert first is seed
+        assert second is factory.created[1]
+    assert manager.current_driver is seed
+
+    manager.destroy()
+    assert [driver.quit_calls for driver in factory.created] == [1, 1]
+    assert manager.drivers == {}
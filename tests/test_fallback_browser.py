@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from downloader.browser.fallback import FallbackBrowser
+
+
+class FakeContext:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.exited = threading.Event()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.exited.set()
+        return False
+
+
+class ContextFactory:
+    def __init__(self) -> None:
+        self.created: list[FakeContext] = []
+
+    def __call__(self) -> FakeContext:
+        context = FakeContext(f'browser-{len(self.created) + 1}')
+        self.created.append(context)
+        return context
+
+
+def test_browser_is_launched_once_and_reused():
+    factory = ContextFactory()
+    fallback = FallbackBrowser(factory)
+
+    assert not fallback.is_open
+    with fallback.lease() as first:
+        pass
+    with fallback.lease() as second:
+        pass
+
+    assert first is second
+    assert factory.created == [first]
+    fallback.close()
+    assert first.exited.is_set()
+    assert not fallback.is_open
+
+
+def test_discarded_or_failed_browser_is_replaced():
+    factory = ContextFactory()
+    fallback = FallbackBrowser(factory)
+
+    with fallback.lease():
+        fallback.discard()
+    with pytest.raises(RuntimeError), fallback.lease():
+        raise RuntimeError('page crashed')
+    with fallback.lease() as browser:
+        pass
+
+    assert browser is factory.created[2]
+    assert [context.exited.is_set() for context in factory.created] == [True, True, False]
+    fallback.close()
+
+
+def test_idle_browser_is_closed():
+    factory = ContextFactory()
+    fallback = FallbackBrowser(factory, idle_seconds=0.01)
+
+    with fallback.lease() as browser:
+        pass
+
+    assert browser.exited.wait(timeout=5)
+    assert not fallback.is_open
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import time
+
+import requests
+
+from downloader.download import host_selection
+from downloader.download.host_selection import HostSelector
+from downloader.models import ImageDownloadContext
+from downloader.sources.adapters.manhuafree import (
+    DEFAULT_IMG_HOST,
+    IMG_HOST_LINE_2,
+    IMG_HOST_LINE_2_VALUE,
+    ManhuafreeComic,
+)
+
+FAST = 'https://fast.test'
+SLOW = 'https://slow.test'
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self) -> None:
+        self.closed = False
+        self.headers: dict[str, str] = {}
+
+    def raise_for_status(self) -> None:
+        return None
+
+    def iter_content(self, chunk_size: int = 1):
+        yield b'image'
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class BrokenLineHttp:
+    """Serves images from every host except the API's second line."""
+
+    def __init__(self) -> None:
+        self.urls: list[str] = []
+        self.headers: list[dict[str, str]] = []
+
+    def get(self, url, headers=None, **kwargs):
+        self.urls.append(url)
+        self.headers.append(dict(headers or {}))
+        if url.startswith(IMG_HOST_LINE_2):
+            raise requests.exceptions.ConnectionError('line down')
+        return FakeResponse()
+
+
+def test_rewrite_moves_urls_to_the_faster_host():
+    selector = HostSelector([SLOW, FAST])
+    selector.record_success(SLOW + '/1.jpg', 2.0, 1000)
+    selector.record_success(FAST + '/1.jpg', 0.5, 1000)
+
+    assert selector.rewrite(SLOW + '/2.jpg?v=1') == FAST + '/2.jpg?v=1'
+    assert selector.alternate(FAST + '/2.jpg') == SLOW + '/2.jpg'
+    assert selector.rewrite('https://other.test/2.jpg') == 'https://other.test/2.jpg'
+
+
+def test_unscored_hosts_keep_the_url_host():
+    selector = HostSelector([SLOW, FAST])
+
+    assert selector.rewrite(FAST + '/1.jpg') == FAST + '/1.jpg'
+    assert selector.rewrite(SLOW + '/1.jpg') == SLOW + '/1.jpg'
+
+
+def test_failing_host_is_skipped_until_its_cooldown_ends():
+    clock = FakeClock()
+    selector = HostSelector([FAST, SLOW], clock=clock)
+    selector.record_success(FAST + '/1.jpg', 0.1, 1000)
+    selector.record_success(SLOW + '/1.jpg', 1.0, 1000)
+
+    for _ in range(host_selection.HOST_FAILURE_THRESHOLD):
+        selector.record_failure(FAST + '/2.jpg')
+    assert selector.rewrite(FAST + '/3.jpg') == SLOW + '/3.jpg'
+
+    clock.now += host_selection.HOST_COOLDOWN_SECONDS + 1
+    assert selector.rewrite(SLOW + '/3.jpg') == FAST + '/3.jpg'
+
+
+def test_probe_runs_once_per_session():
+    selector = HostSelector([SLOW, FAST])
+    fetched = []
+
+    def fetch(url):
+        fetched.append(url)
+        return 1000
+
+    urls = [f'{SLOW}/{index}.jpg' for index in range(5)]
+    selector.probe(urls, fetch)
+    selector.probe(urls, fetch)
+
+    assert len(fetched) == 2 * host_selection.HOST_PROBE_IMAGES
+    assert {url.split('/')[2] for url in fetched} == {'slow.test', 'fast.test'}
+
+
+def test_manhuafree_avoids_a_line_that_fails_the_probe(tmp_path):
+    http = BrokenLineHttp()
+    source = ManhuafreeComic(str(tmp_path), http, None)
+    chapter = {
+        'images': {
+            'images': [{'url': f'/ch/{index}.jpg', 'order': index} for index in range(3)],
+            'line': IMG_HOST_LINE_2_VALUE,
+        }
+    }
+
+    img_urls = source._extract_img_urls(chapter)
+
+    assert img_urls == [f'{DEFAULT_IMG_HOST}/ch/{index}.jpg' for index in range(3)]
+    assert any(url.startswith(IMG_HOST_LINE_2) for url in http.urls)
+    assert source._hedge_image_url(img_urls[0]) == f'{IMG_HOST_LINE_2}/ch/0.jpg'
+
+
+def test_manhuafree_probe_is_one_throttled_ranged_request_per_line(monkeypatch, tmp_path):
+    http = BrokenLineHttp()
+    source = ManhuafreeComic(str(tmp_path), http, None)
+    slots: list[str] = []
+    monkeypatch.setattr(source, '_wait_for_download_slot', lambda context, url: slots.append(url))
+    chapter = {'images': [{'url': f'/ch/{index}.jpg', 'order': index} for index in range(3)]}
+
+    source._extract_img_urls(chapter)
+
+    assert sorted(http.urls) == sorted(
+        [f'{DEFAULT_IMG_HOST}/ch/0.jpg', f'{IMG_HOST_LINE_2}/ch/0.jpg']
+    )
+    assert sorted(slots) == sorted(http.urls)
+    assert all(headers['Range'].startswith('bytes=0-') for headers in http.headers)
+
+
+def test_manhuafree_scores_lines_without_local_bandwidth_waits(monkeypatch, tmp_path):
+    source = ManhuafreeComic(str(tmp_path), BrokenLineHttp(), None)
+    samples: list[tuple[str, float, int]] = []
+    monkeypatch.setattr(
+        source.img_host_selector,
+        'record_success',
+        lambda url, seconds, nbytes: samples.append((url, seconds, nbytes)),
+    )
+    monkeypatch.setattr(source, '_throttle_bandwidth', lambda context, nbytes: time.sleep(0.2))
+    context = ImageDownloadContext(
+        path=str(tmp_path), use_base_img_url=False, session_factory=BrokenLineHttp
+    )
+    img_url = f'{DEFAULT_IMG_HOST}/ch/0.jpg'
+
+    source._fetch_image(img_url, context, str(tmp_path / '1.tmp'), str(tmp_path / '1.jpg'))
+
+    assert len(samples) == 1
+    url, seconds, nbytes = samples[0]
+    assert (url, nbytes) == (img_url, len(b'image'))
+    assert seconds < 0.1
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import os
+from typing import Any, ClassVar, cast
+
+from downloader.comic import ComicSource
+from downloader.download.blob_store import BLOB_STORE_DIR_NAME, ImageBlobStore, file_digest
+from downloader.models import DownloadSummary, VolumeDownloadResult
+from downloader.tui import TerminalPresenter
+
+
+class PayloadResponse:
+    def __init__(self, payload: bytes) -> None:
+        self.payload = payload
+        self.status_code = 200
+        self.headers: dict[str, str] = {}
+
+    def raise_for_status(self) -> None:
+        return None
+
+    def iter_content(self, chunk_size: int = 1):
+        yield self.payload
+
+
+class CreditsPageSession:
+    def get(self, url, **kwargs):
+        if url.endswith('credits.jpg'):
+            return PayloadResponse(b'credits-page' * 100)
+        return PayloadResponse(url.encode('utf-8'))
+
+
+class NoHttp:
+    headers: ClassVar[dict[str, str]] = {}
+
+
+class BlobStoreSource(ComicSource):
+    name = 'blob-store-source'
+    base_url = 'https://example.test'
+    max_download_workers = 1
+    image_blob_store = True
+
+    def search(self, keyword):
+        return []
+
+    def info(self, url):
+        return None
+
+    def __parse_imgs__(self, url):
+        return []
+
+    def _create_image_http_session(self):
+        return CreditsPageSession()
+
+
+def test_identical_files_share_one_blob(tmp_path):
+    store = ImageBlobStore(str(tmp_path / BLOB_STORE_DIR_NAME))
+    first = tmp_path / 'a.jpg'
+    second = tmp_path / 'b.jpg'
+    first.write_bytes(b'same image')
+    second.write_bytes(b'same image')
+
+    assert store.adopt(str(first), file_digest(str(first))) == 0
+    assert store.adopt(str(second), file_digest(str(second))) == len(b'same image')
+
+    assert os.path.samefile(first, second)
+    assert second.read_bytes() == b'same image'
+    assert store.bytes_saved == len(b'same image')
+    assert store.deduplicated_images == 1
+
+
+def test_prune_removes_blobs_without_volume_links(tmp_path):
+    store = ImageBlobStore(str(tmp_path / BLOB_STORE_DIR_NAME))
+    image = tmp_path / 'a.jpg'
+    image.write_bytes(b'image')
+    digest = file_digest(str(image))
+    store.adopt(str(image), digest)
+
+    assert store.prune() == 0
+    image.unlink()
+    assert store.prune() == 1
+    assert not os.path.exists(store.blob_path(digest))
+
+
+def test_repeated_pages_across_volumes_are_hardlinked(tmp_path):
+    source = BlobStoreSource(str(tmp_path), cast(Any, NoHttp()), None)
+    imgs = ['https://img.test/{}/1.jpg', 'https://img.test/credits.jpg']
+
+    with source.image_download_run():
+        first = source.__download_vol_images__(
+            str(tmp_path / 'v1'), 'v1', 'https://example.test/v1', [imgs[0].format(1), imgs[1]]
+        )
+        second = source.__download_vol_images__(
+            str(tmp_path / 'v2'), 'v2', 'https://example.test/v2', [imgs[0].format(2), imgs[1]]
+        )
+
+    assert first.deduplicated_bytes == 0
+    assert second.deduplicated_bytes == len(b'credits-page' * 100)
+    assert os.path.samefile(tmp_path / 'v1' / '0002.jpg', tmp_path / 'v2' / '0002.jpg')
+    assert not os.path.samefile(tmp_path / 'v1' / '0001.jpg', tmp_path / 'v2' / '0001.jpg')
+    assert source.blob_store is None
+
+
+def test_download_summary_reports_deduplicated_bytes():
+    summary = DownloadSummary()
+    summary.add(
+        VolumeDownloadResult(
+            name='第1话', url='u', status='downloaded', deduplicated_bytes=3 * 1024 * 1024
+        )
+    )
+
+    assert '去重节省 3.0 MB' in TerminalPresenter._format_download_overview(summary)
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, ClassVar, cast
+
+import pytest
+
+from downloader.comic import ComicSource
+from downloader.download import hedging
+from downloader.download.hedging import HedgeBudget, ImageHedger, LatencyTracker
+
+IMAGES = [f'https://img.test/{index}.jpg' for index in range(1, 10)]
+SLOW_IMAGE = IMAGES[-1]
+
+
+class FakeImageResponse:
+    def __init__(self, payload: bytes, release: threading.Event | None = None) -> None:
+        self.payload = payload
+        self.release = release
+        self.status_code = 200
+        self.headers: dict[str, str] = {}
+
+    def raise_for_status(self) -> None:
+        return None
+
+    def iter_content(self, chunk_size: int = 1):
+        if self.release is not None:
+            self.release.wait(5)
+        yield self.payload
+
+    def close(self) -> None:
+        return None
+
+
+class FakeImageSession:
+    def __init__(self, release: threading.Event) -> None:
+        self.release = release
+
+    def get(self, url, **kwargs):
+        if url == SLOW_IMAGE:
+            return FakeImageResponse(b'slow', self.release)
+        return FakeImageResponse(b'fast')
+
+    def close(self) -> None:
+        return None
+
+
+class NoHttp:
+    headers: ClassVar[dict[str, str]] = {}
+
+
+class MirrorSource(ComicSource):
+    name = 'mirror-source'
+    base_url = 'https://example.test'
+    max_download_workers = 1
+    adaptive_download_workers = False
+    image_hedge_ratio = 0.5
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.release = threading.Event()
+
+    def search(self, keyword):
+        return []
+
+    def info(self, url):
+        return None
+
+    def __parse_imgs__(self, url):
+        return []
+
+    def _create_image_http_session(self):
+        return FakeImageSession(self.release)
+
+    def _hedge_image_url(self, full_img_url: str) -> str:
+        return full_img_url + '?mirror=1'
+
+
+def _warm_tracker(samples: int = hedging.HEDGE_MIN_SAMPLES) -> LatencyTracker:
+    tracker = LatencyTracker()
+    for _ in range(samples):
+        tracker.record(0.01)
+    return tracker
+
+
+def test_threshold_needs_enough_samples_and_uses_p95(monkeypatch):
+    monkeypatch.setattr(hedging, 'HEDGE_MIN_DELAY_SECONDS', 0)
+    tracker = _warm_tracker(hedging.HEDGE_MIN_SAMPLES - 1)
+    assert tracker.threshold() is None
+
+    for seconds in range(1, 21):
+        tracker.record(float(seconds))
+
+    assert tracker.threshold() == 19.0
+
+
+def test_hedge_budget_caps_extra_requests():
+    budget = HedgeBudget(0.1)
+    for _ in range(10):
+        budget.record_request()
+
+    assert [budget.try_spend() for _ in range(3)] == [True, True, False]
+
+
+def test_slow_primary_loses_to_the_hedge(monkeypatch):
+    monkeypatch.setattr(hedging, 'HEDGE_MIN_DELAY_SECONDS', 0.05)
+    primary_cancelled = threading.Event()
+
+    def attempt(cancel_event, attempt_number):
+        if attempt_number == 0:
+            if cancel_event.wait(5):
+                primary_cancelled.set()
+            return 'primary'
+        return 'hedge'
+
+    with ImageHedger(ratio=1, max_workers=1) as hedger:
+        winner = hedger.race(attempt, _warm_tracker(), threading.Event())
+
+    assert winner == (1, 'hedge')
+    assert primary_cancelled.wait(1)
+
+
+def test_failed_primary_is_reported_without_hedging(monkeypatch):
+    monkeypatch.setattr(hedging, 'HEDGE_MIN_DELAY_SECONDS', 5)
+
+    def attempt(cancel_event, attempt_number):
+        raise OSError('reset')
+
+    with ImageHedger(ratio=1, max_workers=1) as hedger, pytest.raises(OSError):
+        hedger.race(attempt, _warm_tracker(), threading.Event())
+    assert hedger.budget.hedges == 0
+
+
+def test_stalled_image_is_completed_by_the_hedge_request(monkeypatch, tmp_path):
+    monkeypatch.setattr(hedging, 'HEDGE_MIN_DELAY_SECONDS', 0.05)
+    source = MirrorSource(str(tmp_path), cast(Any, NoHttp()), None)
+    image_dir = tmp_path / 'chapter'
+
+    try:
+        with source.image_download_run():
+            result = source.__download_vol_images__(
+                str(image_dir), 'chapter', 'https://example.test/chapter', IMAGES
+            )
+    finally:
+        source.release.set()
+
+    assert result.status == 'downloaded'
+    assert (image_dir / '0009.jpg').read_bytes() == b'fast'
+    deadline = time.monotonic() + 2
+    while any(path.name.endswith('.tmp') for path in image_dir.iterdir()):
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+class DefaultSource(MirrorSource):
+    name = 'default-hedge-source'
+    image_hedge_ratio = ComicSource.image_hedge_ratio
+
+
+def test_hedging_is_off_by_default(tmp_path):
+    source = DefaultSource(str(tmp_path), cast(Any, NoHttp()), None)
+
+    with source.image_download_run():
+        assert source.image_hedger is None
+
+
+def test_hedge_request_waits_for_a_rate_limit_slot(monkeypatch, tmp_path):
+    monkeypatch.setattr(hedging, 'HEDGE_MIN_DELAY_SECONDS', 0.05)
+    source = MirrorSource(str(tmp_path), cast(Any, NoHttp()), None)
+    slots: list[str] = []
+
+    def wait_for_download_slot(context, full_img_url):
+        slots.append(full_img_url)
+
+    monkeypatch.setattr(source, '_wait_for_download_slot', wait_for_download_slot)
+    image_dir = tmp_path / 'chapter'
+
+    try:
+        with source.image_download_run():
+            source.__download_vol_images__(
+                str(image_dir), 'chapter', 'https://example.test/chapter', IMAGES
+            )
+    finally:
+        source.release.set()
+
+    assert SLOW_IMAGE + '?mirror=1' in slots
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, cast
+
+from downloader.comic import ComicSource
+from downloader.download.prefetch import ImageListPrefetcher, VolumeJob
+from downloader.download.progress import NoopDownloadProgress
+from downloader.models import ComicVolume, VolumeDownloadResult
+
+
+class LookaheadSource(ComicSource):
+    name = 'lookahead-source'
+    base_url = 'https://example.test'
+    volume_parse_lookahead = 1
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.parse_threads: dict[str, str] = {}
+        self.parsed = {url: threading.Event() for url in ('v1', 'v2', 'v3')}
+        self.overlapped: list[str] = []
+
+    def create_download_progress(self):
+        return NoopDownloadProgress()
+
+    def search(self, keyword):
+        return []
+
+    def info(self, url):
+        return None
+
+    def __parse_imgs__(self, url):
+        self.parse_threads[url] = threading.current_thread().name
+        self.parsed[url].set()
+        return [f'{url}-0001.jpg']
+
+    def __download_vol_images__(self, path, vol_name, source_url, imgs, progress=None):
+        next_url = {'v1': 'v2', 'v2': 'v3'}.get(source_url)
+        if next_url and self.parsed[next_url].wait(1):
+            self.overlapped.append(next_url)
+        return VolumeDownloadResult(
+            name=vol_name, url=source_url, status='downloaded', image_count=len(imgs)
+        )
+
+
+def _volumes():
+    return [ComicVolume(name, name) for name in ('v1', 'v2', 'v3')]
+
+
+def test_next_volume_is_parsed_while_current_volume_downloads(tmp_path):
+    source = LookaheadSource(str(tmp_path), cast(Any, object()), None)
+
+    summary = source.download_vols('comic', 'book', _volumes())
+
+    assert [result.name for result in summary.volume_results] == ['v1', 'v2', 'v3']
+    assert source.overlapped == ['v2', 'v3']
+    assert source.parse_threads['v1'] == threading.current_thread().name
+    assert source.parse_threads['v2'].startswith('image-list-prefetch')
+    assert source.parse_threads['v3'].startswith('image-list-prefetch')
+
+
+def test_default_lookahead_parses_each_volume_inline(tmp_path):
+    source = LookaheadSource(str(tmp_path), cast(Any, object()), None)
+    source.volume_parse_lookahead = ComicSource.volume_parse_lookahead
+    for event in source.parsed.values():
+        event.set()
+
+    source.download_vols('comic', 'book', _volumes())
+
+    assert set(source.parse_threads.values()) == {threading.current_thread().name}
+
+
+def test_prefetch_skips_volumes_with_existing_archive(tmp_path):
+    source = LookaheadSource(str(tmp_path), cast(Any, object()), None, overwrite=False)
+    (tmp_path / 'v2.zip').write_bytes(b'zip')
+
+    with ImageListPrefetcher(source, 2) as prefetcher:
+        prefetcher.schedule(
+            [VolumeJob(str(tmp_path), 'v2', 'v2'), VolumeJob(str(tmp_path), 'v3', 'v3')]
+        )
+        assert prefetcher.take('v2') is None
+        future = prefetcher.take('v3')
+        assert future is not None
+        assert future.result(1) == ['v3-0001.jpg']
+
+
+def test_prefetch_waits_for_the_shared_browser_driver(tmp_path):
+    source = LookaheadSource(str(tmp_path), cast(Any, object()), object())
+
+    with ImageListPrefetcher(source, 1) as prefetcher:
+        with source.driver_lock:
+            prefetcher.schedule([VolumeJob(str(tmp_path), 'v2', 'v2')])
+            assert source.parsed['v2'].wait(0.2) is False
+        assert source.parsed['v2'].wait(1) is True
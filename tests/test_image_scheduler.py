@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, ClassVar, cast
+
+from downloader.comic import ComicSource
+from downloader.download.scheduler import ImageDownloadScheduler
+
+
+class FakeImageResponse:
+    def __init__(self, payload: bytes) -> None:
+        self.payload = payload
+        self.status_code = 200
+        self.headers: dict[str, str] = {}
+
+    def raise_for_status(self) -> None:
+        return None
+
+    def iter_content(self, chunk_size: int = 1):
+        yield self.payload
+
+    def close(self) -> None:
+        return None
+
+
+class FakeImageSession:
+    def __init__(self) -> None:
+        self.requested: list[str] = []
+        self.closed = False
+
+    def get(self, url, **kwargs):
+        self.requested.append(url)
+        return FakeImageResponse(url.encode('utf-8'))
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class SharedPoolSource(ComicSource):
+    name = 'shared-pool-source'
+    base_url = 'https://example.test'
+    max_download_workers = 1
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.created_sessions: list[FakeImageSession] = []
+
+    def search(self, keyword):
+        return []
+
+    def info(self, url):
+        return None
+
+    def __parse_imgs__(self, url):
+        return []
+
+    def _create_image_http_session(self):
+        session = FakeImageSession()
+        self.created_sessions.append(session)
+        return session
+
+
+class NoHttp:
+    headers: ClassVar[dict[str, str]] = {}
+
+
+def test_download_run_reuses_worker_sessions_across_volumes(tmp_path):
+    source = SharedPoolSource(str(tmp_path), cast(Any, NoHttp()), None)
+
+    with source.image_download_run() as scheduler:
+        first = source.__download_vol_images__(
+            str(tmp_path / 'v1'), 'v1', 'https://example.test/v1', ['https://img.test/1.jpg']
+        )
+        second = source.__download_vol_images__(
+            str(tmp_path / 'v2'), 'v2', 'https://example.test/v2', ['https://img.test/2.jpg']
+        )
+        assert source.image_scheduler is scheduler
+        assert scheduler.closed is False
+
+    assert first.status == 'downloaded'
+    assert second.status == 'downloaded'
+    assert len(source.created_sessions) == 1
+    assert source.created_sessions[0].requested == [
+        'https://img.test/1.jpg',
+        'https://img.test/2.jpg',
+    ]
+    assert source.created_sessions[0].closed is True
+    assert source.image_scheduler is None
+
+
+def test_volume_outside_download_run_uses_temporary_scheduler(tmp_path):
+    source = SharedPoolSource(str(tmp_path), cast(Any, NoHttp()), None)
+
+    result = source.__download_vol_images__(
+        str(tmp_path / 'v1'), 'v1', 'https://example.test/v1', ['https://img.test/1.jpg']
+    )
+
+    assert result.status == 'downloaded'
+    assert [session.closed for session in source.created_sessions] == [True]
+
+
+def test_scheduler_accepts_jobs_from_several_volumes_at_once():
+    scheduler = ImageDownloadScheduler(2, FakeImageSession)
+    first = scheduler.create_context('v1', use_base_img_url=False)
+    second = scheduler.create_context('v2', use_base_img_url=False)
+    release = threading.Event()
+
+    def job(name):
+        release.wait(1)
+        return name
+
+    with scheduler:
+        futures = [scheduler.submit(job, 'v1'), scheduler.submit(job, 'v2')]
+        release.set()
+        assert [future.result(1) for future in futures] == ['v1', 'v2']
+        assert first.scheduler is scheduler
+        assert second.scheduler is scheduler
+
+
+def test_scheduler_cancel_wakes_every_active_volume():
+    scheduler = ImageDownloadScheduler(1, FakeImageSession)
+    first = scheduler.create_context('v1', use_base_img_url=False)
+    second = scheduler.create_context('v2', use_base_img_url=False)
+    scheduler.release_context(second)
+
+    scheduler.cancel()
+
+    assert first.cancel_event.is_set()
+    assert second.cancel_event.is_set() is False
+    assert scheduler.closed is True
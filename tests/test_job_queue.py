@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from downloader.job_queue import DONE, FAILED, QUEUED, RUNNING, JobQueue
+from downloader.models import DownloadSummary, VolumeDownloadResult
+from downloader.shell import Shell
+
+
+def test_jobs_are_claimed_in_order_and_finished(tmp_path):
+    with JobQueue.for_output_dir(str(tmp_path)) as queue:
+        first = queue.add('https://example.test/a', '1 2 3')
+        queue.add('https://example.test/b')
+
+        claimed = queue.claim('worker-1')
+        assert claimed is not None
+        assert (claimed.id, claimed.status, claimed.attempts) == (first.id, RUNNING, 1)
+        assert claimed.worker == 'worker-1'
+        assert claimed.vols == '1 2 3'
+
+        queue.finish(claimed.id, DONE, 'ok')
+        second = queue.claim('worker-1')
+        assert second is not None
+        assert second.url == 'https://example.test/b'
+        assert queue.claim('worker-1') is None
+
+        assert [job.status for job in queue.jobs()] == [DONE, RUNNING]
+
+
+def test_concurrent_workers_never_claim_the_same_job(tmp_path):
+    with JobQueue.for_output_dir(str(tmp_path)) as queue:
+        for index in range(20):
+            queue.add(f'https://example.test/{index}')
+    claimed: list[int] = []
+    lock = threading.Lock()
+
+    def work(worker: str) -> None:
+        with JobQueue.for_output_dir(str(tmp_path)) as queue:
+            while (job := queue.claim(worker)) is not None:
+                with lock:
+                    claimed.append(job.id)
+
+    threads = [threading.Thread(target=work, args=(f'worker-{i}',)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(claimed) == list(range(1, 21))
+
+
+def test_stale_and_failed_jobs_go_back_to_the_queue(tmp_path):
+    with JobQueue.for_output_dir(str(tmp_path)) as queue:
+        queue.add('https://example.test/crashed')
+        queue.add('https://example.test/failed')
+        crashed = queue.claim('dead-worker')
+        failed = queue.claim('worker')
+        assert crashed is not None
+        assert failed is not None
+        queue.finish(failed.id, FAILED, 'boom')
+
+        assert queue.requeue_stale() == 0
+        assert queue.requeue_stale(lease_seconds=-1) == 1
+        assert queue.retry_failed() == 1
+
+        assert [job.status for job in queue.jobs()] == [QUEUED, QUEUED]
+        resumed = queue.claim('worker')
+        assert resumed is not None
+        assert (resumed.id, resumed.attempts) == (crashed.id, 2)
+
+
+def _summary(status: str) -> DownloadSummary:
+    return DownloadSummary(volume_results=[VolumeDownloadResult('v1', 'u', status=status)])
+
+
+def test_shell_queue_run_records_results_and_releases_interrupted_jobs(monkeypatch, tmp_path):
+    shell = Shell(str(tmp_path))
+    with JobQueue.for_output_dir(str(tmp_path)) as queue:
+        for name in ('done', 'partial', 'error', 'interrupted'):
+            queue.add(f'https://example.test/{name}')
+
+    def run_job(job):
+        name = job.url.rsplit('/', 1)[-1]
+        if name == 'error':
+            raise RuntimeError('boom')
+        if name == 'interrupted':
+            raise KeyboardInterrupt
+        return _summary('downloaded' if name == 'done' else 'partial')
+
+    monkeypatch.setattr(shell, '_run_download_job', run_job)
+    try:
+        with pytest.raises(KeyboardInterrupt):
+            shell.do_queue('run')
+    finally:
+        shell.context.destroy()
+
+    with JobQueue.for_output_dir(str(tmp_path)) as queue:
+        jobs = queue.jobs()
+    assert [job.status for job in jobs] == [DONE, FAILED, FAILED, QUEUED]
+    assert jobs[2].message == 'boom'
+    assert jobs[3].attempts == 1
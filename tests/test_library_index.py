@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import os
+import zipfile
+from typing import Any, cast
+
+from downloader.comic import ComicSource
+from downloader.download.library import LibraryIndex, rebuild_library_index
+from downloader.download.progress import NoopDownloadProgress
+from downloader.models import ComicVolume, VolumeDownloadResult
+
+
+def _write_archive(path, pages: int) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(path, 'w') as archive:
+        for index in range(1, pages + 1):
+            archive.writestr(f'{index:04d}.jpg', b'page')
+
+
+class IndexedSource(ComicSource):
+    name = 'indexed-source'
+    base_url = 'https://example.test'
+    library_index = True
+    volume_parse_lookahead = 0
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.probed: list[str] = []
+        self.downloaded: list[str] = []
+
+    def create_download_progress(self):
+        return NoopDownloadProgress()
+
+    def search(self, keyword):
+        return []
+
+    def info(self, url):
+        return None
+
+    def __parse_imgs__(self, url):
+        return [f'{url}-0001.jpg']
+
+    def _probe_existing_archive(self, path, vol_name):
+        self.probed.append(vol_name)
+        return super()._probe_existing_archive(path, vol_name)
+
+    def __download_vol_images__(self, path, vol_name, source_url, imgs, progress=None):
+        self.downloaded.append(vol_name)
+        return VolumeDownloadResult(name=vol_name, url=source_url, status='downloaded')
+
+
+def test_index_finds_zero_padded_archive_by_volume_name(tmp_path):
+    archive_path = tmp_path / 'comic' / 'book' / '001 话.cbz'
+    _write_archive(archive_path, 3)
+
+    with LibraryIndex(str(tmp_path)) as library:
+        library.record(str(archive_path))
+        assert library.find(str(tmp_path / 'comic' / 'book'), '1 话') == str(archive_path)
+        assert library.find(str(tmp_path / 'comic' / 'book'), '2 话') is None
+        row = library._conn.execute('SELECT comic, book, archive_path, image_count FROM volumes')
+        assert row.fetchall() == [('comic', 'book', os.path.join('comic', 'book', '001 话.cbz'), 3)]
+
+
+def test_rebuild_replaces_index_with_archives_on_disk(tmp_path):
+    _write_archive(tmp_path / 'a' / 'book' / '1.zip', 2)
+    _write_archive(tmp_path / 'b' / 'book' / '2.cbz', 1)
+    (tmp_path / 'b' / 'book' / '3.zip.part').write_bytes(b'partial')
+    (tmp_path / 'b' / 'book' / '4.zip').write_bytes(b'not a zip')
+    with LibraryIndex(str(tmp_path)) as library:
+        library.record(str(tmp_path / 'a' / 'book' / '1.zip'))
+        os.remove(tmp_path / 'a' / 'book' / '1.zip')
+        _write_archive(tmp_path / 'a' / 'book' / '5.zip', 1)
+
+    assert rebuild_library_index(str(tmp_path), workers=2) == 2
+
+    with LibraryIndex(str(tmp_path)) as library:
+        assert library.find(str(tmp_path / 'a' / 'book'), '1') is None
+        assert library.find(str(tmp_path / 'a' / 'book'), '5') is not None
+        assert library.find(str(tmp_path / 'b' / 'book'), '2') is not None
+
+
+def test_indexed_volumes_are_skipped_without_probing_the_filesystem(tmp_path):
+    book_dir = tmp_path / 'comic' / 'book'
+    _write_archive(book_dir / '01 v1.zip', 1)
+    with LibraryIndex(str(tmp_path)) as library:
+        library.record(str(book_dir / '01 v1.zip'))
+    _write_archive(book_dir / 'v2.zip', 1)
+    source = IndexedSource(str(tmp_path), cast(Any, object()), None, overwrite=False)
+    volumes = [ComicVolume(name, name) for name in ('1 v1', 'v2', 'v3')]
+
+    summary = source.download_vols('comic', 'book', volumes)
+
+    assert [result.status for result in summary.volume_results] == [
+        'skipped',
+        'skipped',
+        'downloaded',
+    ]
+    assert source.probed == []
+    assert source.downloaded == ['v3']
+    with LibraryIndex(str(tmp_path)) as library:
+        assert library.find(str(book_dir), 'v2') == str(book_dir / 'v2.zip')
+
+
+def test_archive_deleted_by_hand_is_downloaded_again(tmp_path):
+    book_dir = tmp_path / 'comic' / 'book'
+    _write_archive(book_dir / 'v1.zip', 1)
+    with LibraryIndex(str(tmp_path)) as library:
+        library.record(str(book_dir / 'v1.zip'))
+    os.remove(book_dir / 'v1.zip')
+    source = IndexedSource(str(tmp_path), cast(Any, object()), None, overwrite=False)
+
+    summary = source.download_vols('comic', 'book', [ComicVolume('v1', 'v1')])
+
+    assert [result.status for result in summary.volume_results] == ['downloaded']
+    assert source.probed == []
+    with LibraryIndex(str(tmp_path)) as library:
+        count = library._conn.execute('SELECT COUNT(*) FROM volumes').fetchone()
+        assert count == (0,)
+
+
+def test_unchanged_book_directory_is_not_listed_again(tmp_path, monkeypatch):
+    book_dir = tmp_path / 'comic' / 'book'
+    _write_archive(book_dir / 'v1.zip', 1)
+    assert rebuild_library_index(str(tmp_path)) == 1
+
+    def fail_listdir(path):
+        raise AssertionError(f'listed {path}')
+
+    monkeypatch.setattr(os, 'listdir', fail_listdir)
+    with LibraryIndex(str(tmp_path)) as library:
+        assert library.find(str(book_dir), 'v1') == str(book_dir / 'v1.zip')
+        assert library.find(str(book_dir), 'v2') is None
@@ -3,6 +3,8 @@ from __future__ import annotations
 import sys
 
 import main as main_module
+import pytest
+
 from downloader.tui import TerminalPresenter
 
 
@@ -33,6 +35,12 @@ class InterruptingShell(FakeShell):
         raise KeyboardInterrupt
 
 
+@pytest.fixture(autouse=True)
+def run_in_tmp_path(monkeypatch, tmp_path):
+    # main() 在当前目录写入 comic_downloader.log
+    monkeypatch.chdir(tmp_path)
+
+
 def test_help_exits_before_shell_creation(monkeypatch, capsys):
     def fail_shell(*args, **kwargs):
         raise AssertionError('help should not create Shell')
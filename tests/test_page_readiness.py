@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import json
+
+from downloader.browser import readiness
+from downloader.browser.readiness import settle_page, wait_for_page_ready
+
+LOADED = {'ready_state': 'complete', 'quiet_seconds': 1.0}
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.pauses: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def pause(self, seconds: float) -> None:
+        self.pauses.append(seconds)
+        self.now += seconds
+
+
+class ScriptedCdp:
+    """Answers each readiness poll with the next page state, repeating the last one."""
+
+    def __init__(self, *states) -> None:
+        self.states = list(states)
+        self.scripts: list[str] = []
+
+    def evaluate(self, script: str):
+        self.scripts.append(script)
+        state = self.states.pop(0) if len(self.states) > 1 else self.states[0]
+        if isinstance(state, Exception):
+            raise state
+        return json.dumps(state)
+
+
+class FakeBrowser:
+    def __init__(self, cdp=None) -> None:
+        self.cdp = cdp
+        self.sleep_calls: list[float] = []
+        self.captcha_calls = 0
+
+    def sleep(self, seconds: float) -> None:
+        self.sleep_calls.append(seconds)
+
+    def solve_captcha(self) -> None:
+        self.captcha_calls += 1
+
+
+def _wait(browser: FakeBrowser, clock: FakeClock, selector: str | None = None):
+    return wait_for_page_ready(browser, selector, clock=clock, pause=clock.pause)
+
+
+def test_returns_as_soon_as_the_selector_matches():
+    clock = FakeClock()
+    cdp = ScriptedCdp({'ready_state': 'loading'}, {'ready_state': 'interactive', 'matched': True})
+    browser = FakeBrowser(cdp)
+
+    result = _wait(browser, clock, '.page-main')
+
+    assert result.ready
+    assert result.reason == 'selector'
+    assert clock.pauses == [readiness.READINESS_POLL_SECONDS]
+    assert '".page-main"' in cdp.scripts[0]
+    assert browser.sleep_calls == []
+
+
+def test_challenge_page_is_solved_once_and_waited_out():
+    clock = FakeClock()
+    challenge = {'ready_state': 'complete', 'quiet_seconds': 5.0, 'challenge': True}
+    browser = FakeBrowser(
+        ScriptedCdp(challenge, challenge, RuntimeError('context destroyed'), LOADED)
+    )
+
+    result = _wait(browser, clock)
+
+    assert result.ready
+    assert result.reason == 'loaded'
+    assert browser.captcha_calls == 1
+    assert len(clock.pauses) == 3
+
+
+def test_a_page_that_keeps_changing_times_out():
+    clock = FakeClock()
+    browser = FakeBrowser(ScriptedCdp({'ready_state': 'complete', 'quiet_seconds': 0.1}))
+
+    result = _wait(browser, clock)
+
+    assert not result.ready
+    assert result.reason == 'timeout'
+    assert clock.now >= readiness.READINESS_TIMEOUT_SECONDS
+
+
+def test_fixed_waits_and_browsers_without_cdp_skip_polling():
+    browser = FakeBrowser()
+
+    assert wait_for_page_ready(browser).reason == 'unsupported'
+    assert settle_page(browser, fixed_waits=True).reason == 'fixed'
+    assert browser.sleep_calls == list(readiness.FIXED_WAIT_SECONDS)
+    assert browser.captcha_calls == 1
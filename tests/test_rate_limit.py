@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from downloader.download.rate_limit import HostRateLimiter, TokenBucket
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_bucket_allows_burst_then_spaces_requests():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, burst=3, clock=clock)
+
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.reserve() == pytest.approx(0.5)
+    assert bucket.reserve() == pytest.approx(1.0)
+
+
+def test_token_bucket_refills_over_time_up_to_burst():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=1, burst=2, clock=clock)
+    bucket.reserve()
+    bucket.reserve()
+
+    clock.now += 10
+
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(1.0)
+
+
+def test_cancelled_acquire_refunds_its_token():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=0.01, burst=1, clock=clock)
+    bucket.reserve()
+    cancel_event = threading.Event()
+    cancel_event.set()
+
+    assert bucket.acquire(cancel_event) is False
+    assert bucket.reserve() == pytest.approx(100.0)
+
+
+def test_host_rate_limiter_shares_buckets_per_host():
+    limiter = HostRateLimiter()
+
+    first = limiter.bucket('img.example.test', 2, 4)
+    second = limiter.bucket('img.example.test', 2, 4)
+    other = limiter.bucket('cdn.example.test', 2, 4)
+
+    assert first is second
+    assert first is not other
+
+
+def test_host_rate_limiter_reconfigures_existing_bucket():
+    limiter = HostRateLimiter()
+    bucket = limiter.bucket('img.example.test', 1, 1)
+
+    limiter.bucket('img.example.test', 5, 10)
+
+    assert bucket.rate == 5
+    assert bucket.burst == 10
+
+
+def test_token_bucket_rejects_non_positive_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
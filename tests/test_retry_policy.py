@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import email.utils
+
+import pytest
+import requests
+
+from downloader.download import retry
+from downloader.download.retry import RetryBudget, RetryingHttp, RetryPolicy, retry_after_seconds
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, headers: dict[str, str] | None = None) -> None:
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class ScriptedHttp:
+    def __init__(self, *outcomes) -> None:
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def _next(self):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    def get(self, url, **kwargs):
+        return self._next()
+
+    def post(self, url, **kwargs):
+        return self._next()
+
+
+def _policy(sleeps: list[float], **kwargs) -> RetryPolicy:
+    return RetryPolicy(sleep=sleeps.append, rand=lambda: 1.0, **kwargs)
+
+
+def test_backoff_doubles_up_to_the_cap():
+    policy = RetryPolicy(rand=lambda: 1.0)
+
+    assert [policy.backoff(attempt) for attempt in (1, 2, 3)] == [0.5, 1.0, 2.0]
+    assert policy.backoff(20) == retry.RETRY_MAX_DELAY_SECONDS
+    assert RetryPolicy(rand=lambda: 0.25).backoff(3) == 0.5
+
+
+def test_retry_after_accepts_seconds_and_http_dates():
+    assert retry_after_seconds(FakeResponse(429, {'Retry-After': '7'})) == 7
+    date = email.utils.formatdate(1000, usegmt=True)
+    assert retry_after_seconds(FakeResponse(503, {'Retry-After': date}), lambda: 990) == 10
+    assert retry_after_seconds(FakeResponse(503, {'Retry-After': 'soon'})) is None
+
+
+def test_retrying_get_honours_retry_after_and_returns_final_response():
+    sleeps: list[float] = []
+    throttled = FakeResponse(429, {'Retry-After': '3'})
+    ok = FakeResponse(200)
+    http = RetryingHttp(
+        ScriptedHttp(throttled, requests.ConnectionError('reset'), ok), _policy(sleeps)
+    )
+
+    assert http.get('https://example.test/api') is ok
+    assert sleeps == [3.0, 1.0]
+    assert throttled.closed
+
+
+def test_non_transient_errors_are_not_retried():
+    sleeps: list[float] = []
+    scripted = ScriptedHttp(FakeResponse(404), requests.exceptions.InvalidURL('bad'))
+    http = RetryingHttp(scripted, _policy(sleeps))
+
+    assert http.get('https://example.test/missing').status_code == 404
+    with pytest.raises(requests.exceptions.InvalidURL):
+        http.get('https://example.test/bad')
+    assert scripted.calls == 2
+    assert sleeps == []
+
+
+def test_post_is_not_retried_after_the_request_was_sent():
+    sleeps: list[float] = []
+    scripted = ScriptedHttp(FakeResponse(503), requests.ConnectionError('reset'))
+    http = RetryingHttp(scripted, _policy(sleeps))
+
+    assert http.post('https://example.test/more').status_code == 503
+    with pytest.raises(requests.ConnectionError):
+        http.post('https://example.test/more')
+    assert sleeps == []
+
+
+def test_budget_stops_retries_once_the_reserve_is_spent():
+    budget = RetryBudget(0.5, capacity=2)
+    assert [budget.try_spend() for _ in range(3)] == [True, True, False]
+    budget.record_request()
+    budget.record_request()
+    assert budget.try_spend()
+
+    sleeps: list[float] = []
+    policy = _policy(sleeps, budget_ratio=0)
+    policy.budget = RetryBudget(0, capacity=1)
+    scripted = ScriptedHttp(*(FakeResponse(503) for _ in range(4)))
+
+    assert RetryingHttp(scripted, policy).get('https://example.test/').status_code == 503
+    assert scripted.calls == 2
+
+
+def test_retry_after_beyond_the_limit_gives_up():
+    policy = RetryPolicy()
+    response = FakeResponse(503, {'Retry-After': str(int(retry.RETRY_AFTER_MAX_SECONDS) + 1)})
+
+    assert policy.retry_delay(1, response=response) is None
@@ -362,6 +362,32 @@ def test_requests_html_block_status_switches_to_seleniumbase(monkeypatch, tmp_pa
     assert root.xpath('string(//h1)') == 'Fallback'
 
 
+def test_blocked_pages_reuse_one_fallback_browser(monkeypatch, tmp_path):
+    html = '<html><body><main class="page-main"><h1>Fallback</h1></main></body></html>'
+    contexts = []
+
+    def fake_context(self):
+        context = FakeSeleniumBase(html)
+        contexts.append(context)
+        return context
+
+    monkeypatch.setattr(BrowserHtmlSource, '_seleniumbase_context', fake_context)
+
+    source = BrowserHtmlSource(str(tmp_path), cast(Any, StatusHttp(403)), None)
+    source.browser_mode = REQUESTS_MODE
+
+    first = source.__parse_html__('https://example.test/one')
+    second = source.__parse_html__('https://example.test/two')
+
+    assert first is not None
+    assert second is not None
+    assert len(contexts) == 1
+    assert contexts[0].activated_url == 'https://example.test/two'
+    assert source.fallback_browser is not None
+    assert source.fallback_browser.is_open
+    source.fallback_browser.close()
+
+
 def test_profiled_parse_html_uses_profile_base_url_and_keeps_fallback_non_sticky(
     monkeypatch, tmp_path
 ):
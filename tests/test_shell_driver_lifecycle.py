@@ -29,13 +29,13 @@ def test_context_create_does_not_initialize_webdriver(monkeypatch, tmp_path):
     assert context.driver is None
 
 
-def test_context_http_session_returns_final_retry_status(tmp_path):
+def test_context_http_session_leaves_retries_to_the_source_policy(tmp_path):
     context = Context(quiet_console())
     context.create(str(tmp_path))
 
     adapter = cast(HTTPAdapter, context.http.get_adapter('https://'))
 
-    assert adapter.max_retries.raise_on_status is False
+    assert adapter.max_retries.total == 0
 
 
 def test_context_ensure_driver_initializes_once(monkeypatch, tmp_path):
@@ -280,7 +280,15 @@ def test_shell_source_display_names_resolve_to_chinese_not_code(tmp_path):
 
         assert len(display_names) == len(shell.source_options)
         # 源代码名（小写英文）不应出现在展示列表中
-        for code_name in ('dumanwu', 'manhuafree', 'manhuagui', 'manhuazhan', 'morui', 'thmh', 'tuku'):
+        for code_name in (
+            'dumanwu',
+            'manhuafree',
+            'manhuagui',
+            'manhuazhan',
+            'morui',
+            'thmh',
+            'tuku',
+        ):
             assert code_name not in display_names
         # 已知中文名应出现
         assert '摩锐漫画' in display_names
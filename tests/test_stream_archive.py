@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import time
+import zipfile
+from typing import Any, ClassVar, cast
+
+import requests
+
+from downloader.comic import ComicSource
+from downloader.download.archive_writer import VolumeArchiveWriter
+
+
+class PageResponse:
+    def __init__(self, payload: bytes, status_code: int = 200) -> None:
+        self.payload = payload
+        self.status_code = status_code
+        self.headers: dict[str, str] = {}
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f'HTTP {self.status_code}')
+
+    def iter_content(self, chunk_size: int = 1):
+        yield self.payload
+
+
+class PageSession:
+    def __init__(self, missing: set[str] | None = None) -> None:
+        self.missing = missing or set()
+        self.requested: list[str] = []
+
+    def get(self, url, **kwargs):
+        self.requested.append(url)
+        if url in self.missing:
+            return PageResponse(b'', status_code=404)
+        # 页码越小返回越慢，让图片按倒序完成
+        time.sleep(0.01 * (4 - int(url.rsplit('/', 1)[-1].split('.')[0])))
+        return PageResponse(url.encode('utf-8'))
+
+
+class NoHttp:
+    headers: ClassVar[dict[str, str]] = {}
+
+
+class StreamingSource(ComicSource):
+    name = 'streaming-source'
+    base_url = 'https://example.test'
+    max_download_workers = 3
+    adaptive_download_workers = False
+    stream_to_archive = True
+    keep_image_dir = False
+
+    def __init__(self, *args, session: PageSession, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.session = session
+
+    def search(self, keyword):
+        return []
+
+    def info(self, url):
+        return None
+
+    def __parse_imgs__(self, url):
+        return []
+
+    def _create_image_http_session(self):
+        return self.session
+
+
+IMAGES = [f'https://img.test/{index}.jpg' for index in (1, 2, 3)]
+
+
+def test_images_stream_into_archive_in_index_order(tmp_path):
+    source = StreamingSource(str(tmp_path), cast(Any, NoHttp()), None, session=PageSession())
+    image_dir = tmp_path / 'chapter'
+
+    result = source.__download_vol_images__(
+        str(image_dir), 'chapter', 'https://example.test/chapter', IMAGES
+    )
+
+    assert result.status == 'downloaded'
+    assert result.archive_path == str(image_dir) + '.zip'
+    with zipfile.ZipFile(result.archive_path) as archive:
+        assert archive.namelist() == ['0001.jpg', '0002.jpg', '0003.jpg']
+        assert archive.read('0002.jpg') == IMAGES[1].encode('utf-8')
+    assert not image_dir.exists()
+    assert not (tmp_path / 'chapter.zip.part').exists()
+
+
+def test_incomplete_volume_keeps_part_file_and_resumes(tmp_path):
+    image_dir = tmp_path / 'chapter'
+    first_session = PageSession(missing={IMAGES[2]})
+    source = StreamingSource(
+        str(tmp_path), cast(Any, NoHttp()), None, overwrite=False, session=first_session
+    )
+
+    first = source.__download_vol_images__(
+        str(image_dir), 'chapter', 'https://example.test/chapter', IMAGES
+    )
+
+    assert first.status == 'partial'
+    assert (tmp_path / 'chapter.zip.part').exists()
+    assert not (tmp_path / 'chapter.zip').exists()
+
+    second_session = PageSession()
+    source.session = second_session
+    second = source.__download_vol_images__(
+        str(image_dir), 'chapter', 'https://example.test/chapter', IMAGES
+    )
+
+    assert second.status == 'downloaded'
+    assert second_session.requested == [IMAGES[2]]
+    with zipfile.ZipFile(tmp_path / 'chapter.zip') as archive:
+        assert archive.namelist() == ['0001.jpg', '0002.jpg', '0003.jpg']
+
+
+def test_unreadable_part_file_is_restarted(tmp_path):
+    (tmp_path / 'chapter.zip.part').write_bytes(b'truncated zip without central directory')
+
+    writer = VolumeArchiveWriter(str(tmp_path / 'chapter'))
+    image = tmp_path / 'page.jpg'
+    image.write_bytes(b'page')
+    assert writer.add_file(str(image), '0001.jpg') is True
+    assert writer.add_file(str(image), '0001.jpg') is False
+
+    assert writer.commit() == str(tmp_path / 'chapter.zip')
+    with zipfile.ZipFile(tmp_path / 'chapter.zip') as archive:
+        assert archive.namelist() == ['0001.jpg']
+
+
+class RepairSource(StreamingSource):
+    name = 'repair-source'
+    stream_to_archive = False
+    repair_archives = True
+
+    def __parse_imgs__(self, url):
+        return IMAGES
+
+
+def _write_archive(path, names: list[str]) -> None:
+    with zipfile.ZipFile(path, 'w') as archive:
+        for name in names:
+            archive.writestr(name, b'old-' + name.encode('utf-8'))
+
+
+def test_existing_archive_is_repaired_with_only_missing_pages(tmp_path):
+    _write_archive(tmp_path / '01 chapter.zip', ['0001.jpg', '0003.jpg'])
+    session = PageSession()
+    source = RepairSource(
+        str(tmp_path), cast(Any, NoHttp()), None, overwrite=False, session=session
+    )
+
+    result = source.__download_vol__(str(tmp_path), '1 chapter', 'https://example.test/chapter')
+
+    assert result.status == 'downloaded'
+    assert result.archive_path == str(tmp_path / '01 chapter.zip')
+    assert session.requested == [IMAGES[1]]
+    with zipfile.ZipFile(result.archive_path) as archive:
+        assert archive.namelist() == ['0001.jpg', '0002.jpg', '0003.jpg']
+        assert archive.read('0001.jpg') == b'old-0001.jpg'
+        assert archive.read('0002.jpg') == IMAGES[1].encode('utf-8')
+    assert not list(tmp_path.glob('*.part'))
+
+
+def test_failed_repair_puts_the_archive_back(tmp_path):
+    _write_archive(tmp_path / 'chapter.zip', ['0001.jpg'])
+    source = RepairSource(
+        str(tmp_path),
+        cast(Any, NoHttp()),
+        None,
+        overwrite=False,
+        session=PageSession(missing={IMAGES[2]}),
+    )
+
+    result = source.__download_vol__(str(tmp_path), 'chapter', 'https://example.test/chapter')
+
+    assert result.status == 'partial'
+    assert not (tmp_path / 'chapter.zip.part').exists()
+    with zipfile.ZipFile(tmp_path / 'chapter.zip') as archive:
+        assert archive.namelist() == ['0001.jpg', '0002.jpg']
+
+
+def test_interrupted_repair_never_touches_the_original_archive(tmp_path):
+    archive_path = tmp_path / 'chapter.zip'
+    _write_archive(archive_path, ['0001.jpg'])
+    image = tmp_path / '0002.jpg'
+    image.write_bytes(b'new')
+
+    writer = VolumeArchiveWriter.reopen(str(archive_path), str(tmp_path / 'chapter'), 0)
+    writer.add_file(str(image), '0002.jpg')
+    # 模拟进程在补全途中退出：副本的中央目录没有写入
+    (tmp_path / 'chapter.zip.part').write_bytes(b'truncated zip without central directory')
+
+    with zipfile.ZipFile(archive_path) as archive:
+        assert archive.namelist() == ['0001.jpg']
+    writer = VolumeArchiveWriter.reopen(str(archive_path), str(tmp_path / 'chapter'), 0)
+    writer.add_file(str(image), '0002.jpg')
+    assert writer.commit() == str(archive_path)
+    with zipfile.ZipFile(archive_path) as archive:
+        assert archive.namelist() == ['0001.jpg', '0002.jpg']
+    assert not (tmp_path / 'chapter.zip.part').exists()
+
+
+def test_complete_archive_is_skipped_without_downloading(tmp_path):
+    _write_archive(tmp_path / 'chapter.zip', ['0001.jpg', '0002.jpg', '0003.jpg'])
+    session = PageSession()
+    source = RepairSource(
+        str(tmp_path), cast(Any, NoHttp()), None, overwrite=False, session=session
+    )
+
+    result = source.__download_vol__(str(tmp_path), 'chapter', 'https://example.test/chapter')
+
+    assert result.status == 'skipped'
+    assert session.requested == []
@@ -1,13 +1,17 @@
 from __future__ import annotations
 
 import os
+import threading
+import time
 from typing import Any, cast
 
+from loguru import logger
+
 from downloader import comic as comic_module
 from downloader.comic import ComicSource
 from downloader.download.progress import NoopDownloadProgress
 from downloader.download.volume import download_volume
-from downloader.models import ComicVolume, VolumeDownloadResult
+from downloader.models import Comic, ComicBook, ComicVolume, VolumeDownloadResult
 
 
 class PipelineSource:
@@ -29,6 +33,9 @@ class PipelineSource:
     def _find_existing_archive(self, path: str, vol_name: str) -> str | None:
         return self.existing_archive
 
+    def _is_repairable_archive(self, archive_path: str) -> bool:
+        return False
+
     def _remove_progress_task(self, progress, task_id) -> None:
         if progress is not None and task_id is not None:
             progress.remove_task(task_id)
@@ -288,3 +295,61 @@ def test_comic_source_download_vols_uses_download_progress_adapter(monkeypatch,
         ('add_task', '下载 book', 1, 1),
         ('advance', 1, 1),
     ]
+
+
+def test_download_vols_runs_volumes_concurrently_in_job_order(monkeypatch, tmp_path):
+    source = ParseDelegatingSource(str(tmp_path), cast(Any, object()), None)
+    source.concurrent_volumes = 2
+    source.volume_parse_lookahead = 0
+    both_started = threading.Barrier(2, timeout=5)
+    threads: set[str] = set()
+
+    def fake_download_volume(source_arg, path, vol_name, url, parent_progress=None):
+        threads.add(threading.current_thread().name)
+        if vol_name in {'v1', 'v2'}:
+            both_started.wait()
+        if vol_name == 'v1':
+            time.sleep(0.05)
+        return VolumeDownloadResult(name=vol_name, url=url, status='downloaded')
+
+    monkeypatch.setattr(source, 'create_download_progress', NoopDownloadProgress)
+    monkeypatch.setattr(comic_module, 'download_volume', fake_download_volume)
+
+    summary = source.download_vols(
+        'comic',
+        'book',
+        [ComicVolume(f'v{index}', f'https://example.test/{index}') for index in (1, 2, 3)],
+    )
+
+    assert [result.name for result in summary.volume_results] == ['v1', 'v2', 'v3']
+    assert len(threads) == 2
+    assert all(name.startswith('volume-download') for name in threads)
+
+
+def test_download_full_logs_each_book_when_its_first_volume_starts(monkeypatch, tmp_path):
+    source = ParseDelegatingSource(str(tmp_path), cast(Any, object()), None)
+    comic = Comic()
+    comic.name = 'comic'
+    for book_name, vol_names in (('book-a', ['a1', 'a2']), ('empty', []), ('book-b', ['b1'])):
+        book = ComicBook()
+        book.name = book_name
+        book.vols = [ComicVolume(name, f'https://example.test/{name}') for name in vol_names]
+        comic.books.append(book)
+    events: list[str] = []
+
+    def fake_download_volume(source_arg, path, vol_name, url, parent_progress=None):
+        events.append(vol_name)
+        return VolumeDownloadResult(name=vol_name, url=url, status='downloaded')
+
+    monkeypatch.setattr(source, 'create_download_progress', NoopDownloadProgress)
+    monkeypatch.setattr(comic_module, 'download_volume', fake_download_volume)
+    sink_id = logger.add(
+        lambda message: events.append(message.record['message']),
+        filter=lambda record: record['message'].startswith('处理章节'),
+    )
+    try:
+        source.download_full(comic)
+    finally:
+        logger.remove(sink_id)
+
+    assert events == ['处理章节: book-a (共 2 话)', 'a1', 'a2', '处理章节: book-b (共 1 话)', 'b1']